@@ -1,114 +1,314 @@
 # Boleta.py
-from fpdf import FPDF
+from abc import ABC, abstractmethod
 from datetime import datetime
+import io
 import os
-from collections import Counter
+import textwrap
+
+from Perfilado import medido
+
+RUTA_LOGO = "logo.png"
+ANCHO_TERMICA = 48         # caracteres por línea de una impresora térmica de 80 mm (fuente A)
+UMBRAL_PROCESOS = 500      # a partir de cuántas boletas el lote usa varios procesos
+TAMANO_TANDA = 250         # boletas por tarea enviada a cada proceso
+
+
+def desglose_iva(total_final):
+    """En Chile, el precio al consumidor incluye IVA. Para obtener el neto (subtotal), se divide por 1.19"""
+    subtotal = int(round(total_final / 1.19))
+    return subtotal, total_final - subtotal
+
+
+def formatear_precio(valor):
+    return f"${valor:,}".replace(",", ".")
+
+
+def _nuevo_pdf():
+    # fpdf se importa al generar la primera boleta, no al importar este módulo
+    from fpdf import FPDF
+    return FPDF(orientation='P', unit='mm', format='A4')
+
+
+def leer_logo(ruta=RUTA_LOGO):
+    """Lee el logo una sola vez; devuelve sus bytes o None si no existe."""
+    if os.path.exists(ruta):
+        with open(ruta, "rb") as f:
+            return f.read()
+    return None
+
+
+def _dibujar_boleta(pdf, agrupados, total_final, logo, now):
+    """Dibuja una boleta completa en una página nueva de pdf; agrupados viene de Pedido.agrupar()."""
+    pdf.add_page()
+
+    # --- ENCABEZADO PROFESIONAL ---
+    # Logo (opcional, si existe un 'logo.png' en la carpeta)
+    if logo:
+        pdf.image(io.BytesIO(logo), x=10, y=8, w=33)
+
+    pdf.set_font('Arial', 'B', 20)
+    pdf.cell(80) # Mover a la derecha del logo
+    pdf.cell(30, 10, 'RESTAURANTE', 0, 1, 'C')
+
+    pdf.set_font('Arial', '', 10)
+    pdf.cell(80)
+    pdf.cell(30, 5, 'RUT: 76.123.456-7', 0, 1, 'C')
+    pdf.cell(80)
+    pdf.cell(30, 5, 'Av. Siempre Viva 742, Temuco', 0, 1, 'C')
+    pdf.cell(80)
+    pdf.cell(30, 5, 'Fono: +56 9 1234 5678', 0, 1, 'C')
+    pdf.ln(10)
+
+    # --- DETALLES DE LA BOLETA ---
+    pdf.set_font('Arial', 'B', 14)
+    pdf.cell(0, 10, 'BOLETA ELECTRONICA', 'B', 1, 'C')
+    pdf.ln(5)
+
+    pdf.set_font('Arial', '', 12)
+    pdf.cell(0, 6, f"Fecha de Emision: {now.strftime('%d-%m-%Y')}", 0, 1, 'L')
+    pdf.cell(0, 6, f"Hora: {now.strftime('%H:%M:%S')}", 0, 1, 'L')
+    pdf.ln(5)
+
+    # --- TABLA DE PRODUCTOS ---
+    pdf.set_font('Arial', 'B', 12)
+    pdf.set_fill_color(230, 230, 230) # Gris claro para encabezado
+    pdf.cell(20, 10, 'Cant.', 1, 0, 'C', 1)
+    pdf.cell(90, 10, 'Detalle', 1, 0, 'C', 1)
+    pdf.cell(40, 10, 'P. Unit.', 1, 0, 'C', 1)
+    pdf.cell(40, 10, 'Total', 1, 1, 'C', 1)
+
+    pdf.set_font('Arial', '', 12)
+    fill = False
+    for nombre, detalles in agrupados:
+        pdf.set_fill_color(245, 245, 245) if fill else pdf.set_fill_color(255, 255, 255)
+        pdf.cell(20, 10, str(detalles['cantidad']), 1, 0, 'C', 1)
+        pdf.cell(90, 10, nombre, 1, 0, 'L', 1)
+        pdf.cell(40, 10, f"${detalles['precio_unit']:,}".replace(",", "."), 1, 0, 'R', 1)
+        pdf.cell(40, 10, f"${detalles['total']:,}".replace(",", "."), 1, 1, 'R', 1)
+        fill = not fill
+
+    # --- CÁLCULO Y VISUALIZACIÓN DE TOTALES ---
+    subtotal, iva = desglose_iva(total_final)
+
+    pdf.ln(10)
+
+    # Posicionar el cursor para alinear los totales a la derecha
+    pdf.set_x(110)
+    pdf.set_font('Arial', '', 12)
+    pdf.cell(50, 8, 'SUBTOTAL:', 0, 0, 'R')
+    pdf.cell(40, 8, f"${subtotal:,}".replace(",", "."), 0, 1, 'R')
+
+    pdf.set_x(110)
+    pdf.cell(50, 8, 'IVA (19%):', 0, 0, 'R')
+    pdf.cell(40, 8, f"${iva:,}".replace(",", "."), 0, 1, 'R')
+
+    pdf.set_x(110)
+    pdf.set_font('Arial', 'B', 16)
+    pdf.cell(50, 10, 'TOTAL:', 0, 0, 'R')
+    pdf.cell(40, 10, f"${total_final:,}".replace(",", "."), 0, 1, 'R')
+
+    pdf.ln(10)
+
+    # --- PIE DE PÁGINA ---
+    pdf.set_font('Arial', 'I', 10)
+    pdf.cell(0, 10, 'Gracias por su preferencia', 'T', 1, 'C')
+
+
+# --- FORMATOS DE SALIDA ---
+
+class RenderizadorBoleta(ABC):
+    """
+    Formato de salida de una boleta. Todos reciben lo mismo: los ítems de Pedido.agrupar() y el total,
+    y separan el IVA con desglose_iva, así la boleta dice lo mismo en cualquier formato.
+    destino puede ser una ruta o un archivo binario ya abierto (una tubería, sys.stdout.buffer).
+    """
+    extension = ""
+
+    @abstractmethod
+    def escribir(self, agrupados, total_final, destino, now=None):
+        """Escribe la boleta en destino; devuelve la ruta absoluta, o None si destino era un archivo abierto."""
+
+    def generar(self, pedido, destino):
+        if pedido is None or len(pedido) == 0:
+            raise ValueError("El objeto Pedido no puede estar vacío.")
+        return self.escribir(pedido.agrupar(), pedido.calcular_total(), destino, datetime.now())
+
+
+def _escribir_bytes(datos, destino):
+    if hasattr(destino, "write"):
+        destino.write(datos)
+        destino.flush()
+        return None
+    with open(destino, "wb") as f:
+        f.write(datos)
+    return os.path.abspath(destino)
+
+
+class RenderizadorPDF(RenderizadorBoleta):
+    """Boleta A4 con FPDF, como la que se abre en el visor."""
+    extension = ".pdf"
+
+    def escribir(self, agrupados, total_final, destino, now=None):
+        pdf = _nuevo_pdf()
+        _dibujar_boleta(pdf, agrupados, total_final, leer_logo(), now or datetime.now())
+        if hasattr(destino, "write"):
+            return _escribir_bytes(bytes(pdf.output()), destino)
+        pdf.output(destino)
+        return os.path.abspath(destino)
+
+
+# Comandos ESC/POS que usa el ticket (los entiende casi cualquier impresora térmica)
+ESC_INICIAR = b"\x1b@"
+ESC_TABLA_PC858 = b"\x1bt\x13"     # página de códigos con tildes, ñ y el signo $
+ESC_NEGRITA = (b"\x1bE\x00", b"\x1bE\x01")
+ESC_GRANDE = (b"\x1d!\x00", b"\x1d!\x11")  # doble alto y doble ancho
+ESC_CORTAR = b"\x1dVB\x03"          # avanza 3 líneas y corta el papel
+
+
+class RenderizadorTermico(RenderizadorBoleta):
+    """
+    Ticket de 80 mm en texto de ancho fijo. Con escpos=True produce los bytes para enviar tal cual a la
+    impresora (archivo de dispositivo, tubería o socket); con escpos=False, texto UTF-8 para ver o guardar.
+    No usa FPDF: solo se arman líneas de texto, por eso tarda microsegundos.
+    """
+    def __init__(self, ancho=ANCHO_TERMICA, escpos=True):
+        self.ancho = ancho
+        self.escpos = escpos
+        self.extension = ".bin" if escpos else ".txt"
+
+    def lineas(self, agrupados, total_final, now):
+        """(texto, estilo) de cada línea del ticket; estilo es None, 'negrita' o 'grande'."""
+        ancho = self.ancho
+        ancho_detalle = ancho - 28  # Cant.(4) + P. Unit.(10) + Total(11) + 3 espacios
+        separador = ("-" * ancho, None)
+        subtotal, iva = desglose_iva(total_final)
+        lineas = [
+            ("RESTAURANTE", "grande"),
+            ("RUT: 76.123.456-7".center(ancho).rstrip(), None),
+            ("Av. Siempre Viva 742, Temuco".center(ancho).rstrip(), None),
+            ("Fono: +56 9 1234 5678".center(ancho).rstrip(), None),
+            separador,
+            ("BOLETA ELECTRONICA".center(ancho).rstrip(), "negrita"),
+            (f"Fecha: {now.strftime('%d-%m-%Y')}".ljust(ancho - 14) + f"Hora: {now.strftime('%H:%M:%S')}", None),
+            separador,
+            (f"{'Cant':>4} {'Detalle':<{ancho_detalle}} {'P. Unit.':>10} {'Total':>11}", "negrita"),
+        ]
+        for nombre, detalles in agrupados:
+            # Los nombres largos siguen en las líneas siguientes, bajo la columna Detalle
+            partes = textwrap.wrap(nombre, ancho_detalle) if len(nombre) > ancho_detalle else [nombre]
+            lineas.append((f"{detalles['cantidad']:>4} {partes[0]:<{ancho_detalle}} "
+                           f"{formatear_precio(detalles['precio_unit']):>10} {formatear_precio(detalles['total']):>11}", None))
+            lineas += [(" " * 5 + parte, None) for parte in partes[1:]]
+        lineas += [
+            separador,
+            (f"{'SUBTOTAL:':>{ancho - 12}} {formatear_precio(subtotal):>11}", None),
+            (f"{'IVA (19%):':>{ancho - 12}} {formatear_precio(iva):>11}", None),
+            (f"{'TOTAL:':>{ancho - 12}} {formatear_precio(total_final):>11}", "negrita"),
+            separador,
+            ("Gracias por su preferencia".center(ancho).rstrip(), None),
+        ]
+        return lineas
+
+    def renderizar(self, agrupados, total_final, now=None):
+        """Los bytes del ticket, sin escribirlos."""
+        lineas = self.lineas(agrupados, total_final, now or datetime.now())
+        if not self.escpos:
+            return "\n".join(texto if estilo != "grande" else texto.center(self.ancho).rstrip() for texto, estilo in lineas).encode("utf-8") + b"\n"
+        partes = [ESC_INICIAR, ESC_TABLA_PC858]
+        for texto, estilo in lineas:
+            if estilo == "grande":
+                # Con doble ancho caben la mitad de caracteres por línea
+                partes += [ESC_GRANDE[1], texto.center(self.ancho // 2).rstrip().encode("cp858", "replace"), b"\n", ESC_GRANDE[0]]
+            elif estilo == "negrita":
+                partes += [ESC_NEGRITA[1], texto.encode("cp858", "replace"), b"\n", ESC_NEGRITA[0]]
+            else:
+                partes += [texto.encode("cp858", "replace"), b"\n"]
+        partes.append(ESC_CORTAR)
+        return b"".join(partes)
+
+    def escribir(self, agrupados, total_final, destino, now=None):
+        return _escribir_bytes(self.renderizar(agrupados, total_final, now), destino)
+
+
+FORMATOS = {
+    "pdf": RenderizadorPDF,
+    "termica": RenderizadorTermico,
+    "texto": lambda: RenderizadorTermico(escpos=False),
+}
+
+
+def renderizador(formato="pdf"):
+    """Renderizador de un formato de FORMATOS ('pdf', 'termica' o 'texto')."""
+    if formato not in FORMATOS:
+        raise ValueError(f"formato de boleta desconocido '{formato}' (se aceptan: {', '.join(FORMATOS)})")
+    return FORMATOS[formato]()
+
 
 class BoletaPDF:
+    """Boleta en PDF de un pedido; usa RenderizadorPDF."""
     def __init__(self, pedido):
-        if not pedido or not pedido.get_items():
+        if pedido is None or len(pedido) == 0:
             raise ValueError("El objeto Pedido no puede estar vacío.")
         self.pedido = pedido
-        self.pdf = FPDF(orientation='P', unit='mm', format='A4')
+        self.renderizador = RenderizadorPDF()
 
     def _agrupar_items(self):
-        """Agrupa los items del pedido por nombre y calcula cantidades y totales."""
-        nombres_items = [item['nombre'] for item in self.pedido.get_items()]
-        conteo_items = Counter(nombres_items)
-        
-        items_agrupados = {}
-        for item in self.pedido.get_items():
-            nombre = item['nombre']
-            if nombre not in items_agrupados:
-                cantidad = conteo_items[nombre]
-                precio_unit = item['precio']
-                items_agrupados[nombre] = {
-                    'cantidad': cantidad,
-                    'precio_unit': precio_unit,
-                    'total': cantidad * precio_unit
-                }
-        return list(items_agrupados.items())
+        """Los items agrupados por nombre ya los mantiene el Pedido al agregar y eliminar."""
+        return self.pedido.agrupar()
 
+    @medido
     def generar(self, filename="boleta.pdf"):
-        self.pdf.add_page()
-        
-        # --- ENCABEZADO PROFESIONAL ---
-        # Logo (opcional, si existe un 'logo.png' en la carpeta)
-        if os.path.exists("logo.png"):
-            self.pdf.image("logo.png", x=10, y=8, w=33)
-        
-        self.pdf.set_font('Arial', 'B', 20)
-        self.pdf.cell(80) # Mover a la derecha del logo
-        self.pdf.cell(30, 10, 'RESTAURANTE', 0, 1, 'C')
-
-        self.pdf.set_font('Arial', '', 10)
-        self.pdf.cell(80)
-        self.pdf.cell(30, 5, 'RUT: 76.123.456-7', 0, 1, 'C')
-        self.pdf.cell(80)
-        self.pdf.cell(30, 5, 'Av. Siempre Viva 742, Temuco', 0, 1, 'C')
-        self.pdf.cell(80)
-        self.pdf.cell(30, 5, 'Fono: +56 9 1234 5678', 0, 1, 'C')
-        self.pdf.ln(10)
-
-        # --- DETALLES DE LA BOLETA ---
-        self.pdf.set_font('Arial', 'B', 14)
-        self.pdf.cell(0, 10, 'BOLETA ELECTRONICA', 'B', 1, 'C')
-        self.pdf.ln(5)
-
-        now = datetime.now()
-        self.pdf.set_font('Arial', '', 12)
-        self.pdf.cell(0, 6, f"Fecha de Emision: {now.strftime('%d-%m-%Y')}", 0, 1, 'L')
-        self.pdf.cell(0, 6, f"Hora: {now.strftime('%H:%M:%S')}", 0, 1, 'L')
-        self.pdf.ln(5)
-        
-        # --- TABLA DE PRODUCTOS ---
-        self.pdf.set_font('Arial', 'B', 12)
-        self.pdf.set_fill_color(230, 230, 230) # Gris claro para encabezado
-        self.pdf.cell(20, 10, 'Cant.', 1, 0, 'C', 1)
-        self.pdf.cell(90, 10, 'Detalle', 1, 0, 'C', 1)
-        self.pdf.cell(40, 10, 'P. Unit.', 1, 0, 'C', 1)
-        self.pdf.cell(40, 10, 'Total', 1, 1, 'C', 1)
-
-        self.pdf.set_font('Arial', '', 12)
-        items_para_boleta = self._agrupar_items()
-        fill = False
-        for nombre, detalles in items_para_boleta:
-            self.pdf.set_fill_color(245, 245, 245) if fill else self.pdf.set_fill_color(255, 255, 255)
-            self.pdf.cell(20, 10, str(detalles['cantidad']), 1, 0, 'C', 1)
-            self.pdf.cell(90, 10, nombre, 1, 0, 'L', 1)
-            self.pdf.cell(40, 10, f"${detalles['precio_unit']:,}".replace(",", "."), 1, 0, 'R', 1)
-            self.pdf.cell(40, 10, f"${detalles['total']:,}".replace(",", "."), 1, 1, 'R', 1)
-            fill = not fill
-
-        # --- CÁLCULO Y VISUALIZACIÓN DE TOTALES ---
-        total_final = self.pedido.calcular_total()
-        # En Chile, el precio al consumidor incluye IVA. Para obtener el neto (subtotal), se divide por 1.19
-        subtotal = int(round(total_final / 1.19))
-        iva = total_final - subtotal
-        
-        self.pdf.ln(10)
-        
-        # Posicionar el cursor para alinear los totales a la derecha
-        self.pdf.set_x(110)
-        self.pdf.set_font('Arial', '', 12)
-        self.pdf.cell(50, 8, 'SUBTOTAL:', 0, 0, 'R')
-        self.pdf.cell(40, 8, f"${subtotal:,}".replace(",", "."), 0, 1, 'R')
-        
-        self.pdf.set_x(110)
-        self.pdf.cell(50, 8, 'IVA (19%):', 0, 0, 'R')
-        self.pdf.cell(40, 8, f"${iva:,}".replace(",", "."), 0, 1, 'R')
-        
-        self.pdf.set_x(110)
-        self.pdf.set_font('Arial', 'B', 16)
-        self.pdf.cell(50, 10, 'TOTAL:', 0, 0, 'R')
-        self.pdf.cell(40, 10, f"${total_final:,}".replace(",", "."), 0, 1, 'R')
-        
-        self.pdf.ln(10)
-
-        # --- PIE DE PÁGINA ---
-        self.pdf.set_font('Arial', 'I', 10)
-        self.pdf.cell(0, 10, 'Gracias por su preferencia', 'T', 1, 'C')
-
-        # Guardar el archivo
-        self.pdf.output(filename)
-        return os.path.abspath(filename)
\ No newline at end of file
+        return self.renderizador.escribir(self._agrupar_items(), self.pedido.calcular_total(), filename, datetime.now())
+
+
+# --- GENERACIÓN POR LOTES (reimpresiones y auditorías) ---
+
+def _generar_tanda(tanda, directorio, logo, now):
+    """Escribe un archivo por boleta; tanda es una lista de (numero, agrupados, total)."""
+    rutas = []
+    for numero, agrupados, total in tanda:
+        pdf = _nuevo_pdf()
+        _dibujar_boleta(pdf, agrupados, total, logo, now)
+        ruta = os.path.join(directorio, f"boleta_{numero:06d}.pdf")
+        pdf.output(ruta)
+        rutas.append(os.path.abspath(ruta))
+    return rutas
+
+
+def _datos_de_pedidos(pedidos):
+    for numero, pedido in enumerate(pedidos, start=1):
+        if pedido is None or len(pedido) == 0:
+            raise ValueError(f"El pedido número {numero} del lote está vacío.")
+        yield numero, pedido.agrupar(), pedido.calcular_total()
+
+
+def generar_lote(pedidos, destino, un_solo_archivo=True, procesos=None):
+    """
+    Genera las boletas de muchos pedidos leyendo el logo y preparando el formato una sola vez.
+    Con un_solo_archivo=True escribe un PDF de varias páginas en 'destino' y devuelve su ruta;
+    si no, escribe un PDF por pedido dentro del directorio 'destino' y devuelve la lista de rutas.
+    procesos: None decide solo (varios procesos sobre UMBRAL_PROCESOS boletas), 0 o 1 fuerza un proceso.
+    """
+    logo = leer_logo()
+    now = datetime.now()
+    datos = _datos_de_pedidos(pedidos)
+
+    if un_solo_archivo:
+        pdf = _nuevo_pdf()
+        for _, agrupados, total in datos:
+            _dibujar_boleta(pdf, agrupados, total, logo, now)
+        pdf.output(destino)
+        return os.path.abspath(destino)
+
+    os.makedirs(destino, exist_ok=True)
+    datos = list(datos)
+    if procesos is None:
+        procesos = os.cpu_count() if len(datos) > UMBRAL_PROCESOS else 1
+    if procesos <= 1:
+        return _generar_tanda(datos, destino, logo, now)
+
+    from concurrent.futures import ProcessPoolExecutor
+    tandas = [datos[i:i + TAMANO_TANDA] for i in range(0, len(datos), TAMANO_TANDA)]
+    with ProcessPoolExecutor(max_workers=procesos) as executor:
+        resultados = executor.map(_generar_tanda, tandas, [destino] * len(tandas), [logo] * len(tandas), [now] * len(tandas))
+        return [ruta for rutas in resultados for ruta in rutas]
@@ -0,0 +1,125 @@
+# CacheCarta.py
+import hashlib
+import os
+import struct
+from collections import OrderedDict
+
+
+def clave_carta(items_carta, dpi):
+    """Hash del contenido de la carta (nombres y precios, en orden) y de la resolución de render."""
+    h = hashlib.sha256()
+    for item in items_carta:
+        h.update(f"{item['nombre']}\x1f{item['precio']}\x1e".encode("utf-8"))
+    h.update(f"dpi={dpi}".encode("ascii"))
+    return h.hexdigest()
+
+
+class EntradaCarta:
+    def __init__(self, clave, pdf, num_paginas):
+        self.clave = clave
+        self.pdf = pdf                  # bytes del PDF
+        self.num_paginas = num_paginas
+        self.paginas = {}               # numero -> (ancho, alto, bytes RGB)
+
+
+class CacheCarta:
+    """
+    Caché LRU de cartas ya generadas: guarda el PDF y las páginas rasterizadas por clave_carta.
+    Si se indica un directorio, además las guarda en disco para sobrevivir a un reinicio; el disco
+    sigue el mismo límite de capacidad y al descartar una carta se borran sus archivos.
+    """
+    def __init__(self, capacidad=8, directorio=None):
+        self.capacidad = capacidad
+        self.directorio = directorio
+        self._entradas = OrderedDict()  # clave -> EntradaCarta, o None si solo está en disco
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+            self._indexar_disco()
+
+    def _ruta(self, clave, sufijo):
+        return os.path.join(self.directorio, f"{clave}{sufijo}")
+
+    def _indexar_disco(self):
+        # Las cartas de sesiones anteriores entran al LRU de la más vieja a la más nueva (por fecha del PDF)
+        cartas = []
+        for nombre in os.listdir(self.directorio):
+            if nombre.endswith(".pdf"):
+                try:
+                    cartas.append((os.path.getmtime(os.path.join(self.directorio, nombre)), nombre[:-4]))
+                except OSError:
+                    pass
+        for _, clave in sorted(cartas):
+            self._entradas[clave] = None
+        self._descartar_sobrantes()
+
+    def _insertar(self, entrada):
+        self._entradas[entrada.clave] = entrada
+        self._entradas.move_to_end(entrada.clave)
+        self._descartar_sobrantes()
+
+    def _descartar_sobrantes(self):
+        while len(self._entradas) > self.capacidad:
+            clave, _ = self._entradas.popitem(last=False)
+            if self.directorio:
+                self._borrar_de_disco(clave)
+
+    def _borrar_de_disco(self, clave):
+        for nombre in os.listdir(self.directorio):
+            if nombre.startswith(clave):
+                try:
+                    os.remove(os.path.join(self.directorio, nombre))
+                except OSError:
+                    pass
+
+    def obtener(self, clave):
+        """Devuelve la EntradaCarta de la clave o None si no está ni en memoria ni en disco."""
+        entrada = self._entradas.get(clave)
+        if entrada is not None:
+            self._entradas.move_to_end(clave)
+            return entrada
+        if not self.directorio or not os.path.exists(self._ruta(clave, ".pdf")):
+            return None
+        try:
+            with open(self._ruta(clave, ".pdf"), "rb") as f:
+                pdf = f.read()
+            with open(self._ruta(clave, ".paginas"), "r", encoding="ascii") as f:
+                num_paginas = int(f.read())
+        except (OSError, ValueError):
+            return None
+        entrada = EntradaCarta(clave, pdf, num_paginas)
+        self._insertar(entrada)
+        return entrada
+
+    def guardar(self, clave, pdf, num_paginas):
+        entrada = EntradaCarta(clave, pdf, num_paginas)
+        self._insertar(entrada)
+        if self.directorio:
+            with open(self._ruta(clave, ".pdf"), "wb") as f:
+                f.write(pdf)
+            with open(self._ruta(clave, ".paginas"), "w", encoding="ascii") as f:
+                f.write(str(num_paginas))
+        return entrada
+
+    def pagina(self, entrada, numero):
+        """Página rasterizada (ancho, alto, bytes RGB) desde memoria o disco; None si hay que renderizarla."""
+        if numero in entrada.paginas:
+            return entrada.paginas[numero]
+        if not self.directorio:
+            return None
+        try:
+            with open(self._ruta(entrada.clave, f"_p{numero}.rgb"), "rb") as f:
+                ancho, alto = struct.unpack("<II", f.read(8))
+                pixeles = (ancho, alto, f.read())
+        except (OSError, struct.error):
+            return None
+        entrada.paginas[numero] = pixeles
+        return pixeles
+
+    def guardar_pagina(self, entrada, numero, pixeles):
+        entrada.paginas[numero] = pixeles
+        # Una carta ya descartada no vuelve a escribir en disco (quedarían archivos sin dueño)
+        if self.directorio and entrada.clave in self._entradas:
+            ancho, alto, samples = pixeles
+            with open(self._ruta(entrada.clave, f"_p{numero}.rgb"), "wb") as f:
+                f.write(struct.pack("<II", ancho, alto))
+                f.write(samples)
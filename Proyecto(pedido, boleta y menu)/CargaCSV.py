@@ -0,0 +1,104 @@
+# CargaCSV.py
+import csv
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from Ingrediente import Ingrediente
+from Perfilado import medido
+
+TAMANO_BLOQUE = 5000
+MAX_ERRORES_DETALLADOS = 100
+
+
+class ResultadoCarga:
+    def __init__(self):
+        self.filas_leidas = 0
+        self.agregados = 0
+        self.total_errores = 0
+        self.errores = []  # (numero_fila, mensaje), solo los primeros MAX_ERRORES_DETALLADOS
+
+    def registrar_error(self, numero_fila, mensaje):
+        self.total_errores += 1
+        if len(self.errores) < MAX_ERRORES_DETALLADOS:
+            self.errores.append((numero_fila, mensaje))
+
+
+def _abrir(filepath):
+    # 'utf-8-sig' descarta el BOM si existe (el CSV de ejemplo lo trae)
+    return open(filepath, mode='r', encoding='utf-8-sig', newline='')
+
+
+def _es_encabezado(fila):
+    """La primera fila es encabezado si su columna de cantidad no es numérica."""
+    if len(fila) != 3:
+        return False
+    try:
+        Decimal(fila[2].strip())
+        return False
+    except InvalidOperation:
+        return True
+
+
+def _fila_vacia(fila):
+    """Fila sin datos (solo comas, comillas o espacios). La usan la carga y la vista previa para contar igual las filas."""
+    return not fila or not "".join(fila).strip()
+
+
+def _filas_de_datos(reader):
+    """Recorre el CSV entregando (numero_fila, fila) y saltando el encabezado si lo hay."""
+    primera = True
+    for numero_fila, fila in enumerate(reader, start=1):
+        if _fila_vacia(fila):
+            continue
+        if primera:
+            primera = False
+            if _es_encabezado(fila):
+                continue
+        yield numero_fila, fila
+
+
+@medido
+def cargar_csv_en_stock(stock, filepath, tamano_bloque=TAMANO_BLOQUE, progreso=None):
+    """
+    Carga un CSV (nombre, unidad, cantidad) en el stock leyendo por bloques.
+    Los nombres repetidos dentro de un bloque se suman antes de llegar al stock,
+    y los repetidos entre bloques los suma Stock.agregar_ingredientes.
+    Las cantidades se pasan a enteros en unidad base; una unidad desconocida o distinta
+    a la que ya tiene ese ingrediente se informa como error de la fila.
+    """
+    resultado = ResultadoCarga()
+    with _abrir(filepath) as file:
+        filas = _filas_de_datos(csv.reader(file))
+        while True:
+            bloque = list(islice(filas, tamano_bloque))
+            if not bloque:
+                break
+            acumulado = {}
+            for numero_fila, fila in bloque:
+                resultado.filas_leidas += 1
+                if len(fila) != 3:
+                    resultado.registrar_error(numero_fila, f"se esperaban 3 columnas y hay {len(fila)}")
+                    continue
+                nombre, unidad, cantidad_str = (campo.strip() for campo in fila)
+                if not nombre:
+                    resultado.registrar_error(numero_fila, "el nombre está vacío")
+                    continue
+                try:
+                    ingrediente = Ingrediente(nombre, unidad, cantidad_str)
+                except ValueError as e:
+                    resultado.registrar_error(numero_fila, str(e))
+                    continue
+                clave = nombre.lower()
+                previo = acumulado.get(clave) or stock.ingredientes.get(clave)
+                if previo is not None and previo.unidad != ingrediente.unidad:
+                    resultado.registrar_error(numero_fila, f"'{nombre}' ya está en {previo.unidad} y esta fila viene en {unidad}")
+                    continue
+                resultado.agregados += 1
+                if clave in acumulado:
+                    acumulado[clave].cantidad += ingrediente.cantidad
+                else:
+                    acumulado[clave] = ingrediente
+            stock.agregar_ingredientes(acumulado.values())
+            if progreso:
+                progreso(resultado.filas_leidas)
+    return resultado
@@ -0,0 +1,242 @@
+# Consola.py
+# Uso sin interfaz gráfica:
+#   python Consola.py stock  --csv ingredientes_menu.csv
+#   python Consola.py carta  --csv ingredientes_menu.csv --catalogo menu.json
+#   python Consola.py precio --csv ingredientes_menu.csv "Completo=2" Pepsi
+#   python Consola.py boleta --datos datos --salida boleta.pdf "Completo=2" Pepsi
+#   python Consola.py boleta --formato termica --salida /dev/usb/lp0 "Completo=2" Pepsi
+#   python Consola.py boleta --formato texto --salida - Pepsi        (el ticket sale por la salida estándar)
+#   python Consola.py reposicion --datos datos --horas 24 --salida reposicion.csv
+#   python Consola.py ventas --datos datos --desde 2024-01-01 --por-hora --consumo
+import argparse
+import os
+import sys
+
+from Nucleo import Menu, Pedido, Stock, DiarioStock, RegistroPedidos, cargar_csv_en_stock
+from Boleta import desglose_iva
+from Pronostico import PronosticoConsumo, ARCHIVO_ESTADO
+
+
+def formatear_precio(valor):
+    return f"${valor:,}".replace(",", ".")
+
+
+def cargar_stock(args, escribir=False):
+    """Arma el Stock desde el directorio de datos y/o un CSV; devuelve (stock, diario o None)."""
+    stock, diario = Stock(), None
+    if args.datos:
+        diario = DiarioStock(args.datos)
+        if escribir:
+            diario.adjuntar(stock)
+        else:
+            diario.recuperar(stock)
+            diario = None
+    if args.csv:
+        resultado = cargar_csv_en_stock(stock, args.csv)
+        for numero_fila, mensaje in resultado.errores:
+            print(f"Fila {numero_fila} omitida: {mensaje}", file=sys.stderr)
+    return stock, diario
+
+
+def armar_pedido(menu, especificaciones):
+    """Convierte argumentos 'Plato' o 'Plato=cantidad' en un Pedido."""
+    pedido = Pedido()
+    for especificacion in especificaciones:
+        nombre, _, cantidad_str = especificacion.partition("=")
+        item_info = menu.get_item(nombre.strip())
+        if item_info is None:
+            raise SystemExit(f"El plato '{nombre.strip()}' no está en el menú. Opciones: {', '.join(menu.get_items())}")
+        try:
+            cantidad = int(cantidad_str) if cantidad_str else 1
+        except ValueError:
+            raise SystemExit(f"Cantidad inválida en '{especificacion}'.")
+        for _ in range(cantidad):
+            pedido.agregar_item(item_info, nombre.strip())
+    if len(pedido) == 0:
+        raise SystemExit("El pedido está vacío.")
+    return pedido
+
+
+def imprimir_pedido(pedido):
+    for nombre, detalles in pedido.agrupar():
+        print(f"{detalles['cantidad']:>4}  {nombre:<30} {formatear_precio(detalles['precio_unit']):>10} {formatear_precio(detalles['total']):>12}")
+    total = pedido.calcular_total()
+    subtotal, iva = desglose_iva(total)
+    print(f"{'SUBTOTAL:':>47} {formatear_precio(subtotal):>12}")
+    print(f"{'IVA (19%):':>47} {formatear_precio(iva):>12}")
+    print(f"{'TOTAL:':>47} {formatear_precio(total):>12}")
+
+
+def cmd_stock(args):
+    stock, _ = cargar_stock(args)
+    for ing in stock.get_ingredientes():
+        print(f"{ing.nombre:<30} {ing.unidad:<8} {ing.cantidad:>10}")
+    return 0
+
+
+def cmd_carta(args):
+    stock, _ = cargar_stock(args)
+    try:
+        menu = Menu(args.catalogo) if args.catalogo else Menu()
+    except (OSError, ValueError) as e:
+        print(f"No se pudo leer la carta: {e}", file=sys.stderr)
+        return 1
+    for nombre, info in menu.get_items().items():
+        print(f"{nombre:<30} {formatear_precio(info['precio']):>10}")
+    if not (args.csv or args.datos):
+        return 0
+    faltantes, diferencias = menu.verificar_stock(stock)
+    for ing, platos in faltantes:
+        print(f"'{ing}' no está en el stock (lo usan: {', '.join(platos)})", file=sys.stderr)
+    for ing, receta, en_stock in diferencias:
+        print(f"'{ing}': la carta usa {receta}, el stock {en_stock}", file=sys.stderr)
+    return 1 if faltantes or diferencias else 0
+
+
+def cmd_precio(args):
+    stock, _ = cargar_stock(args)
+    pedido = armar_pedido(Menu(), args.items)
+    imprimir_pedido(pedido)
+    if (args.csv or args.datos) and not stock.reservar(pedido.lineas_por_plato()):
+        print("Stock insuficiente para preparar este pedido.", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_boleta(args):
+    from Boleta import renderizador
+    stock, diario = cargar_stock(args, escribir=True)
+    pronostico = None
+    if args.datos:
+        pronostico = PronosticoConsumo(stock)
+        pronostico.cargar(os.path.join(args.datos, ARCHIVO_ESTADO))
+    pedido = armar_pedido(Menu(), args.items)
+    reservar = bool(args.csv or args.datos)
+    try:
+        if reservar and not stock.reservar(pedido.lineas_por_plato()):
+            print("Stock insuficiente para preparar este pedido.", file=sys.stderr)
+            return 1
+        # Con --salida - el ticket va a la salida estándar (para encadenarlo con lp u otra impresora)
+        salida = args.salida or f"boleta_pedido{renderizador(args.formato).extension}"
+        # Sin boleta no hay venta: si falla, lo reservado vuelve al stock (y queda en el diario) antes de salir
+        try:
+            filepath = renderizador(args.formato).generar(pedido, sys.stdout.buffer if salida == "-" else salida)
+        except OSError as e:
+            if reservar:
+                stock.liberar(pedido.lineas_por_plato())
+            print(f"No se pudo generar la boleta: {e}", file=sys.stderr)
+            return 1
+        except BaseException:
+            if reservar:
+                stock.liberar(pedido.lineas_por_plato())
+            raise
+        if args.datos:
+            RegistroPedidos(args.datos).registrar(pedido)
+            pronostico.guardar(os.path.join(args.datos, ARCHIVO_ESTADO))
+            diario.snapshot_si_corresponde()
+    finally:
+        if diario:
+            diario.cerrar()
+    if filepath:
+        imprimir_pedido(pedido)
+        print(f"Boleta generada en '{filepath}'.")
+    for alerta in (pronostico.alertas() if pronostico else ()):
+        print(f"Atención: {alerta}", file=sys.stderr)
+    return 0
+
+
+def cmd_reposicion(args):
+    stock, _ = cargar_stock(args)
+    pronostico = PronosticoConsumo(stock)
+    pronostico.cargar(os.path.join(args.datos, ARCHIVO_ESTADO))
+    print(f"{'Ingrediente':<30} {'Unidad':<8} {'Cantidad':>10} {'Consumo/h':>10} {'Horas':>8}")
+    for ing in stock.get_ingredientes():
+        horas = pronostico.horas_restantes(ing.nombre)
+        print(f"{ing.nombre:<30} {ing.unidad:<8} {ing.cantidad:>10} {pronostico.tasa_por_hora(ing.nombre):>10.1f} "
+              f"{'-' if horas == float('inf') else f'{horas:.1f}':>8}")
+    for alerta in pronostico.alertas():
+        print(f"Atención: {alerta}", file=sys.stderr)
+    if args.salida:
+        filas = pronostico.exportar_reposicion(args.salida, args.horas)
+        print(f"Lista de reposición para {args.horas:g} h ({filas} ingrediente(s)) guardada en '{args.salida}'.")
+    return 0
+
+
+def cmd_ventas(args):
+    try:
+        from Ventas import AnalisisVentas
+    except ImportError:
+        print("El análisis de ventas necesita numpy (pip install numpy).", file=sys.stderr)
+        return 1
+    analisis = AnalisisVentas(RegistroPedidos(args.datos))
+    analisis.actualizar()
+    rango = {'desde': args.desde, 'hasta': args.hasta}
+    try:
+        resumen = analisis.resumen(**rango)
+    except ValueError as e:
+        print(f"Fecha inválida en --desde/--hasta (use por ejemplo 2024-01-31 o 2024-01-31T12:00): {e}", file=sys.stderr)
+        return 1
+    print(f"Pedidos: {resumen['pedidos']:,}   Unidades: {resumen['unidades']:,}   "
+          f"Ticket promedio: {formatear_precio(resumen['ticket_promedio'])}".replace(",", "."))
+    print(f"{'Plato':<30} {'Unidades':>10} {'Total':>16}")
+    for nombre, unidades, total in analisis.por_plato(**rango):
+        print(f"{nombre:<30} {unidades:>10} {formatear_precio(total):>16}")
+    print(f"{'SUBTOTAL:':>41} {formatear_precio(resumen['subtotal']):>16}")
+    print(f"{'IVA (19%):':>41} {formatear_precio(resumen['iva']):>16}")
+    print(f"{'TOTAL:':>41} {formatear_precio(resumen['total']):>16}")
+    if args.por_hora:
+        platos, matriz = analisis.por_hora(**rango)
+        horas = [h for h in range(matriz.shape[1]) if matriz[:, h].any()]
+        print()
+        print(f"{'Plato':<30}" + "".join(f"{h:>6}h" for h in horas))
+        for i, nombre in enumerate(platos):
+            if matriz[i].any():
+                print(f"{nombre:<30}" + "".join(f"{matriz[i, h]:>7}" for h in horas))
+    if args.consumo:
+        print()
+        print(f"{'Ingrediente':<30} {'Unidad':<8} {'Consumo':>12}")
+        for nombre, unidad, cantidad in analisis.consumo_ingredientes(Menu(), **rango):
+            print(f"{nombre:<30} {unidad:<8} {cantidad:>12}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gestión de restaurante sin interfaz gráfica.")
+    fuentes = argparse.ArgumentParser(add_help=False)
+    fuentes.add_argument("--csv", help="CSV de ingredientes (nombre,unidad,cantidad) a cargar en el stock")
+    fuentes.add_argument("--datos", help="directorio con el stock persistido (como el de la aplicación)")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    sub.add_parser("stock", parents=[fuentes], help="muestra el stock").set_defaults(funcion=cmd_stock)
+    carta = sub.add_parser("carta", parents=[fuentes], help="muestra la carta y la cruza con el stock")
+    carta.add_argument("--catalogo", help="catálogo JSON de la carta (por defecto, menu.json junto al programa)")
+    carta.set_defaults(funcion=cmd_carta)
+    precio = sub.add_parser("precio", parents=[fuentes], help="calcula el total de un pedido y revisa el stock")
+    precio.add_argument("items", nargs="+", help="'Plato' o 'Plato=cantidad'")
+    precio.set_defaults(funcion=cmd_precio)
+    boleta = sub.add_parser("boleta", parents=[fuentes], help="descuenta el stock y genera la boleta en PDF")
+    boleta.add_argument("items", nargs="+", help="'Plato' o 'Plato=cantidad'")
+    boleta.add_argument("--formato", choices=["pdf", "termica", "texto"], default="pdf",
+                        help="pdf (A4), termica (ESC/POS de 80 mm) o texto (el mismo ticket en texto plano)")
+    boleta.add_argument("--salida", help="archivo, dispositivo o '-' para la salida estándar (por defecto, boleta_pedido.<formato>)")
+    boleta.set_defaults(funcion=cmd_boleta)
+
+    reposicion = sub.add_parser("reposicion", help="muestra el consumo por hora y arma la lista de reposición")
+    reposicion.add_argument("--datos", default="datos", help="directorio con el stock y las tasas de consumo (por defecto, 'datos')")
+    reposicion.add_argument("--horas", type=float, default=24.0, help="horas de consumo que debe cubrir la reposición")
+    reposicion.add_argument("--salida", help="CSV (nombre,unidad,cantidad) para cargar luego en el stock")
+    reposicion.set_defaults(funcion=cmd_reposicion, csv=None)
+    ventas = sub.add_parser("ventas", help="resume las ventas registradas en el directorio de datos")
+    ventas.add_argument("--datos", default="datos", help="directorio con pedidos.jsonl (por defecto, 'datos')")
+    ventas.add_argument("--desde", help="fecha u hora ISO inicial, por ejemplo 2024-01-31 o 2024-01-31T12:00")
+    ventas.add_argument("--hasta", help="fecha u hora ISO final (no incluida)")
+    ventas.add_argument("--por-hora", action="store_true", help="muestra las unidades de cada plato por hora del día")
+    ventas.add_argument("--consumo", action="store_true", help="muestra los ingredientes gastados según las recetas")
+    ventas.set_defaults(funcion=cmd_ventas)
+
+    args = parser.parse_args(argv)
+    return args.funcion(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
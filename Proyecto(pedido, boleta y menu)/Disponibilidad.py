@@ -0,0 +1,97 @@
+# Disponibilidad.py
+from array import array
+
+from Perfilado import medido
+
+SIN_LIMITE = 2 ** 31 - 1  # porciones de un plato sin ingredientes: el stock nunca lo limita
+
+
+class MotorDisponibilidad:
+    """
+    Calcula cuántas porciones de cada plato del menú permite el stock actual.
+    Las recetas se compilan una vez a vectores sobre un índice denso de ingredientes,
+    y cada evento del stock recalcula solo los platos que usan los ingredientes modificados.
+    """
+    def __init__(self, menu, stock):
+        self.menu = menu
+        self.stock = stock
+        self._suscriptores = []
+        self.compilar()
+        stock.suscribir(self._al_cambiar_stock)
+        menu.suscribir(self._al_cambiar_menu)
+
+    def suscribir(self, callback):
+        """Registra callback(cambios), donde cambios es {nombre_plato: porciones} de los platos que cambiaron."""
+        self._suscriptores.append(callback)
+
+    def compilar(self):
+        """Precompila las recetas del menú; se llama sola cuando el menú se recarga."""
+        # Todo se arma aparte y se asigna al final, para que porciones() y todas() nunca vean un índice a medias
+        indice = {}      # nombre de ingrediente (minúscula) -> posición
+        usado_por = []   # posición de ingrediente -> posiciones de los platos que lo usan
+        platos = list(self.menu.get_items())
+        recetas = []     # posición de plato -> (posiciones, requeridos)
+        for i_plato, nombre_plato in enumerate(platos):
+            requeridos = {}
+            for ing, cant_req in self.menu.get_item(nombre_plato)['ingredientes'].items():
+                if cant_req <= 0:
+                    continue
+                pos = indice.get(ing.lower())
+                if pos is None:
+                    pos = indice[ing.lower()] = len(indice)
+                    usado_por.append([])
+                requeridos[pos] = requeridos.get(pos, 0) + cant_req
+            for pos in requeridos:
+                usado_por[pos].append(i_plato)
+            recetas.append((tuple(requeridos), tuple(requeridos.values())))
+        existencias = array('q', [0]) * len(indice)
+        for nombre, pos in indice.items():
+            existencias[pos] = self._cantidad_en_stock(nombre)
+        porciones = [self._calcular(recetas[i_plato], existencias) for i_plato in range(len(platos))]
+        self._indice, self._usado_por, self._recetas, self._existencias = indice, usado_por, recetas, existencias
+        self._platos, self._porciones = platos, porciones
+        self._posicion_plato = {nombre: i for i, nombre in enumerate(platos)}
+
+    def _al_cambiar_menu(self, agregados, actualizados, eliminados):
+        self.compilar()
+        cambios = {nombre: self.porciones(nombre) for nombre in agregados + actualizados}
+        if cambios:
+            for callback in self._suscriptores:
+                callback(cambios)
+
+    def _cantidad_en_stock(self, nombre):
+        ingrediente = self.stock.ingredientes.get(nombre)
+        return ingrediente.cantidad if ingrediente is not None else 0
+
+    @staticmethod
+    def _calcular(receta, existencias):
+        posiciones, requeridos = receta
+        if not posiciones:
+            return SIN_LIMITE
+        return max(0, min(existencias[pos] // req for pos, req in zip(posiciones, requeridos)))
+
+    def porciones(self, nombre_plato):
+        i_plato = self._posicion_plato.get(nombre_plato)
+        return self._porciones[i_plato] if i_plato is not None else 0
+
+    def todas(self):
+        return dict(zip(self._platos, self._porciones))
+
+    @medido
+    def _al_cambiar_stock(self, agregados, actualizados, eliminados):
+        afectados = set()
+        for grupo in (agregados, actualizados, eliminados):
+            for nombre in grupo:
+                pos = self._indice.get(nombre)
+                if pos is not None:
+                    self._existencias[pos] = self._cantidad_en_stock(nombre)
+                    afectados.update(self._usado_por[pos])
+        cambios = {}
+        for i_plato in afectados:
+            porciones = self._calcular(self._recetas[i_plato], self._existencias)
+            if porciones != self._porciones[i_plato]:
+                self._porciones[i_plato] = porciones
+                cambios[self._platos[i_plato]] = porciones
+        if cambios:
+            for callback in self._suscriptores:
+                callback(cambios)
@@ -0,0 +1,413 @@
+# FuentesTabla.py
+import csv
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, insort
+
+from CargaCSV import _abrir, _es_encabezado, _fila_vacia, _filas_de_datos
+
+CAMBIOS_PARA_RECONSTRUIR = 1000  # con más cambios en un solo evento conviene reordenar todo de una vez
+_SIN_DATOS = b' \t\r\n\x0b\x0c\x1c\x1d\x1e\x1f,'  # espacios (los de str.strip) y comas
+_COMILLA = ord('"')  # buscar un int en bytes es un memchr; buscar b'"' pasa por el protocolo de buffer, 10 veces más lento
+
+
+def _quitar_ordenado(lista, elemento):
+    posicion = bisect_left(lista, elemento)
+    if posicion < len(lista) and lista[posicion] == elemento:
+        del lista[posicion]
+
+
+class _LineasConPosicion:
+    """Entrega a csv.reader las líneas de un archivo binario y lleva la posición en bytes de lo ya leído."""
+    def __init__(self, archivo, posicion):
+        archivo.seek(posicion)
+        self._archivo = archivo
+        self.posicion = posicion
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        linea = self._archivo.readline()
+        if not linea:
+            raise StopIteration
+        self.posicion += len(linea)
+        return linea.decode("utf-8", errors="replace")
+
+
+class FuenteTabla(ABC):
+    """
+    Filas de una TablaVirtual, sin depender de tkinter. Mantiene un índice ordenado por nombre
+    (lista de (nombre en minúscula, clave)) para filtrar por prefijo con bisect, y la lista de
+    filas visibles ordenada por la columna elegida; los cambios se insertan en su lugar sin reordenar.
+    Con columna de orden None se muestran las filas en su orden natural (solo FuenteCSV).
+    """
+    columnas = ()        # (id, título) de cada columna
+    columna_nombre = 0   # columna por la que se filtra
+    cambia = True        # False en fuentes de solo lectura: no guardan el nombre de cada clave
+
+    def __init__(self, columna_orden=0):
+        self._columna_orden = columna_orden
+        self._descendente = False
+        self._prefijo = ""
+        self._suscriptores = []
+        self._nombres = None       # (nombre en minúscula, clave) de todas las filas, ordenado
+        self._nombre_de = {}       # clave -> nombre en minúscula con que está en _nombres
+        self._lista = []           # (valor de orden, clave) de las filas visibles, ordenado
+        self._valores_orden = None # clave -> valor de orden de las claves en _lista (None si se ordena por nombre)
+        self._natural = False
+
+    # --- Lo que define cada fuente ---
+
+    @abstractmethod
+    def _claves(self):
+        """Todas las claves de filas (iterable)."""
+
+    @abstractmethod
+    def nombre(self, clave):
+        """Texto de la columna por la que se filtra."""
+
+    @abstractmethod
+    def valores(self, clave):
+        """Tupla con los valores a mostrar en cada columna."""
+
+    @abstractmethod
+    def valor_orden(self, clave, columna):
+        """Valor comparable con que se ordena la fila por esa columna."""
+
+    def _nombres_de(self, claves):
+        return [(self.nombre(clave).lower(), clave) for clave in claves]
+
+    def _valores_de(self, claves, columna):
+        """(valor, clave) de las claves indicadas, o de todas si claves es None."""
+        if claves is None:
+            claves = self._claves()
+        return [(self.valor_orden(clave, columna), clave) for clave in claves]
+
+    # --- Eventos ---
+
+    def suscribir(self, callback):
+        """Registra callback(), que se llama cada vez que cambian las filas visibles."""
+        self._suscriptores.append(callback)
+
+    def _notificar(self):
+        for callback in self._suscriptores:
+            callback()
+
+    # --- Índices ---
+
+    def _asegurar_indice(self):
+        if self._nombres is None:
+            self._nombres = sorted(self._nombres_de(self._claves()))
+            if self.cambia:
+                self._nombre_de = {clave: nombre for nombre, clave in self._nombres}
+
+    def _rango_prefijo(self):
+        if not self._prefijo:
+            return 0, len(self._nombres)
+        return bisect_left(self._nombres, (self._prefijo,)), bisect_left(self._nombres, (self._prefijo + "\U0010ffff",))
+
+    def _armar_lista(self):
+        self._valores_orden = None
+        self._natural = self._columna_orden is None and not self._prefijo
+        if self._natural:
+            return
+        self._asegurar_indice()
+        inicio, fin = self._rango_prefijo()
+        if self._columna_orden == self.columna_nombre:
+            self._lista = self._nombres[inicio:fin]  # copia: _agregar inserta en ambas y solo aquí si pasa el filtro
+            return
+        claves = None if (inicio, fin) == (0, len(self._nombres)) else [clave for _, clave in self._nombres[inicio:fin]]
+        if self._columna_orden is None:
+            self._lista = [(clave, clave) for clave in sorted(self._claves() if claves is None else claves)]
+        else:
+            self._lista = sorted(self._valores_de(claves, self._columna_orden))
+            if self.cambia:
+                self._valores_orden = {clave: valor for valor, clave in self._lista}
+
+    def reconstruir(self):
+        """Rehace los índices desde cero (carga inicial o cambios masivos)."""
+        self._nombres = None
+        self._armar_lista()
+        self._notificar()
+
+    def _valor_en_lista(self, clave, nombre):
+        if self._valores_orden is not None:
+            return self._valores_orden.get(clave)
+        if self._columna_orden is None:
+            return clave
+        if self._columna_orden == self.columna_nombre:
+            return nombre
+        return self.valor_orden(clave, self._columna_orden)
+
+    def _agregar(self, clave):
+        nombre = self.nombre(clave).lower()
+        self._nombre_de[clave] = nombre
+        insort(self._nombres, (nombre, clave))
+        if not nombre.startswith(self._prefijo):
+            return
+        if self._valores_orden is not None:
+            valor = self._valores_orden[clave] = self.valor_orden(clave, self._columna_orden)
+        else:
+            valor = self._valor_en_lista(clave, nombre)
+        insort(self._lista, (valor, clave))
+
+    def _quitar(self, clave):
+        nombre = self._nombre_de.pop(clave, None)
+        if nombre is None:
+            return
+        if nombre.startswith(self._prefijo):
+            valor = self._valor_en_lista(clave, nombre)
+            if self._valores_orden is not None:
+                del self._valores_orden[clave]
+            _quitar_ordenado(self._lista, (valor, clave))
+        _quitar_ordenado(self._nombres, (nombre, clave))
+
+    def _actualizar(self, clave):
+        """Reubica una fila cuyo valor de orden pudo cambiar (el nombre no cambia)."""
+        if self._valores_orden is None or clave not in self._valores_orden:
+            return
+        if not self._nombre_de[clave].startswith(self._prefijo):
+            return
+        anterior, nuevo = self._valores_orden[clave], self.valor_orden(clave, self._columna_orden)
+        if anterior != nuevo:
+            _quitar_ordenado(self._lista, (anterior, clave))
+            insort(self._lista, (nuevo, clave))
+            self._valores_orden[clave] = nuevo
+
+    def _aplicar_cambios(self, agregados, actualizados, eliminados):
+        if self._natural or self._nombres is None:
+            self._notificar()
+            return
+        if len(agregados) + len(eliminados) > CAMBIOS_PARA_RECONSTRUIR:
+            self.reconstruir()
+            return
+        for clave in eliminados:
+            self._quitar(clave)
+        for clave in agregados:
+            if clave in self._nombre_de:
+                self._actualizar(clave)
+            else:
+                self._agregar(clave)
+        for clave in actualizados:
+            self._actualizar(clave)
+        self._notificar()
+
+    # --- Consultas de la tabla ---
+
+    def __len__(self):
+        return self._total_natural() if self._natural else len(self._lista)
+
+    def _total_natural(self):
+        return 0
+
+    def clave(self, posicion):
+        """Clave de la fila visible número posicion (0 es la primera según el orden actual)."""
+        if self._descendente:
+            posicion = len(self) - 1 - posicion
+        return posicion if self._natural else self._lista[posicion][1]
+
+    def fila(self, posicion):
+        return self.valores(self.clave(posicion))
+
+    def posicion(self, clave):
+        """Posición visible de una clave, o None si está filtrada o ya no existe."""
+        if self._natural:
+            if not 0 <= clave < len(self):
+                return None
+            posicion = clave
+        else:
+            nombre = self._nombre_de.get(clave) if self.cambia else self.nombre(clave).lower()
+            if nombre is None or not nombre.startswith(self._prefijo):
+                return None
+            elemento = (self._valor_en_lista(clave, nombre), clave)
+            posicion = bisect_left(self._lista, elemento)
+            if posicion >= len(self._lista) or self._lista[posicion] != elemento:
+                return None
+        return len(self) - 1 - posicion if self._descendente else posicion
+
+    @property
+    def orden(self):
+        return self._columna_orden, self._descendente
+
+    def ordenar(self, columna, descendente=None):
+        """Ordena por una columna; sin indicar descendente, repetir la misma columna invierte el orden."""
+        if descendente is None:
+            descendente = not self._descendente if columna == self._columna_orden else False
+        cambia_columna = columna != self._columna_orden
+        self._columna_orden, self._descendente = columna, descendente
+        if cambia_columna:
+            self._armar_lista()
+        self._notificar()
+
+    def filtrar(self, prefijo):
+        """Deja visibles solo las filas cuyo nombre empieza con prefijo (sin distinguir mayúsculas)."""
+        prefijo = prefijo.strip().lower()
+        if prefijo == self._prefijo:
+            return
+        if self._valores_orden is not None and prefijo.startswith(self._prefijo):
+            # Al seguir escribiendo se achica la lista ya ordenada en vez de volver a ordenar
+            # (_valores_orden puede conservar claves que quedaron fuera; _actualizar revisa el prefijo)
+            self._prefijo = prefijo
+            inicio, fin = self._rango_prefijo()
+            if fin - inicio != len(self._lista):
+                nombre_de = self._nombre_de
+                self._lista = [(valor, clave) for valor, clave in self._lista if nombre_de[clave].startswith(prefijo)]
+        else:
+            self._prefijo = prefijo
+            self._armar_lista()
+        self._notificar()
+
+
+class FuenteStock(FuenteTabla):
+    columnas = (("nombre", "Nombre"), ("unidad", "Unidad"), ("cantidad", "Cantidad"))
+
+    def __init__(self, stock, valores_fila):
+        super().__init__(columna_orden=0)
+        self.stock = stock
+        self.valores_fila = valores_fila
+        self._armar_lista()
+        stock.suscribir(self._aplicar_cambios)
+
+    def _claves(self):
+        return self.stock.ingredientes
+
+    def _nombres_de(self, claves):
+        # La clave del stock ya es el nombre en minúscula
+        return [(clave, clave) for clave in claves]
+
+    def nombre(self, clave):
+        return clave
+
+    def valores(self, clave):
+        return self.valores_fila(self.stock.ingredientes[clave])
+
+    def valor_orden(self, clave, columna):
+        ingrediente = self.stock.ingredientes[clave]
+        return (ingrediente.nombre.lower(), ingrediente.unidad, ingrediente.cantidad)[columna]
+
+    def _valores_de(self, claves, columna):
+        ingredientes = self.stock.ingredientes
+        pares = ingredientes.items() if claves is None else ((clave, ingredientes[clave]) for clave in claves)
+        if columna == 2:
+            return [(ingrediente.cantidad, clave) for clave, ingrediente in pares]
+        return [(ingrediente.unidad, clave) for clave, ingrediente in pares]
+
+
+class FuentePedido(FuenteTabla):
+    columnas = (("id", "ID"), ("item", "Ítem"), ("precio", "Precio"))
+    columna_nombre = 1
+
+    def __init__(self, pedido, valores_fila):
+        super().__init__(columna_orden=0)
+        self.pedido = pedido
+        self.valores_fila = valores_fila
+        self._armar_lista()
+        pedido.suscribir(self._aplicar_cambios)
+
+    def _claves(self):
+        return self.pedido.ids()
+
+    def nombre(self, clave):
+        return self.pedido.nombre_item(clave)
+
+    def valores(self, clave):
+        return self.valores_fila(self.pedido.get_item(clave))
+
+    def valor_orden(self, clave, columna):
+        if columna == 0:
+            return clave
+        return self.pedido.precio_item(clave)
+
+
+class FuenteCSV(FuenteTabla):
+    """
+    Vista previa de un CSV de ingredientes sin cargarlo en memoria: guarda solo la posición en bytes
+    de cada fila de datos y lee del disco las filas que se están mostrando. Los índices para ordenar
+    o filtrar se arman recién cuando se piden.
+    """
+    columnas = (("nombre", "Nombre"), ("unidad", "Unidad"), ("cantidad", "Cantidad"))
+    cambia = False
+
+    def __init__(self, filepath):
+        super().__init__(columna_orden=None)
+        self.filepath = filepath
+        self._posiciones = array('q')
+        self._archivo = open(filepath, "rb")
+        self._indexar()
+        self._armar_lista()
+
+    def _indexar(self):
+        # Cada fila empieza donde terminó la anterior. Una línea sin comillas es una fila completa y, si es
+        # ASCII con algo más que espacios y comas, no está vacía: no hace falta leerla como CSV. Con comillas,
+        # un campo puede seguir en las líneas siguientes y csv.reader toma todas las que ocupe la fila.
+        # Encabezado y filas vacías se saltan con el mismo criterio que _filas_de_datos
+        archivo = self._archivo
+        posicion = 3 if archivo.read(3) == b"\xef\xbb\xbf" else 0
+        archivo.seek(posicion)
+        primera = True
+        for linea in archivo:
+            inicio, posicion = posicion, posicion + len(linea)
+            if _COMILLA in linea:
+                lineas = _LineasConPosicion(archivo, inicio)
+                fila = next(csv.reader(lineas), [])
+                posicion = lineas.posicion
+            elif linea.isascii() and linea.strip(_SIN_DATOS) and not primera:
+                self._posiciones.append(inicio)
+                continue
+            else:
+                fila = next(csv.reader([linea.decode("utf-8", errors="replace")]), [])
+            if _fila_vacia(fila):
+                continue
+            if primera:
+                primera = False
+                if _es_encabezado(fila):
+                    continue
+            self._posiciones.append(inicio)
+
+    def _filas(self):
+        """Recorre todas las filas de datos en orden, para armar los índices en una sola pasada."""
+        # Mismo criterio que _indexar (y que cargar_csv_en_stock) para saltar encabezado y filas vacías
+        with _abrir(self.filepath) as file:
+            for _, fila in _filas_de_datos(csv.reader(file)):
+                yield fila
+
+    def _claves(self):
+        return range(len(self._posiciones))
+
+    def _nombres_de(self, claves):
+        # Como en _valores_de: leer el archivo de corrido es mucho más rápido que buscar fila por fila
+        nombres = [self._convertir(fila, 0) for fila in self._filas()]
+        return [(nombres[clave], clave) for clave in claves]
+
+    def _valores_de(self, claves, columna):
+        columna_completa = [self._convertir(fila, columna) for fila in self._filas()]
+        if claves is None:
+            return [(valor, numero) for numero, valor in enumerate(columna_completa)]
+        return [(columna_completa[clave], clave) for clave in claves]
+
+    @staticmethod
+    def _convertir(fila, columna):
+        texto = fila[columna].strip() if len(fila) > columna else ""
+        if columna == 2:
+            try:
+                return float(texto)
+            except ValueError:
+                return float("-inf")
+        return texto.lower()
+
+    def _total_natural(self):
+        return len(self._posiciones)
+
+    def nombre(self, clave):
+        fila = self.valores(clave)
+        return fila[0].strip() if fila else ""
+
+    def valores(self, clave):
+        return tuple(next(csv.reader(_LineasConPosicion(self._archivo, self._posiciones[clave])), ()))
+
+    def valor_orden(self, clave, columna):
+        return self._convertir(self.valores(clave), columna)
+
+    def cerrar(self):
+        self._archivo.close()
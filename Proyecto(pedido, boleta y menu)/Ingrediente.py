@@ -1,9 +1,15 @@
 # Ingrediente.py
+from Unidades import a_unidad_base
+
+
 class Ingrediente:
+    # Sin __dict__ por instancia: con catálogos grandes cada ingrediente ocupa bastante menos
+    __slots__ = ("nombre", "unidad", "cantidad")
+
     def __init__(self, nombre, unidad, cantidad):
+        # La cantidad queda como entero en la unidad base (g, cc o unid); ver Unidades.py
         self.nombre = nombre
-        self.unidad = unidad
-        self.cantidad = float(cantidad)
+        self.unidad, self.cantidad = a_unidad_base(cantidad, unidad)
 
     def __str__(self):
-        return f"{self.nombre} ({self.cantidad} {self.unidad})"
\ No newline at end of file
+        return f"{self.nombre} ({self.cantidad} {self.unidad})"
@@ -1,18 +1,125 @@
 # Menu.py
+import json
+import os
+
+from Unidades import a_unidad_base
+
+# Catálogo por defecto, junto a este archivo. Es un objeto JSON {plato: {"precio": ..., "ingredientes": {...}}}
+# en el orden en que se muestran los platos; cada ingrediente se pide como [cantidad, unidad] (cantidad mayor que cero) y un
+# número solo se entiende en unidades.
+RUTA_CATALOGO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "menu.json")
+
+
 class Menu:
-    def __init__(self):
-        self._items = {
-            "Papas fritas": {"precio": 500, "ingredientes": {"papas": 5}},
-            "Pepsi": {"precio": 1100, "ingredientes": {"pepsi": 1}},
-            "Completo": {"precio": 1800, "ingredientes": {"vienesa": 1, "pan de completo": 1, "tomate": 1, "palta": 1}},
-            "Hamburguesa": {"precio": 3500, "ingredientes": {"pan de hamburguesa": 1, "lamina de queso": 1, "churrasco de carne": 1}},
-            "Panqueques": {"precio": 2000, "ingredientes": {"panqueques": 2, "manjar": 1, "azucar flor": 1}},
-            "Pollo frito": {"precio": 2800, "ingredientes": {"presa de pollo": 1, "porcion de harina": 1, "porcion de aceite": 1}},
-            "Ensalada mixta": {"precio": 1500, "ingredientes": {"lechuga": 1, "tomate": 1, "zanahoria rallada": 1}},
-        }
+    """
+    Carta leída desde un catálogo JSON. recargar_si_cambio() vuelve a leer el archivo solo si cambió
+    (fecha de modificación o tamaño), así se puede llamar seguido para editar la carta sin reiniciar.
+    Si el catálogo nuevo tiene errores se conserva la carta anterior.
+    """
+    def __init__(self, ruta=RUTA_CATALOGO):
+        self.ruta = ruta
+        self._firma = None
+        self._items = {}
+        self._unidades = {}   # ingrediente (minúscula) -> unidad base que usan las recetas
+        self._usado_por = {}  # ingrediente (minúscula) -> platos que lo usan
+        self._suscriptores = []
+        self.cargar()
+
+    def suscribir(self, callback):
+        """Registra callback(agregados, actualizados, eliminados) con los nombres de los platos que cambiaron al recargar."""
+        self._suscriptores.append(callback)
+
+    def _firma_archivo(self):
+        estado = os.stat(self.ruta)
+        return estado.st_mtime_ns, estado.st_size
+
+    def cargar(self):
+        """Lee el catálogo completo; lanza ValueError (o OSError) si no se puede usar y devuelve los platos que cambiaron."""
+        self._firma = self._firma_archivo()
+        with open(self.ruta, "r", encoding="utf-8") as f:
+            try:
+                catalogo = json.load(f)
+            except ValueError as e:
+                raise ValueError(f"el catálogo '{self.ruta}' no es JSON válido: {e}")
+        if not isinstance(catalogo, dict):
+            raise ValueError(f"el catálogo '{self.ruta}' debe ser un objeto {{plato: {{precio, ingredientes}}}}")
+        # Las recetas se convierten una sola vez a enteros en unidad base, igual que el Stock
+        items, unidades, usado_por = {}, {}, {}
+        for nombre, info in catalogo.items():
+            precio = info.get("precio") if isinstance(info, dict) else None
+            if not isinstance(precio, int) or isinstance(precio, bool) or precio < 0:
+                raise ValueError(f"'{nombre}' no tiene un precio válido (entero, en pesos)")
+            if not isinstance(info.get("ingredientes"), dict):
+                raise ValueError(f"'{nombre}' no tiene ingredientes")
+            items[nombre] = {"precio": precio, "ingredientes": self._convertir_receta(nombre, info["ingredientes"], unidades)}
+            for ing in items[nombre]["ingredientes"]:
+                usado_por.setdefault(ing.lower(), []).append(nombre)
+        anteriores = self._items
+        self._items, self._unidades, self._usado_por = items, unidades, usado_por
+        agregados = [nombre for nombre in items if nombre not in anteriores]
+        actualizados = [nombre for nombre in items if nombre in anteriores and items[nombre] != anteriores[nombre]]
+        eliminados = [nombre for nombre in anteriores if nombre not in items]
+        if agregados or actualizados or eliminados:
+            for callback in self._suscriptores:
+                callback(agregados, actualizados, eliminados)
+        return agregados, actualizados, eliminados
+
+    def recargar_si_cambio(self):
+        """
+        Vuelve a leer el catálogo si el archivo cambió desde la última lectura. Devuelve los platos
+        (agregados, actualizados, eliminados) o None si no cambió. Un catálogo con errores se
+        informa una sola vez (ValueError) hasta que el archivo se vuelva a modificar.
+        """
+        try:
+            if self._firma_archivo() == self._firma:
+                return None
+        except OSError:
+            return None  # se está reemplazando el archivo: se revisa en la próxima llamada
+        return self.cargar()
+
+    @staticmethod
+    def _convertir_receta(nombre_plato, ingredientes, unidades):
+        convertidos = {}
+        for ing, requerido in ingredientes.items():
+            if isinstance(requerido, (tuple, list)) and len(requerido) == 2:
+                cantidad, unidad = requerido
+            else:
+                cantidad, unidad = requerido, "unid"
+            if not isinstance(cantidad, (int, float)) or isinstance(cantidad, bool) or not isinstance(unidad, str):
+                raise ValueError(f"'{nombre_plato}' pide '{ing}' como {json.dumps(requerido)}; se espera [cantidad, unidad] o un número")
+            try:
+                unidad_base, cantidad_base = a_unidad_base(cantidad, unidad)
+            except ValueError as e:
+                raise ValueError(f"'{nombre_plato}' pide '{ing}' con {e}")
+            if cantidad_base <= 0:
+                raise ValueError(f"'{nombre_plato}' pide '{ing}' en cantidad {cantidad} {unidad}; debe ser mayor que cero")
+            previa = unidades.setdefault(ing.lower(), unidad_base)
+            if previa != unidad_base:
+                raise ValueError(f"'{nombre_plato}' pide '{ing}' en {unidad_base}, pero otra receta lo pide en {previa}")
+            convertidos[ing] = cantidad_base
+        return convertidos
 
     def get_items(self):
         return self._items
 
     def get_item(self, nombre):
-        return self._items.get(nombre)
\ No newline at end of file
+        return self._items.get(nombre)
+
+    def unidad_ingrediente(self, nombre):
+        """Unidad base (g, cc o unid) en que las recetas piden el ingrediente, o None si ninguna lo usa."""
+        return self._unidades.get(nombre.lower())
+
+    def verificar_stock(self, stock):
+        """
+        Cruza las recetas con el stock en una pasada por el índice de ingredientes de la carta.
+        Devuelve (faltantes, diferencias): faltantes son (ingrediente, platos que lo usan) de los que no
+        están en el stock, y diferencias son (ingrediente, unidad de la receta, unidad del stock).
+        """
+        faltantes, diferencias = [], []
+        for ing, unidad_receta in self._unidades.items():
+            en_stock = stock.ingredientes.get(ing)
+            if en_stock is None:
+                faltantes.append((ing, self._usado_por[ing]))
+            elif en_stock.unidad != unidad_receta:
+                diferencias.append((ing, unidad_receta, en_stock.unidad))
+        return faltantes, diferencias
@@ -1,12 +1,15 @@
 # Menupdf.py
-from fpdf import FPDF
 import os
 
+from Perfilado import medido
+
 class MenuPDF:
     def __init__(self, menu_items):
+        from fpdf import FPDF  # se carga solo cuando se genera una carta
         self.menu_items = menu_items
         self.pdf = FPDF()
 
+    @medido
     def generar(self, filename="carta_restaurante.pdf"):
         try:
             self.pdf.add_page()
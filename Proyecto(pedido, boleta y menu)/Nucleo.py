@@ -0,0 +1,31 @@
+# Nucleo.py
+# Lógica del restaurante sin interfaz gráfica: sirve para scripts, pruebas o un servidor.
+# Los módulos pesados (PDF, render, numpy, la ventana de customtkinter) se importan recién al pedirlos.
+import importlib
+
+from Ingrediente import Ingrediente
+from Stock import Stock
+from Menu import Menu
+from Pedido import Pedido
+from CargaCSV import cargar_csv_en_stock
+from Disponibilidad import MotorDisponibilidad
+from ServicioStock import ServicioStock
+from Persistencia import DiarioStock, RegistroPedidos
+from Pronostico import PronosticoConsumo
+
+_CARGA_PEREZOSA = {
+    "BoletaPDF": "Boleta",
+    "generar_lote": "Boleta",
+    "MenuPDF": "Menupdf",
+    "ServicioRender": "RenderPDF",
+    "RestauranteApp": "Restaurante",
+    "AnalisisVentas": "Ventas",
+}
+
+
+def __getattr__(nombre):
+    if nombre in _CARGA_PEREZOSA:
+        valor = getattr(importlib.import_module(_CARGA_PEREZOSA[nombre]), nombre)
+        globals()[nombre] = valor
+        return valor
+    raise AttributeError(f"el módulo 'Nucleo' no tiene el atributo '{nombre}'")
@@ -1,36 +1,166 @@
 # Pedido.py
+from array import array
+
+from Perfilado import medido
+
+MINIMO_PARA_COMPACTAR = 64
+
+
 class Pedido:
+    """
+    Las líneas del pedido se guardan en columnas compactas (id, plato, precio) en vez de un dict por ítem.
+    Cada plato distinto se guarda una sola vez; get_items() arma los dicts al momento de pedirlos.
+    Un índice id -> posición, el total acumulado y la cantidad por plato se mantienen al agregar y
+    eliminar, así eliminar un ítem, calcular el total y agrupar la boleta no recorren el pedido.
+    """
     def __init__(self):
-        self.items = []
+        self._platos = []          # indice -> (nombre, ingredientes) de cada plato distinto
+        self._indice_platos = {}   # nombre -> indice en _platos
         self._next_id = 1
+        self._suscriptores = []
+        self._vaciar()
 
-    def agregar_item(self, item_info, nombre_item):
-        item_con_id = {
-            'id': self._next_id,
-            'nombre': nombre_item,
-            'precio': item_info['precio'],
-            'ingredientes': item_info['ingredientes']
+    def _vaciar(self):
+        self._ids = array('q')     # un id 0 marca una línea eliminada (los ids parten en 1)
+        self._platos_idx = array('l')
+        self._precios = array('q')
+        self._posiciones = {}      # id -> posición en las columnas
+        self._eliminadas = 0
+        self._total = 0
+        self._cantidades = {}      # indice de plato -> cantidad, en orden de aparición
+        self._precio_unitario = {} # indice de plato -> precio de la primera vez que se agregó
+
+    def suscribir(self, callback):
+        """Registra callback(agregados, actualizados, eliminados), que recibe los ids de ítems que cambiaron."""
+        self._suscriptores.append(callback)
+
+    def _notificar(self, agregados=(), actualizados=(), eliminados=()):
+        for callback in self._suscriptores:
+            callback(agregados, actualizados, eliminados)
+
+    def _indice_plato(self, nombre_item, ingredientes):
+        indice = self._indice_platos.get(nombre_item)
+        # Si la receta del plato cambió (otro dict de ingredientes) se guarda como un plato nuevo
+        if indice is None or self._platos[indice][1] is not ingredientes:
+            indice = self._indice_platos[nombre_item] = len(self._platos)
+            self._platos.append((nombre_item, ingredientes))
+        return indice
+
+    def _armar_item(self, posicion):
+        nombre, ingredientes = self._platos[self._platos_idx[posicion]]
+        return {
+            'id': self._ids[posicion],
+            'nombre': nombre,
+            'precio': self._precios[posicion],
+            'ingredientes': ingredientes
         }
-        self.items.append(item_con_id)
+
+    @medido
+    def agregar_item(self, item_info, nombre_item):
+        item_id, precio = self._next_id, item_info['precio']
+        indice = self._indice_plato(nombre_item, item_info['ingredientes'])
+        self._posiciones[item_id] = len(self._ids)
+        self._ids.append(item_id)
+        self._platos_idx.append(indice)
+        self._precios.append(precio)
+        self._total += precio
+        self._cantidades[indice] = self._cantidades.get(indice, 0) + 1
+        self._precio_unitario.setdefault(indice, precio)
         self._next_id += 1
-        return item_con_id
+        self._notificar(agregados=(item_id,))
+        return self._armar_item(len(self._ids) - 1)
+
+    def _columnas_vivas(self):
+        """Copias de las columnas (ids, platos, precios) sin las líneas eliminadas."""
+        if not self._eliminadas:
+            return array('q', self._ids), array('l', self._platos_idx), array('q', self._precios)
+        vivas = [posicion for posicion in range(len(self._ids)) if self._ids[posicion]]
+        return (array('q', (self._ids[p] for p in vivas)), array('l', (self._platos_idx[p] for p in vivas)),
+                array('q', (self._precios[p] for p in vivas)))
 
+    def _compactar(self):
+        """Quita las líneas marcadas como eliminadas; se llama cuando son más de la mitad."""
+        self._ids, self._platos_idx, self._precios = self._columnas_vivas()
+        self._posiciones = {item_id: posicion for posicion, item_id in enumerate(self._ids)}
+        self._eliminadas = 0
+
+    @medido
     def eliminar_item(self, item_id):
-        item_a_eliminar = None
-        for item in self.items:
-            if item['id'] == item_id:
-                item_a_eliminar = item
-                break
-        if item_a_eliminar:
-            self.items.remove(item_a_eliminar)
-            return item_a_eliminar
-        return None
+        posicion = self._posiciones.pop(item_id, None)
+        if posicion is None:
+            return None
+        item_a_eliminar = self._armar_item(posicion)
+        indice = self._platos_idx[posicion]
+        self._ids[posicion] = 0
+        self._eliminadas += 1
+        self._total -= self._precios[posicion]
+        self._cantidades[indice] -= 1
+        if not self._cantidades[indice]:
+            del self._cantidades[indice]
+            del self._precio_unitario[indice]
+        if self._eliminadas > MINIMO_PARA_COMPACTAR and self._eliminadas * 2 > len(self._ids):
+            self._compactar()
+        self._notificar(eliminados=(item_id,))
+        return item_a_eliminar
 
     def get_items(self):
-        return self.items
+        return [self._armar_item(posicion) for posicion in range(len(self._ids)) if self._ids[posicion]]
+
+    def __len__(self):
+        return len(self._posiciones)
+
+    @property
+    def items(self):
+        return self.get_items()
+
+    def ids(self):
+        """Ids de los ítems vigentes, en orden de agregado."""
+        return [item_id for item_id in self._ids if item_id]
+
+    def nombre_item(self, item_id):
+        return self._platos[self._platos_idx[self._posiciones[item_id]]][0]
+
+    def precio_item(self, item_id):
+        return self._precios[self._posiciones[item_id]]
+
+    def get_item(self, item_id):
+        posicion = self._posiciones.get(item_id)
+        return self._armar_item(posicion) if posicion is not None else None
 
     def calcular_total(self):
-        return sum(item['precio'] for item in self.items)
-    
+        return self._total
+
+    def agrupar(self):
+        """Ítems agrupados por nombre con cantidad, precio unitario y total, en orden de aparición."""
+        agrupados = {}
+        for indice, cantidad in self._cantidades.items():
+            nombre = self._platos[indice][0]
+            if nombre in agrupados:
+                agrupados[nombre]['cantidad'] += cantidad
+            else:
+                agrupados[nombre] = {'cantidad': cantidad, 'precio_unit': self._precio_unitario[indice]}
+        for detalles in agrupados.values():
+            detalles['total'] = detalles['cantidad'] * detalles['precio_unit']
+        return list(agrupados.items())
+
+    def lineas_por_plato(self):
+        """Líneas (ingredientes_requeridos, cantidad), una por plato, para Stock.reservar/liberar."""
+        return [(self._platos[indice][1], cantidad) for indice, cantidad in self._cantidades.items()]
+
+    def copia(self):
+        """Copia sin suscriptores ni líneas eliminadas, para enviar el pedido a otro hilo o proceso; el original no cambia."""
+        nuevo = Pedido()
+        nuevo._ids, nuevo._platos_idx, nuevo._precios = self._columnas_vivas()
+        nuevo._posiciones = {item_id: posicion for posicion, item_id in enumerate(nuevo._ids)}
+        nuevo._total = self._total
+        nuevo._cantidades = dict(self._cantidades)
+        nuevo._precio_unitario = dict(self._precio_unitario)
+        nuevo._platos = list(self._platos)
+        nuevo._indice_platos = dict(self._indice_platos)
+        nuevo._next_id = self._next_id
+        return nuevo
+
     def limpiar(self):
-        self.items.clear()
\ No newline at end of file
+        eliminados = list(self._posiciones)
+        self._vaciar()
+        self._notificar(eliminados=eliminados)
@@ -0,0 +1,78 @@
+# Perfilado.py
+# Perfilado opcional del camino pedido -> boleta. Las funciones marcadas con @medido acumulan
+# llamadas y tiempo solo si la variable de entorno RESTAURANTE_PERFIL está definida al importar;
+# si no, el decorador devuelve la misma función y no agrega ningún costo.
+#   RESTAURANTE_PERFIL=perfil.json python Restaurante.py   -> al salir escribe los contadores en perfil.json
+#   RESTAURANTE_PERFIL=1 python bench/suite.py             -> solo activa; se leen con contadores()
+# Lo que corre en los procesos del ServicioRender o de generar_lote se cuenta en esos procesos y no aparece aquí.
+import atexit
+import functools
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+VARIABLE = "RESTAURANTE_PERFIL"
+_destino = os.environ.get(VARIABLE, "")
+ACTIVO = _destino not in ("", "0")
+
+_contadores = {}  # nombre -> [llamadas, segundos acumulados, máximo de una llamada]
+_candado = threading.Lock()
+
+
+def medido(funcion=None, nombre=None):
+    """Decorador: @medido o @medido(nombre="...") cuenta llamadas y tiempo de la función si el perfilado está activo."""
+    if funcion is None:
+        return lambda f: medido(f, nombre)
+    if not ACTIVO:
+        return funcion
+    contador = _contadores.setdefault(nombre or f"{funcion.__module__}.{funcion.__qualname__}", [0, 0.0, 0.0])
+    reloj = time.perf_counter
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        inicio = reloj()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            duracion = reloj() - inicio
+            with _candado:
+                contador[0] += 1
+                contador[1] += duracion
+                if duracion > contador[2]:
+                    contador[2] = duracion
+    return envoltura
+
+
+def contadores():
+    """{nombre: {llamadas, total_s, promedio_us, max_us}} de las funciones que se llamaron al menos una vez."""
+    with _candado:
+        copia = {nombre: list(valores) for nombre, valores in _contadores.items() if valores[0]}
+    return {nombre: {"llamadas": llamadas, "total_s": round(total, 6),
+                     "promedio_us": round(total / llamadas * 1e6, 3), "max_us": round(maximo * 1e6, 3)}
+            for nombre, (llamadas, total, maximo) in sorted(copia.items(), key=lambda par: -par[1][1])}
+
+
+def reiniciar():
+    with _candado:
+        for valores in _contadores.values():
+            valores[:] = [0, 0.0, 0.0]
+
+
+def volcar(ruta):
+    """Escribe contadores() como JSON en ruta."""
+    temporal = ruta + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(contadores(), f, ensure_ascii=False, indent=2)
+    os.replace(temporal, ruta)
+
+
+def _volcar_al_salir():
+    # Los procesos hijos heredan la variable; solo el proceso principal escribe el archivo
+    if multiprocessing.parent_process() is None and _contadores:
+        volcar(_destino)
+
+
+if ACTIVO and _destino != "1":
+    atexit.register(_volcar_al_salir)
@@ -0,0 +1,152 @@
+# Persistencia.py
+import json
+import os
+import threading
+from datetime import datetime
+
+from Ingrediente import Ingrediente
+
+ENTRADAS_POR_SNAPSHOT = 10000
+
+
+class DiarioStock:
+    """
+    Guarda el Stock en disco como un snapshot más un diario de cambios (una línea JSON por operación).
+    Cada cambio del stock es un append barato; al iniciar se carga el snapshot y se reaplica el diario.
+    """
+    def __init__(self, directorio, entradas_por_snapshot=ENTRADAS_POR_SNAPSHOT, sincronizar=False):
+        os.makedirs(directorio, exist_ok=True)
+        self.ruta_snapshot = os.path.join(directorio, "stock_snapshot.json")
+        self.ruta_diario = os.path.join(directorio, "stock_diario.jsonl")
+        self.entradas_por_snapshot = entradas_por_snapshot
+        self.sincronizar = sincronizar  # True hace fsync en cada cambio (más lento, resiste cortes de luz)
+        self.entradas = 0
+        self.stock = None
+        self._archivo = None
+        self._candado = threading.Lock()
+
+    def adjuntar(self, stock):
+        """Recupera el estado guardado dentro de stock y empieza a registrar sus cambios."""
+        self.stock = stock
+        self.entradas, posicion_valida = self.recuperar(stock)
+        # Lo que quedó después de la última línea completa (una escritura cortada por una caída) se
+        # corta del archivo; si no, lo que se anote desde ahora quedaría detrás de la basura y se perdería
+        if os.path.exists(self.ruta_diario) and os.path.getsize(self.ruta_diario) > posicion_valida:
+            with open(self.ruta_diario, "r+b") as f:
+                f.truncate(posicion_valida)
+        self._archivo = open(self.ruta_diario, "a", encoding="utf-8")
+        stock.agregar_registrador(self)
+        return self.entradas
+
+    def recuperar(self, stock):
+        """
+        Carga snapshot y diario en stock sin emitir eventos. Devuelve (entradas aplicadas, posición en bytes
+        donde termina la última línea válida del diario).
+        """
+        ingredientes = stock.ingredientes
+        if os.path.exists(self.ruta_snapshot):
+            with open(self.ruta_snapshot, "r", encoding="utf-8") as f:
+                for nombre, unidad, cantidad in json.load(f):
+                    ingredientes[nombre.lower()] = Ingrediente(nombre, unidad, cantidad)
+        aplicadas = posicion = 0
+        if os.path.exists(self.ruta_diario):
+            with open(self.ruta_diario, "rb") as f:
+                for linea in f:
+                    if not linea.endswith(b"\n"):
+                        break  # última línea a medio escribir por una caída: se descarta
+                    try:
+                        operacion, datos = json.loads(linea)
+                    except ValueError:
+                        break
+                    _aplicar(ingredientes, operacion, datos)
+                    aplicadas += 1
+                    posicion += len(linea)
+        return aplicadas, posicion
+
+    def registrar(self, operacion, datos):
+        linea = json.dumps([operacion, datos], ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._candado:
+            self._archivo.write(linea)
+            self._archivo.flush()
+            if self.sincronizar:
+                os.fsync(self._archivo.fileno())
+            self.entradas += 1
+
+    def necesita_snapshot(self):
+        return self.entradas >= self.entradas_por_snapshot
+
+    def snapshot(self):
+        """
+        Escribe el stock completo y vacía el diario. Debe llamarse cuando nadie está modificando
+        el stock (en la interfaz, entre clics; con ServicioStock, usar ServicioStock.snapshot).
+        """
+        with self._candado:
+            filas = [[ing.nombre, ing.unidad, ing.cantidad] for ing in self.stock.ingredientes.values()]
+            temporal = self.ruta_snapshot + ".tmp"
+            with open(temporal, "w", encoding="utf-8") as f:
+                json.dump(filas, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporal, self.ruta_snapshot)
+            self._archivo.close()
+            self._archivo = open(self.ruta_diario, "w", encoding="utf-8")
+            self.entradas = 0
+
+    def snapshot_si_corresponde(self):
+        if self.necesita_snapshot():
+            self.snapshot()
+
+    def cerrar(self):
+        if self._archivo:
+            self._archivo.close()
+            self._archivo = None
+
+
+def _aplicar(ingredientes, operacion, datos):
+    if operacion == "agregar":
+        for nombre, unidad, cantidad in datos:
+            clave = nombre.lower()
+            if clave in ingredientes:
+                ingredientes[clave].cantidad += cantidad
+            else:
+                ingredientes[clave] = Ingrediente(nombre, unidad, cantidad)
+    elif operacion == "eliminar":
+        ingredientes.pop(datos, None)
+    elif operacion == "descontar":
+        for clave, cantidad in datos.items():
+            ingredientes[clave].cantidad -= cantidad
+    elif operacion == "reponer":
+        for clave, cantidad in datos.items():
+            ingredientes[clave].cantidad += cantidad
+    else:
+        raise ValueError(f"Operación desconocida en el diario de stock: {operacion}")
+
+
+class RegistroPedidos:
+    """Archivo append-only con los pedidos ya cobrados (una línea JSON por boleta)."""
+    def __init__(self, directorio):
+        os.makedirs(directorio, exist_ok=True)
+        self.ruta = os.path.join(directorio, "pedidos.jsonl")
+        self._candado = threading.Lock()
+
+    def registrar(self, pedido, fecha=None):
+        registro = {
+            "fecha": (fecha or datetime.now()).isoformat(timespec="seconds"),
+            # [nombre, cantidad, precio_unitario]
+            "lineas": [[nombre, detalles['cantidad'], detalles['precio_unit']] for nombre, detalles in pedido.agrupar()],
+            "total": pedido.calcular_total(),
+        }
+        linea = json.dumps(registro, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._candado, open(self.ruta, "a", encoding="utf-8") as f:
+            f.write(linea)
+
+    def leer(self):
+        """Recorre los pedidos registrados en orden, sin cargar el archivo completo."""
+        if not os.path.exists(self.ruta):
+            return
+        with open(self.ruta, "r", encoding="utf-8") as f:
+            for linea in f:
+                try:
+                    yield json.loads(linea)
+                except ValueError:
+                    continue
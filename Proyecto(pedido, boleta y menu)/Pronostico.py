@@ -0,0 +1,202 @@
+# Pronostico.py
+import csv
+import json
+import math
+import os
+import threading
+import time
+
+VIDA_MEDIA = 2 * 3600        # segundos: el consumo de hace 2 horas pesa la mitad que el de ahora
+HORAS_ALERTA = 2.0           # alerta si el ingrediente se acaba antes de estas horas
+HORAS_COBERTURA = 24.0       # la reposición alcanza para estas horas de consumo
+ARCHIVO_ESTADO = "pronostico.json"  # dentro del directorio de datos, junto al diario del stock
+VENTANA_MINIMA = 15 * 60     # con menos historial, la tasa se calcula como si hubieran pasado 15 minutos
+
+
+class Alerta:
+    __slots__ = ('nombre', 'unidad', 'cantidad', 'tasa_por_hora', 'horas_restantes', 'motivo')
+
+    def __init__(self, nombre, unidad, cantidad, tasa_por_hora, horas_restantes, motivo):
+        self.nombre = nombre
+        self.unidad = unidad
+        self.cantidad = cantidad
+        self.tasa_por_hora = tasa_por_hora
+        self.horas_restantes = horas_restantes
+        self.motivo = motivo
+
+    def __str__(self):
+        if self.horas_restantes == math.inf:
+            return f"{self.nombre}: quedan {self.cantidad} {self.unidad} ({self.motivo})"
+        return f"{self.nombre}: quedan {self.cantidad} {self.unidad}, alcanza para {self.horas_restantes:.1f} h ({self.motivo})"
+
+
+class PronosticoConsumo:
+    """
+    Registrador del Stock que estima cuánto se gasta de cada ingrediente por hora.
+    Cada descuento suma a un acumulado que decae exponencialmente con el tiempo (media móvil
+    exponencial con tiempos irregulares), así actualizar la tasa cuesta O(1) y no se guarda historial.
+    Una reposición (pedido cancelado) resta lo que se había descontado.
+    """
+    def __init__(self, stock, vida_media=VIDA_MEDIA, horas_alerta=HORAS_ALERTA, reloj=time.time):
+        self.stock = stock
+        self.tau = vida_media / math.log(2)
+        self.horas_alerta = horas_alerta
+        self.reloj = reloj
+        self._acumulado = {}   # ingrediente -> [consumo acumulado con decaimiento, instante del último cambio, primer descuento]
+        self._minimos = {}     # ingrediente -> cantidad mínima configurada (unidad base)
+        self._horas_alerta = {}  # ingrediente -> horas de alerta propias
+        self._en_alerta = set()
+        self._suscriptores = []
+        # Protege _acumulado y _en_alerta; reentrante porque _revisar consulta tasa_por_hora con el candado tomado
+        self._candado = threading.RLock()
+        stock.agregar_registrador(self)
+
+    def suscribir(self, callback):
+        """Registra callback(alertas), que recibe una lista de Alerta de los ingredientes que recién quedaron bajos."""
+        self._suscriptores.append(callback)
+
+    def configurar_alerta(self, nombre, minimo=None, horas=None):
+        """Fija para un ingrediente una cantidad mínima y/o sus propias horas de anticipación."""
+        clave = nombre.lower()
+        if minimo is not None:
+            self._minimos[clave] = minimo
+        if horas is not None:
+            self._horas_alerta[clave] = horas
+
+    # --- Registrador del Stock ---
+
+    def registrar(self, operacion, datos):
+        if operacion == "descontar":
+            ahora = self.reloj()
+            with self._candado:
+                for clave, cantidad in datos.items():
+                    self._sumar(clave, cantidad, ahora)
+            self._revisar(datos)
+        elif operacion == "reponer":
+            ahora = self.reloj()
+            with self._candado:
+                for clave, cantidad in datos.items():
+                    self._sumar(clave, -cantidad, ahora)
+            self._revisar(datos)
+        elif operacion == "agregar":
+            self._revisar([nombre.lower() for nombre, _, _ in datos])
+        elif operacion == "eliminar":
+            with self._candado:
+                self._en_alerta.discard(datos)
+
+    def _sumar(self, clave, cantidad, ahora):
+        estado = self._acumulado.get(clave)
+        if estado is None:
+            if cantidad <= 0:
+                return
+            self._acumulado[clave] = [float(cantidad), ahora, ahora]
+            return
+        estado[0] = max(0.0, estado[0] * math.exp(-(ahora - estado[1]) / self.tau) + cantidad)
+        estado[1] = ahora
+
+    # --- Consultas ---
+
+    def tasa_por_hora(self, nombre, ahora=None):
+        """Consumo estimado del ingrediente por hora, en su unidad base."""
+        with self._candado:
+            estado = self._acumulado.get(nombre.lower())
+            if estado is None:
+                return 0.0
+            valor, ultimo_cambio, primer_descuento = estado
+        ahora = self.reloj() if ahora is None else ahora
+        acumulado = valor * math.exp(-(ahora - ultimo_cambio) / self.tau)
+        # Al principio hay poco historial: se corrige el sesgo dividiendo por el peso ya observado
+        peso = 1.0 - math.exp(-max(ahora - primer_descuento, VENTANA_MINIMA) / self.tau)
+        return acumulado / (self.tau * peso) * 3600
+
+    def horas_restantes(self, nombre, ahora=None):
+        """Horas hasta agotar el ingrediente al ritmo actual (math.inf si no se está consumiendo)."""
+        ingrediente = self.stock.ingredientes.get(nombre.lower())
+        if ingrediente is None or ingrediente.cantidad <= 0:
+            return 0.0
+        tasa = self.tasa_por_hora(nombre, ahora)
+        return ingrediente.cantidad / tasa if tasa > 0 else math.inf
+
+    def _alerta_de(self, clave, ahora):
+        ingrediente = self.stock.ingredientes.get(clave)
+        if ingrediente is None:
+            return None
+        tasa = self.tasa_por_hora(clave, ahora)
+        horas = ingrediente.cantidad / tasa if tasa > 0 else math.inf
+        if ingrediente.cantidad <= 0:
+            motivo = "agotado"
+        elif ingrediente.cantidad < self._minimos.get(clave, 0):
+            motivo = "bajo el mínimo"
+        elif horas < self._horas_alerta.get(clave, self.horas_alerta):
+            motivo = "se acaba pronto"
+        else:
+            return None
+        return Alerta(ingrediente.nombre, ingrediente.unidad, ingrediente.cantidad, tasa, max(horas, 0.0), motivo)
+
+    def _revisar(self, claves):
+        ahora = self.reloj()
+        nuevas = []
+        with self._candado:
+            for clave in claves:
+                alerta = self._alerta_de(clave, ahora)
+                if alerta is None:
+                    self._en_alerta.discard(clave)
+                elif clave not in self._en_alerta:
+                    self._en_alerta.add(clave)
+                    nuevas.append(alerta)
+        # Los suscriptores se llaman ya sin el candado: un callback lento no frena a los hilos que registran consumo
+        if nuevas:
+            for callback in self._suscriptores:
+                callback(nuevas)
+
+    def alertas(self):
+        """Todas las alertas vigentes, de la más urgente a la menos."""
+        ahora = self.reloj()
+        vigentes = [alerta for alerta in (self._alerta_de(clave, ahora) for clave in self.stock.ingredientes) if alerta]
+        return sorted(vigentes, key=lambda alerta: alerta.horas_restantes)
+
+    def lista_reposicion(self, horas_cobertura=HORAS_COBERTURA):
+        """
+        (nombre, unidad, cantidad a pedir) para que cada ingrediente alcance horas_cobertura más su
+        mínimo configurado. Las cantidades son enteros en unidad base, como las guarda el Stock.
+        """
+        ahora = self.reloj()
+        lista = []
+        for clave, ingrediente in self.stock.ingredientes.items():
+            objetivo = self.tasa_por_hora(clave, ahora) * horas_cobertura + self._minimos.get(clave, 0)
+            faltante = math.ceil(objetivo - ingrediente.cantidad)
+            if faltante > 0:
+                lista.append((ingrediente.nombre, ingrediente.unidad, faltante))
+        return lista
+
+    def exportar_reposicion(self, filepath, horas_cobertura=HORAS_COBERTURA):
+        """Escribe la lista de reposición en el mismo formato que lee cargar_csv_en_stock; devuelve cuántas filas escribió."""
+        lista = self.lista_reposicion(horas_cobertura)
+        with open(filepath, mode='w', encoding='utf-8-sig', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(["nombre", "unidad", "cantidad"])
+            writer.writerows(lista)
+        return len(lista)
+
+    # --- Persistencia de las tasas entre sesiones ---
+
+    def guardar(self, ruta):
+        with self._candado:
+            estado = {"acumulado": self._acumulado, "minimos": self._minimos, "horas_alerta": self._horas_alerta}
+            temporal = ruta + ".tmp"
+            with open(temporal, "w", encoding="utf-8") as f:
+                json.dump(estado, f, ensure_ascii=False)
+            os.replace(temporal, ruta)
+
+    def cargar(self, ruta):
+        if not os.path.exists(ruta):
+            return
+        try:
+            with open(ruta, "r", encoding="utf-8") as f:
+                estado = json.load(f)
+        except ValueError:
+            return
+        with self._candado:
+            self._acumulado.update(estado.get("acumulado", {}))
+            self._minimos.update(estado.get("minimos", {}))
+            self._horas_alerta.update(estado.get("horas_alerta", {}))
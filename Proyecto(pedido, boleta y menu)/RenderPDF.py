@@ -0,0 +1,141 @@
+# RenderPDF.py
+import itertools
+import queue
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor
+
+from Perfilado import medido
+
+# --- Trabajos (se ejecutan en los procesos del pool, por eso importan fpdf/fitz adentro) ---
+
+def _abrir_pdf(origen):
+    import fitz  # PyMuPDF
+    if isinstance(origen, bytes):
+        return fitz.open(stream=origen, filetype="pdf")
+    return fitz.open(origen)
+
+
+@medido
+def rasterizar_pagina(origen, numero_pagina=0, dpi=72):
+    """Rasteriza una página del PDF (ruta o bytes) y devuelve (ancho, alto, bytes RGB) listos para Image.frombytes."""
+    doc = _abrir_pdf(origen)
+    try:
+        pix = doc.load_page(numero_pagina).get_pixmap(dpi=dpi)
+        return pix.width, pix.height, pix.samples
+    finally:
+        doc.close()
+
+
+def renderizar_menu(items_carta, filename="carta_restaurante.pdf", dpi=72, clave=None):
+    from Menupdf import MenuPDF
+    filepath = MenuPDF(items_carta).generar(filename)
+    if not filepath:
+        raise RuntimeError("El archivo PDF no se pudo crear. Revisa la consola para más detalles.")
+    with open(filepath, "rb") as f:
+        pdf = f.read()
+    doc = _abrir_pdf(pdf)
+    num_paginas = doc.page_count
+    doc.close()
+    # Solo se rasteriza la primera página; las demás se piden al desplazarse por la carta
+    return {"filepath": filepath, "clave": clave, "pdf": pdf, "num_paginas": num_paginas, "pagina": rasterizar_pagina(pdf, 0, dpi)}
+
+
+def renderizar_pagina_carta(clave, pdf, numero_pagina, dpi=72):
+    return {"clave": clave, "numero": numero_pagina, "pagina": rasterizar_pagina(pdf, numero_pagina, dpi)}
+
+
+def renderizar_boleta(pedido, filename="boleta_pedido.pdf", formato="pdf"):
+    from Boleta import BoletaPDF, renderizador
+    if formato == "pdf":
+        return {"filepath": BoletaPDF(pedido).generar(filename)}
+    return {"filepath": renderizador(formato).generar(pedido, filename)}
+
+
+class ServicioRender:
+    """
+    Genera los PDF del menú y de las boletas fuera del hilo de Tk.
+    Los resultados quedan en una cola que la interfaz vacía con atender() desde un after().
+    """
+    def __init__(self, max_trabajos=None, usar_procesos=True):
+        executor = ProcessPoolExecutor if usar_procesos else ThreadPoolExecutor
+        self._executor = executor(max_workers=max_trabajos)
+        self._resultados = queue.Queue()
+        self._ids = itertools.count(1)
+        self._pendientes = {}
+        self._cancelados = set()
+        self._candado = threading.Lock()
+        self.enviados = 0
+        self.terminados = 0
+
+    def _enviar(self, tipo, funcion, *args):
+        id_trabajo = next(self._ids)
+        with self._candado:
+            future = self._executor.submit(funcion, *args)
+            self._pendientes[id_trabajo] = future
+            self.enviados += 1
+        future.add_done_callback(lambda f: self._al_terminar(id_trabajo, tipo, f))
+        return id_trabajo
+
+    def _al_terminar(self, id_trabajo, tipo, future):
+        # Corre en un hilo del executor: solo deja el resultado en la cola.
+        try:
+            resultado, error = future.result(), None
+        except Exception as e:  # incluye CancelledError
+            resultado, error = None, e
+        with self._candado:
+            self._pendientes.pop(id_trabajo, None)
+            self.terminados += 1
+        self._resultados.put((id_trabajo, tipo, resultado, error))
+
+    def enviar_menu(self, items_carta, filename="carta_restaurante.pdf", dpi=72, clave=None):
+        return self._enviar("menu", renderizar_menu, items_carta, filename, dpi, clave)
+
+    def enviar_pagina_carta(self, clave, pdf, numero_pagina, dpi=72):
+        return self._enviar("pagina", renderizar_pagina_carta, clave, pdf, numero_pagina, dpi)
+
+    def enviar_boleta(self, pedido, filename="boleta_pedido.pdf", formato="pdf"):
+        """pedido debe ser una copia (Pedido.copia()) porque viaja a otro proceso."""
+        return self._enviar("boleta", renderizar_boleta, pedido, filename, formato)
+
+    def cancelar(self, id_trabajo=None):
+        """
+        Cancela un trabajo (o todos). Los que ya empezaron terminan igual, pero
+        atender() los entrega con error CancelledError en vez de su resultado.
+        """
+        with self._candado:
+            ids = [id_trabajo] if id_trabajo is not None else list(self._pendientes)
+            futures = [self._pendientes[i] for i in ids if i in self._pendientes]
+            self._cancelados.update(i for i in ids if i in self._pendientes)
+        # future.cancel() ejecuta _al_terminar en este mismo hilo, por eso va fuera del candado
+        for future in futures:
+            future.cancel()
+
+    def progreso(self):
+        """Devuelve (terminados, enviados) desde la última vez que la cola quedó vacía."""
+        with self._candado:
+            return self.terminados, self.enviados
+
+    def ocupado(self):
+        with self._candado:
+            return bool(self._pendientes)
+
+    def atender(self, callback):
+        """Entrega a callback(id_trabajo, tipo, resultado, error) los resultados listos, sin bloquear."""
+        atendidos = 0
+        while True:
+            try:
+                id_trabajo, tipo, resultado, error = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+            atendidos += 1
+            if id_trabajo in self._cancelados:
+                self._cancelados.discard(id_trabajo)
+                resultado, error = None, CancelledError()
+            callback(id_trabajo, tipo, resultado, error)
+        with self._candado:
+            if not self._pendientes and self._resultados.empty():
+                self.enviados = self.terminados = 0
+        return atendidos
+
+    def cerrar(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
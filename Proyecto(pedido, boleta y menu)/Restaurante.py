@@ -1,24 +1,50 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import customtkinter as ctk
-import csv
 import os
 import subprocess
-from PIL import Image
-import fitz  # PyMuPDF
+from datetime import datetime
 
 # --- Import de las clases y funciones de los otros archivos ---
 from Ingrediente import Ingrediente
 from Stock import Stock
 from Menu import Menu
 from Pedido import Pedido
-from Menupdf import MenuPDF
-from Boleta import BoletaPDF
+from CargaCSV import cargar_csv_en_stock
+from TablaVirtual import TablaVirtual
+from FuentesTabla import FuenteStock, FuentePedido, FuenteCSV
+from Disponibilidad import MotorDisponibilidad, SIN_LIMITE
+from RenderPDF import ServicioRender
+from concurrent.futures import CancelledError
+from CacheCarta import CacheCarta, clave_carta
+from Persistencia import DiarioStock, RegistroPedidos
+from Pronostico import PronosticoConsumo, ARCHIVO_ESTADO
+from Boleta import RenderizadorTermico
 
 # --- Configuración de la Apariencia ---
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
+INTERVALO_RENDER_MS = 100
+MAX_INTENTOS_PAGINA = 3  # una página que falla se vuelve a pedir hasta este número de veces
+INTERVALO_CATALOGO_MS = 1000  # cada cuánto se revisa si cambió menu.json
+DPI_CARTA = 72
+DIRECTORIO_CACHE_CARTA = ".cache_carta"
+DIRECTORIO_DATOS = "datos"
+# Impresora térmica (por ejemplo /dev/usb/lp0); sin ella el ticket se guarda en un .txt y se abre
+IMPRESORA_TERMICA = os.environ.get("RESTAURANTE_IMPRESORA")
+FORMATOS_BOLETA = ("PDF (A4)", "Ticket 80 mm")
+
+def formatear_precio(valor):
+    return f"${valor:,}".replace(",", ".")
+
+def valores_fila_stock(ing):
+    # La cantidad ya es un entero en unidad base (g, cc o unid)
+    return (ing.nombre, ing.unidad, ing.cantidad)
+
+def valores_fila_pedido(item):
+    return (item['id'], item['nombre'], formatear_precio(item['precio']))
+
 class RestauranteApp(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -26,9 +52,33 @@ class RestauranteApp(ctk.CTk):
         self.geometry("900x700")
 
         self.stock = Stock()
+        # El stock se recupera del disco y cada cambio queda anotado en el diario
+        self.diario_stock = DiarioStock(DIRECTORIO_DATOS)
+        self.diario_stock.adjuntar(self.stock)
+        self.registro_pedidos = RegistroPedidos(DIRECTORIO_DATOS)
+        # Las tasas de consumo se estiman con cada descuento y se conservan entre sesiones
+        self.pronostico = PronosticoConsumo(self.stock)
+        self.pronostico.cargar(os.path.join(DIRECTORIO_DATOS, ARCHIVO_ESTADO))
+        self.alertas_stock_var = tk.StringVar(value="")
+        self.avisos_menu_var = tk.StringVar(value="")
         self.menu = Menu()
         self.pedido_actual = Pedido()
+        self.disponibilidad = MotorDisponibilidad(self.menu, self.stock)
+        self.botones_menu = {}
         self.total_pedido_var = tk.StringVar(value="Total: $0")
+        self.formato_boleta_var = tk.StringVar(value=FORMATOS_BOLETA[0])
+        self.fuente_csv = None
+        self.render = ServicioRender()
+        self._boletas_en_proceso = {}
+        self.cache_carta = CacheCarta(directorio=DIRECTORIO_CACHE_CARTA)
+        self.carta_actual = None
+        self.etiquetas_paginas = []
+        self._paginas_mostradas = set()
+        self._paginas_pedidas = set()
+        self._trabajos_pagina = {}  # id de trabajo -> (clave de la carta, número de página)
+        self._fallos_pagina = {}    # número de página -> intentos fallidos
+        self.analisis_ventas = None  # se crea al abrir la pestaña Ventas (necesita numpy)
+        self.protocol("WM_DELETE_WINDOW", self.al_cerrar)
         
         # --- Estilo del Treeview para el tema oscuro ---
         style = ttk.Style()
@@ -45,26 +95,34 @@ class RestauranteApp(ctk.CTk):
         self.tab_view.add("Stock")
         self.tab_view.add("Carta Restaurante")
         self.tab_view.add("Pedido")
+        self.tab_view.add("Ventas")
 
         self.setup_tab1()
         self.setup_tab2()
         self.setup_tab3()
         self.setup_tab4()
+        self.setup_tab5()
+        self.setup_barra_render()
+
+        self.pedido_actual.suscribir(self.al_cambiar_pedido)
+        self.disponibilidad.suscribir(self.actualizar_botones_menu)
+        self.menu.suscribir(self.al_cambiar_menu)
+        self.pronostico.suscribir(self.mostrar_alertas_stock)
+        self.mostrar_alertas_stock(self.pronostico.alertas())
+        self.avisar_problemas_del_menu(mostrar_unidades=False)
+        self.after(INTERVALO_RENDER_MS, self.atender_render)
+        self.after(INTERVALO_CATALOGO_MS, self.revisar_catalogo)
 
     def setup_tab1(self):
         tab = self.tab_view.tab("Carga Ingredientes")
         btn_cargar_csv = ctk.CTkButton(tab, text="Cargar Archivo CSV", command=self.cargar_csv, height=40)
         btn_cargar_csv.pack(pady=15, padx=20)
+        self.crear_filtro(tab, lambda prefijo: self.tabla_carga.filtrar(prefijo)).pack(fill="x", padx=20)
         tree_frame = ctk.CTkFrame(tab, fg_color="transparent")
         tree_frame.pack(fill="both", expand=True, padx=20, pady=10)
-        self.tree_ingredientes_carga = ttk.Treeview(tree_frame, columns=("nombre", "unidad", "cantidad"), show="headings")
-        self.tree_ingredientes_carga.heading("nombre", text="Nombre")
-        self.tree_ingredientes_carga.heading("unidad", text="Unidad")
-        self.tree_ingredientes_carga.heading("cantidad", text="Cantidad")
-        self.tree_ingredientes_carga.pack(side="left", fill="both", expand=True)
-        scrollbar = ctk.CTkScrollbar(tree_frame, command=self.tree_ingredientes_carga.yview)
-        scrollbar.pack(side="right", fill="y")
-        self.tree_ingredientes_carga.configure(yscrollcommand=scrollbar.set)
+        # --- Vista previa virtual: solo se leen del archivo las filas que están en pantalla ---
+        self.tabla_carga = TablaVirtual(tree_frame, scrollbar=ctk.CTkScrollbar(tree_frame))
+        self.tabla_carga.pack()
         btn_agregar_stock = ctk.CTkButton(tab, text="Agregar al Stock", command=self.agregar_a_stock, height=40)
         btn_agregar_stock.pack(pady=15, padx=20)
 
@@ -73,9 +131,12 @@ class RestauranteApp(ctk.CTk):
         tab.grid_columnconfigure(0, weight=3); tab.grid_columnconfigure(1, weight=1); tab.grid_rowconfigure(0, weight=1)
         stock_frame = ctk.CTkFrame(tab)
         stock_frame.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
-        self.tree_stock = ttk.Treeview(stock_frame, columns=("nombre", "unidad", "cantidad"), show="headings")
-        self.tree_stock.heading("nombre", text="Nombre"); self.tree_stock.heading("unidad", text="Unidad"); self.tree_stock.heading("cantidad", text="Cantidad")
-        self.tree_stock.pack(fill="both", expand=True, padx=10, pady=10)
+        self.crear_filtro(stock_frame, lambda prefijo: self.tabla_stock.filtrar(prefijo)).pack(fill="x", padx=10, pady=(10, 0))
+        tree_stock_frame = ctk.CTkFrame(stock_frame, fg_color="transparent")
+        tree_stock_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        # --- Las tablas solo dibujan las filas visibles y se actualizan con los eventos del Stock/Pedido ---
+        self.tabla_stock = TablaVirtual(tree_stock_frame, FuenteStock(self.stock, valores_fila_stock), scrollbar=ctk.CTkScrollbar(tree_stock_frame))
+        self.tabla_stock.pack()
         controls_frame = ctk.CTkFrame(tab)
         controls_frame.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
         add_ingredient_frame = ctk.CTkFrame(controls_frame)
@@ -93,6 +154,7 @@ class RestauranteApp(ctk.CTk):
         
         # --- BOTÓN MODIFICADO ---
         ctk.CTkButton(controls_frame, text="Generar Menú y Ver Carta", command=self.generar_menu_y_ver_carta).pack(fill="x", pady=5, padx=10)
+        ctk.CTkButton(controls_frame, text="Exportar Reposición", command=self.exportar_reposicion).pack(fill="x", pady=5, padx=10)
 
     def setup_tab3(self):
         # --- PESTAÑA SIMPLIFICADA A SOLO VISOR ---
@@ -109,10 +171,11 @@ class RestauranteApp(ctk.CTk):
         menu_frame = ctk.CTkFrame(tab)
         menu_frame.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
         ctk.CTkLabel(menu_frame, text="Menú Disponible", font=ctk.CTkFont(size=16, weight="bold")).pack(pady=10)
-        scrollable_menu = ctk.CTkScrollableFrame(menu_frame, label_text="")
-        scrollable_menu.pack(fill="both", expand=True, padx=10, pady=5)
+        self.frame_botones_menu = ctk.CTkScrollableFrame(menu_frame, label_text="")
+        self.frame_botones_menu.pack(fill="both", expand=True, padx=10, pady=5)
         for item_nombre in self.menu.get_items().keys():
-            ctk.CTkButton(scrollable_menu, text=item_nombre, command=lambda n=item_nombre: self.agregar_a_pedido(n)).pack(fill="x", padx=10, pady=4)
+            self.crear_boton_menu(item_nombre)
+        self.actualizar_botones_menu(self.disponibilidad.todas())
         pedido_frame = ctk.CTkFrame(tab)
         pedido_frame.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
         ctk.CTkLabel(pedido_frame, text="Mi Pedido", font=ctk.CTkFont(size=16, weight="bold")).pack(pady=10)
@@ -124,141 +187,363 @@ class RestauranteApp(ctk.CTk):
         ctk.CTkButton(pedido_controls_frame, text="Reiniciar Pedido", command=self.reiniciar_pedido).grid(row=0, column=1, padx=5, sticky="ew")
         tree_pedido_frame = ctk.CTkFrame(pedido_frame, fg_color="transparent")
         tree_pedido_frame.pack(fill="both", expand=True, padx=10, pady=10)
-        self.tree_pedido = ttk.Treeview(tree_pedido_frame, columns=("id", "item", "precio"), show="headings")
-        self.tree_pedido.heading("id", text="ID"); self.tree_pedido.heading("item", text="Ítem"); self.tree_pedido.heading("precio", text="Precio")
-        self.tree_pedido.column("id", width=40, anchor=tk.CENTER)
-        self.tree_pedido.pack(fill="both", expand=True)
+        self.tabla_pedido = TablaVirtual(tree_pedido_frame, FuentePedido(self.pedido_actual, valores_fila_pedido),
+                                         scrollbar=ctk.CTkScrollbar(tree_pedido_frame), anchos={"id": 60})
+        self.tabla_pedido.pack()
+        ctk.CTkSegmentedButton(pedido_frame, values=list(FORMATOS_BOLETA), variable=self.formato_boleta_var).pack(fill="x", pady=(10, 0), padx=10)
         ctk.CTkButton(pedido_frame, text="Generar Boleta", command=self.generar_boleta_final, height=40).pack(fill="x", pady=10, padx=10)
 
+    def setup_tab5(self):
+        tab = self.tab_view.tab("Ventas")
+        tab.grid_columnconfigure((0, 1), weight=1); tab.grid_rowconfigure((2, 3), weight=1)
+        filtros_frame = ctk.CTkFrame(tab, fg_color="transparent")
+        filtros_frame.grid(row=0, column=0, columnspan=2, padx=10, pady=(10, 0), sticky="ew")
+        ctk.CTkLabel(filtros_frame, text="Desde:").pack(side="left", padx=5)
+        self.entry_ventas_desde = ctk.CTkEntry(filtros_frame, placeholder_text="AAAA-MM-DD", width=130)
+        self.entry_ventas_desde.pack(side="left", padx=5)
+        ctk.CTkLabel(filtros_frame, text="Hasta:").pack(side="left", padx=5)
+        self.entry_ventas_hasta = ctk.CTkEntry(filtros_frame, placeholder_text="AAAA-MM-DD", width=130)
+        self.entry_ventas_hasta.pack(side="left", padx=5)
+        ctk.CTkButton(filtros_frame, text="Actualizar", width=100, command=self.refrescar_ventas).pack(side="left", padx=10)
+        self.resumen_ventas_var = tk.StringVar(value="Presione 'Actualizar' para leer las ventas registradas.")
+        ctk.CTkLabel(tab, textvariable=self.resumen_ventas_var, justify="left").grid(row=1, column=0, columnspan=2, padx=10, pady=5, sticky="w")
+        self.tree_ventas_platos = ttk.Treeview(tab, columns=("plato", "unidades", "total"), show="headings")
+        self.tree_ventas_platos.heading("plato", text="Plato"); self.tree_ventas_platos.heading("unidades", text="Unidades"); self.tree_ventas_platos.heading("total", text="Total")
+        self.tree_ventas_platos.grid(row=2, column=0, padx=10, pady=5, sticky="nsew")
+        self.tree_ventas_consumo = ttk.Treeview(tab, columns=("ingrediente", "unidad", "consumo"), show="headings")
+        self.tree_ventas_consumo.heading("ingrediente", text="Ingrediente"); self.tree_ventas_consumo.heading("unidad", text="Unidad"); self.tree_ventas_consumo.heading("consumo", text="Consumo")
+        self.tree_ventas_consumo.grid(row=2, column=1, padx=10, pady=5, sticky="nsew")
+        # Una fila por hora con ventas y una columna por plato; las columnas se arman al actualizar
+        self.tree_ventas_horas = ttk.Treeview(tab, columns=("hora",), show="headings")
+        self.tree_ventas_horas.grid(row=3, column=0, columnspan=2, padx=10, pady=(5, 10), sticky="nsew")
+
+    def setup_barra_render(self):
+        # --- Progreso de los PDF que se generan en segundo plano ---
+        self.barra_render = ctk.CTkFrame(self, fg_color="transparent")
+        self.barra_render.pack(fill="x", padx=10, pady=(0, 10))
+        self.estado_render_var = tk.StringVar(value="")
+        ctk.CTkLabel(self.barra_render, textvariable=self.estado_render_var).pack(side="left", padx=10)
+        self.progreso_render = ctk.CTkProgressBar(self.barra_render)
+        self.progreso_render.set(0)
+        self.progreso_render.pack(side="left", fill="x", expand=True, padx=10)
+        ctk.CTkButton(self.barra_render, text="Cancelar boleta", width=120, command=self.cancelar_boleta).pack(side="right", padx=10)
+        # --- Alertas de stock bajo, visibles desde cualquier pestaña ---
+        ctk.CTkLabel(self, textvariable=self.alertas_stock_var, text_color="#e0a030", anchor="w", justify="left").pack(fill="x", padx=20, pady=(0, 5))
+        ctk.CTkLabel(self, textvariable=self.avisos_menu_var, text_color="#e0a030", anchor="w", justify="left").pack(fill="x", padx=20, pady=(0, 5))
+
     # --- Lógica de la Aplicación ---
     
     def generar_menu_y_ver_carta(self):
-        # --- TODA LA LÓGICA DE GENERACIÓN ESTÁ AHORA AQUÍ ---
-        try:
-            messagebox.showinfo("Procesando", "Generando el PDF del menú...")
-            items_carta = [{"nombre": k, "precio": f"${v['precio']}"} for k, v in self.menu.get_items().items()]
-            
-            pdf_generator = MenuPDF(items_carta)
-            filepath = pdf_generator.generar("carta_restaurante.pdf")
+        # Si la carta no cambió se muestra desde la caché; si no, se genera en segundo plano
+        items_carta = [{"nombre": k, "precio": f"${v['precio']}"} for k, v in self.menu.get_items().items()]
+        clave = clave_carta(items_carta, DPI_CARTA)
+        entrada = self.cache_carta.obtener(clave)
+        if entrada is not None and self.cache_carta.pagina(entrada, 0) is not None:
+            self.mostrar_carta(entrada); return
+        self.render.enviar_menu(items_carta, "carta_restaurante.pdf", DPI_CARTA, clave)
+        self.actualizar_progreso_render()
 
-            if not filepath:
-                raise Exception("El archivo PDF no se pudo crear. Revisa la consola para más detalles.")
+    def atender_render(self):
+        """Revisa periódicamente la cola de resultados del ServicioRender (en el hilo de Tk)."""
+        self.render.atender(self.al_terminar_render)
+        self.actualizar_progreso_render()
+        if self.tab_view.get() == "Carta Restaurante": self.cargar_paginas_visibles()
+        self.after(INTERVALO_RENDER_MS, self.atender_render)
 
-            doc = fitz.open(filepath)
-            page = doc.load_page(0)
-            pix = page.get_pixmap()
-            doc.close()
-            
-            menu_image = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-            ctk_image = ctk.CTkImage(light_image=menu_image, dark_image=menu_image, size=(menu_image.width, menu_image.height))
-            
-            self.pdf_display_label.configure(image=ctk_image, text="")
-            self.pdf_display_label.image = ctk_image
+    def revisar_catalogo(self):
+        """Recarga la carta si alguien editó menu.json; los botones se actualizan en al_cambiar_menu."""
+        try: self.menu.recargar_si_cambio()
+        except ValueError as e: messagebox.showwarning("Carta", f"No se aplicaron los cambios de la carta; se sigue usando la anterior.\n\n{e}")
+        self.after(INTERVALO_CATALOGO_MS, self.revisar_catalogo)
+
+    def actualizar_progreso_render(self):
+        terminados, enviados = self.render.progreso()
+        if enviados:
+            self.estado_render_var.set(f"Generando PDF: {terminados}/{enviados}")
+            self.progreso_render.set(terminados / enviados)
+        else:
+            self.estado_render_var.set("")
+            self.progreso_render.set(0)
+
+    def al_terminar_render(self, id_trabajo, tipo, resultado, error):
+        if tipo == "menu": self.al_generar_carta(resultado, error)
+        elif tipo == "pagina": self.al_rasterizar_pagina(id_trabajo, resultado, error)
+        elif tipo == "boleta": self.abrir_boleta(id_trabajo, resultado, error)
+
+    def al_generar_carta(self, resultado, error):
+        if isinstance(error, CancelledError): return
+        if error:
+            messagebox.showerror("Error al Visualizar PDF", f"No se pudo mostrar el PDF en la aplicación.\n\nError: {error}"); return
+        entrada = self.cache_carta.guardar(resultado["clave"], resultado["pdf"], resultado["num_paginas"])
+        self.cache_carta.guardar_pagina(entrada, 0, resultado["pagina"])
+        self.mostrar_carta(entrada)
+
+    def al_rasterizar_pagina(self, id_trabajo, resultado, error):
+        clave, numero = self._trabajos_pagina.pop(id_trabajo, (None, None))
+        if error:
+            if self.carta_actual is None or clave != self.carta_actual.clave: return
+            # Se libera la página para que cargar_paginas_visibles la vuelva a pedir si sigue a la vista
+            self._paginas_pedidas.discard(numero)
+            if isinstance(error, CancelledError): return
+            self._fallos_pagina[numero] = self._fallos_pagina.get(numero, 0) + 1
+            if self._fallos_pagina[numero] >= MAX_INTENTOS_PAGINA:
+                self._paginas_mostradas.add(numero)
+                self.etiquetas_paginas[numero].configure(text=f"Página {numero + 1}: no se pudo mostrar ({error})")
+            return
+        entrada = self.cache_carta.obtener(resultado["clave"])
+        if entrada is not None: self.cache_carta.guardar_pagina(entrada, resultado["numero"], resultado["pagina"])
+
+    def mostrar_carta(self, entrada):
+        """Arma una etiqueta por página; solo las visibles se rasterizan (ver cargar_paginas_visibles)."""
+        try:
+            self.carta_actual = entrada
+            self._paginas_mostradas, self._paginas_pedidas, self._fallos_pagina = set(), set(), {}
+            self.pdf_display_label.pack_forget()
+            for etiqueta in self.etiquetas_paginas: etiqueta.destroy()
+            ancho, alto, _ = self.cache_carta.pagina(entrada, 0)
+            self.etiquetas_paginas = []
+            for numero in range(entrada.num_paginas):
+                etiqueta = ctk.CTkLabel(self.pdf_view_frame, text=f"Página {numero + 1}", width=ancho, height=alto)
+                etiqueta.pack(pady=5)
+                self.etiquetas_paginas.append(etiqueta)
+            self.cargar_paginas_visibles()
             
             # Cambiar a la pestaña de la carta para ver el resultado
             self.tab_view.set("Carta Restaurante")
-            messagebox.showinfo("Éxito", "La carta se ha generado y se muestra en la pestaña 'Carta Restaurante'.")
-            
         except Exception as e:
             messagebox.showerror("Error al Visualizar PDF", f"No se pudo mostrar el PDF en la aplicación.\n\nError: {e}")
 
-    # (Aquí va el resto de las funciones: cargar_csv, agregar_a_stock, agregar_ingrediente_manual, etc. No cambian, así que no se repiten aquí)
-    def refrescar_stock_treeview(self):
-        """Limpia y vuelve a cargar el treeview de stock desde el objeto Stock."""
-        # Borra todos los items actuales de la tabla
-        for i in self.tree_stock.get_children():
-            self.tree_stock.delete(i)
-    
-        # Vuelve a insertar cada ingrediente desde el objeto stock
-        for ing in self.stock.get_ingredientes():
-            # --- CAMBIO IMPORTANTE AQUÍ ---
-            # Se asegura de que la cantidad se muestre como un número entero
-            cantidad_entera = int(ing.cantidad)
-            self.tree_stock.insert("", "end", values=(ing.nombre, ing.unidad, cantidad_entera))
-            
+    def cargar_paginas_visibles(self):
+        entrada = self.carta_actual
+        if entrada is None or len(self._paginas_mostradas) == entrada.num_paginas: return
+        arriba, abajo = self.pdf_view_frame._parent_canvas.yview()
+        primera = int(arriba * entrada.num_paginas)
+        ultima = min(entrada.num_paginas - 1, int(abajo * entrada.num_paginas) + 1)  # una página de margen
+        for numero in range(primera, ultima + 1):
+            if numero in self._paginas_mostradas: continue
+            pixeles = self.cache_carta.pagina(entrada, numero)
+            if pixeles is not None:
+                self.mostrar_pagina_carta(numero, pixeles); self._paginas_mostradas.add(numero)
+            elif numero not in self._paginas_pedidas:
+                self._paginas_pedidas.add(numero)
+                id_trabajo = self.render.enviar_pagina_carta(entrada.clave, entrada.pdf, numero, DPI_CARTA)
+                self._trabajos_pagina[id_trabajo] = (entrada.clave, numero)
+
+    def mostrar_pagina_carta(self, numero, pixeles):
+        from PIL import Image  # solo se necesita al mostrar la primera página
+        ancho, alto, samples = pixeles
+        menu_image = Image.frombytes("RGB", [ancho, alto], samples)
+        ctk_image = ctk.CTkImage(light_image=menu_image, dark_image=menu_image, size=(menu_image.width, menu_image.height))
+        etiqueta = self.etiquetas_paginas[numero]
+        etiqueta.configure(image=ctk_image, text="")
+        etiqueta.image = ctk_image
+
+    def al_cerrar(self):
+        self.render.cerrar()
+        self.pronostico.guardar(os.path.join(DIRECTORIO_DATOS, ARCHIVO_ESTADO))
+        if self.analisis_ventas: self.analisis_ventas.guardar()
+        self.diario_stock.snapshot(); self.diario_stock.cerrar()
+        self.destroy()
+
+    def crear_filtro(self, parent, al_escribir):
+        """Campo para filtrar una TablaVirtual por el comienzo del nombre mientras se escribe."""
+        entrada = ctk.CTkEntry(parent, placeholder_text="Buscar por nombre...")
+        entrada.bind("<KeyRelease>", lambda event: al_escribir(entrada.get()))
+        return entrada
+
     def cargar_csv(self):
         filepath = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
         if not filepath: return
-        try:
-            with open(filepath, mode='r', encoding='utf-8') as file:
-                reader = csv.reader(file)
-                for i in self.tree_ingredientes_carga.get_children(): self.tree_ingredientes_carga.delete(i)
-                for row in reader:
-                    if len(row) == 3: self.tree_ingredientes_carga.insert("", "end", values=row)
-            messagebox.showinfo("Éxito", "Archivo CSV cargado.")
-        except Exception as e: messagebox.showerror("Error", f"No se pudo leer el archivo: {e}")
+        # Solo se indexa dónde empieza cada fila; el archivo completo se procesa en agregar_a_stock
+        try: fuente = FuenteCSV(filepath)
+        except OSError as e: messagebox.showerror("Error", f"No se pudo leer el archivo: {e}"); return
+        self.limpiar_vista_previa_csv()
+        self.fuente_csv = fuente
+        self.tabla_carga.cambiar_fuente(fuente)
+        messagebox.showinfo("Éxito", f"Archivo CSV cargado ({len(fuente)} filas).")
+    def limpiar_vista_previa_csv(self):
+        if self.fuente_csv is not None: self.fuente_csv.cerrar()
+        self.fuente_csv = None
+        self.tabla_carga.cambiar_fuente(None)
     def agregar_a_stock(self):
-        items, agregados, errores = self.tree_ingredientes_carga.get_children(), 0, 0
-        if not items: messagebox.showwarning("Vacío", "No hay ingredientes para agregar."); return
-        for item_id in items:
-            try:
-                nombre, unidad, cantidad_str = self.tree_ingredientes_carga.item(item_id, "values")
-                self.stock.agregar_ingrediente(Ingrediente(nombre, unidad, int(float(cantidad_str)))); agregados += 1
-            except (ValueError, IndexError) as e: errores += 1; print(f"Error procesando fila: {e}")
-        if agregados > 0:
-            self.refrescar_stock_treeview(); self.tab_view.set("Stock")
-            for item_id in items: self.tree_ingredientes_carga.delete(item_id)
-            messagebox.showinfo("Éxito", f"{agregados} ingrediente(s) agregados al stock.")
-        if errores > 0: messagebox.showwarning("Atención", f"Se omitieron {errores} fila(s) por formato incorrecto.")
+        if self.fuente_csv is None: messagebox.showwarning("Vacío", "No hay ingredientes para agregar."); return
+        try:
+            resultado = cargar_csv_en_stock(self.stock, self.fuente_csv.filepath)
+        except Exception as e: messagebox.showerror("Error", f"No se pudo leer el archivo: {e}"); return
+        for numero_fila, mensaje in resultado.errores: print(f"Error procesando fila {numero_fila}: {mensaje}")
+        if resultado.agregados > 0:
+            self.tab_view.set("Stock")
+            self.limpiar_vista_previa_csv()
+            messagebox.showinfo("Éxito", f"{resultado.agregados} ingrediente(s) agregados al stock.")
+        if resultado.total_errores > 0:
+            detalle = "\n".join(f"Fila {numero_fila}: {mensaje}" for numero_fila, mensaje in resultado.errores[:5])
+            messagebox.showwarning("Atención", f"Se omitieron {resultado.total_errores} fila(s) por formato o unidad incorrecta.\n\n{detalle}")
+        self.avisar_problemas_del_menu()
+    def avisar_problemas_del_menu(self, mostrar_unidades=True):
+        faltantes, diferencias = self.menu.verificar_stock(self.stock)
+        # Con el stock vacío todo falta; el aviso recién sirve cuando ya se cargaron ingredientes
+        if faltantes and self.stock.ingredientes:
+            detalle = ", ".join(f"{ing} ({', '.join(platos)})" for ing, platos in faltantes)
+            self.avisos_menu_var.set(f"No están en el stock: {detalle}")
+        else:
+            self.avisos_menu_var.set("")
+        if diferencias and mostrar_unidades:
+            detalle = "\n".join(f"'{ing}': la carta usa {receta}, el stock {stock}" for ing, receta, stock in diferencias)
+            messagebox.showwarning("Unidades distintas", f"Estos ingredientes no se podrán descontar correctamente:\n\n{detalle}")
     def agregar_ingrediente_manual(self):
         nombre, unidad, cantidad_str = self.entry_nombre.get(), self.combo_unidad.get(), self.entry_cantidad.get()
         if not nombre or not cantidad_str: messagebox.showerror("Error", "Nombre y cantidad son obligatorios."); return
         try:
-            self.stock.agregar_ingrediente(Ingrediente(nombre, unidad, int(float(cantidad_str)))); self.refrescar_stock_treeview()
+            self.stock.agregar_ingrediente(Ingrediente(nombre, unidad, cantidad_str))
             messagebox.showinfo("Éxito", f"Ingrediente '{nombre}' agregado.")
             self.entry_nombre.delete(0, tk.END); self.entry_cantidad.delete(0, tk.END)
-        except ValueError: messagebox.showerror("Error", "La cantidad debe ser un número válido.")
+            self.avisar_problemas_del_menu()
+        except ValueError as e: messagebox.showerror("Error", f"No se pudo agregar el ingrediente: {e}")
     def eliminar_ingrediente(self):
-        selected = self.tree_stock.selection()
-        if not selected: messagebox.showerror("Error", "Seleccione un ingrediente para eliminar."); return
-        nombre = self.tree_stock.item(selected[0], "values")[0]
-        self.stock.eliminar_ingrediente(nombre); self.refrescar_stock_treeview()
+        clave = self.tabla_stock.seleccion()
+        if clave is None: messagebox.showerror("Error", "Seleccione un ingrediente para eliminar."); return
+        nombre = self.stock.ingredientes[clave].nombre
+        self.stock.eliminar_ingrediente(clave)
         messagebox.showinfo("Éxito", f"Ingrediente '{nombre}' eliminado.")
+        self.avisar_problemas_del_menu(mostrar_unidades=False)
     def agregar_a_pedido(self, nombre_item):
-        # Verifica si hay ingredientes suficientes
-        if self.stock.verificar_stock_para_item(self.menu.get_item(nombre_item)['ingredientes']):
-            # Si hay stock, descuenta los ingredientes
-            self.stock.descontar_ingredientes(self.menu.get_item(nombre_item)['ingredientes'])
-        
-            # Agrega el item al pedido y actualiza las tablas
-            self.pedido_actual.agregar_item(self.menu.get_item(nombre_item), nombre_item)
-            self.refrescar_pedido_treeview()
-            self.refrescar_stock_treeview()
-        
-            # --- LÍNEA DE MENSAJE ELIMINADA ---
-            # Ya no se muestra el messagebox.showinfo("Éxito", ...)
-        
+        item_info = self.menu.get_item(nombre_item)
+        if item_info is None: messagebox.showwarning("Carta", f"'{nombre_item}' ya no está en la carta."); return
+        # Verifica y descuenta los ingredientes en un solo paso (todo o nada)
+        if self.stock.reservar([(item_info['ingredientes'], 1)]):
+            self.pedido_actual.agregar_item(item_info, nombre_item)
         else:
-            # Si no hay stock, SÍ se muestra el mensaje de advertencia
             messagebox.showwarning("Stock Insuficiente", f"No hay suficientes ingredientes para preparar '{nombre_item}'.")
 
+    def crear_boton_menu(self, nombre):
+        boton = ctk.CTkButton(self.frame_botones_menu, text=nombre, command=lambda: self.agregar_a_pedido(nombre))
+        # Se ubica antes del botón del siguiente plato de la carta, para respetar el orden del catálogo
+        platos = list(self.menu.get_items())
+        siguiente = next((self.botones_menu[otro] for otro in platos[platos.index(nombre) + 1:] if otro in self.botones_menu), None)
+        if siguiente is not None: boton.pack(fill="x", padx=10, pady=4, before=siguiente)
+        else: boton.pack(fill="x", padx=10, pady=4)
+        self.botones_menu[nombre] = boton
+
+    def al_cambiar_menu(self, agregados, actualizados, eliminados):
+        """Solo se crean o destruyen los botones de los platos que cambiaron en el catálogo."""
+        for nombre in eliminados:
+            self.botones_menu.pop(nombre).destroy()
+        for nombre in agregados:
+            self.crear_boton_menu(nombre)
+        self.actualizar_botones_menu({nombre: self.disponibilidad.porciones(nombre) for nombre in agregados + actualizados})
+        self.avisar_problemas_del_menu()
+
+    def actualizar_botones_menu(self, cambios):
+        """Muestra cuántas porciones quedan de cada plato y desactiva los que no se pueden preparar."""
+        for nombre, porciones in cambios.items():
+            boton = self.botones_menu.get(nombre)
+            if boton: boton.configure(text=nombre if porciones == SIN_LIMITE else f"{nombre} ({porciones})", state="normal" if porciones > 0 else "disabled")
     def eliminar_item_pedido(self):
-        selected = self.tree_pedido.selection()
-        if not selected: messagebox.showerror("Error", "Seleccione un ítem para eliminar."); return
-        item_id_en_pedido = int(self.tree_pedido.item(selected[0], "values")[0])
+        item_id_en_pedido = self.tabla_pedido.seleccion()
+        if item_id_en_pedido is None: messagebox.showerror("Error", "Seleccione un ítem para eliminar."); return
         item_eliminado = self.pedido_actual.eliminar_item(item_id_en_pedido)
         if item_eliminado:
-            self.stock.reponer_ingredientes(item_eliminado['ingredientes']); self.refrescar_pedido_treeview(); self.refrescar_stock_treeview()
+            self.stock.reponer_ingredientes(item_eliminado['ingredientes'])
             messagebox.showinfo("Éxito", f"Ítem eliminado. Stock repuesto.")
     def reiniciar_pedido(self):
-        if not self.pedido_actual.get_items(): messagebox.showinfo("Info", "El pedido ya está vacío."); return
+        if len(self.pedido_actual) == 0: messagebox.showinfo("Info", "El pedido ya está vacío."); return
         if messagebox.askyesno("Confirmar", "¿Reiniciar el pedido? Se repondrá todo el stock."):
-            for item in self.pedido_actual.get_items(): self.stock.reponer_ingredientes(item['ingredientes'])
-            self.pedido_actual.limpiar(); self.refrescar_pedido_treeview(); self.refrescar_stock_treeview()
+            self.stock.liberar(self.pedido_actual.lineas_por_plato())
+            self.pedido_actual.limpiar()
             messagebox.showinfo("Éxito", "Pedido reiniciado y stock restaurado.")
-    def refrescar_pedido_treeview(self):
-        for i in self.tree_pedido.get_children(): self.tree_pedido.delete(i)
-        for item in self.pedido_actual.get_items(): self.tree_pedido.insert("", "end", values=(item['id'], item['nombre'], f"${item['precio']:,}".replace(",", ".")))
-        self.total_pedido_var.set(f"Total: ${self.pedido_actual.calcular_total():,}".replace(",", "."))
+    def al_cambiar_pedido(self, agregados, actualizados, eliminados):
+        # La tabla ya se entera por su FuentePedido; aquí solo se actualiza el total
+        self.total_pedido_var.set(f"Total: {formatear_precio(self.pedido_actual.calcular_total())}")
     def generar_boleta_final(self):
-        if not self.pedido_actual.get_items(): messagebox.showerror("Error", "No hay ítems para generar boleta."); return
+        if len(self.pedido_actual) == 0: messagebox.showerror("Error", "No hay ítems para generar boleta."); return
+        if self.formato_boleta_var.get() != FORMATOS_BOLETA[0]: self.emitir_ticket(); return
+        # Se envía una copia al pool; el pedido queda libre para el siguiente cliente
+        self.enviar_boleta(self.pedido_actual.copia())
+        self.pedido_actual.limpiar(); self.actualizar_progreso_render()
+        self.diario_stock.snapshot_si_corresponde()
+    def enviar_boleta(self, pedido):
+        filename = f"boleta_pedido_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.pdf"
+        self._boletas_en_proceso[self.render.enviar_boleta(pedido, filename)] = pedido
+    def cancelar_boleta(self):
+        # Solo la última boleta enviada; la carta y las otras boletas siguen su curso
+        if not self._boletas_en_proceso: messagebox.showinfo("Info", "No hay boletas en proceso."); return
+        self.render.cancelar(next(reversed(self._boletas_en_proceso)))
+    def emitir_ticket(self):
+        # El ticket tarda microsegundos: se arma aquí mismo, sin pasar por el pool de procesos
+        pedido = self.pedido_actual.copia()
+        try:
+            if IMPRESORA_TERMICA: RenderizadorTermico().generar(pedido, IMPRESORA_TERMICA); filepath = None
+            else: filepath = RenderizadorTermico(escpos=False).generar(pedido, f"boleta_pedido_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.txt")
+        except OSError as e: messagebox.showerror("Error", f"No se pudo emitir el ticket: {e}"); return
+        self.registro_pedidos.registrar(pedido)
+        if self.analisis_ventas: self.refrescar_ventas()
+        self.pedido_actual.limpiar()
+        self.diario_stock.snapshot_si_corresponde()
+        if filepath: self.abrir_archivo(filepath)
+    def abrir_archivo(self, filepath):
         try:
-            boleta_generator = BoletaPDF(self.pedido_actual); filepath = boleta_generator.generar("boleta_pedido.pdf")
-            messagebox.showinfo("Boleta Generada", f"Boleta generada en '{filepath}'. Abriendo archivo...")
             if os.name == 'nt': os.startfile(filepath)
             else: subprocess.call(['open', filepath])
-            self.pedido_actual.limpiar(); self.refrescar_pedido_treeview()
-        except Exception as e: messagebox.showerror("Error", f"No se pudo generar la boleta: {e}")
+        except Exception as e: messagebox.showerror("Error", f"Boleta generada en '{filepath}', pero no se pudo abrir: {e}")
+    def abrir_boleta(self, id_trabajo, resultado, error):
+        pedido = self._boletas_en_proceso.pop(id_trabajo, None)
+        if not error and pedido:
+            self.registro_pedidos.registrar(pedido)
+            if self.analisis_ventas: self.refrescar_ventas()
+        if error:
+            # El pedido en pantalla ya es del siguiente cliente: no se toca. El de la boleta se reintenta o se anula
+            if pedido is None: return
+            if not isinstance(error, CancelledError) and messagebox.askretrycancel("Error", f"No se pudo generar la boleta: {error}\n\n¿Reintentar?"):
+                self.enviar_boleta(pedido); self.actualizar_progreso_render(); return
+            self.stock.liberar([(item['ingredientes'], 1) for item in pedido.get_items()])
+            messagebox.showinfo("Boleta anulada", f"La boleta de {formatear_precio(pedido.calcular_total())} no se emitió y su stock se repuso."); return
+        self.abrir_archivo(resultado["filepath"])
+
+    def mostrar_alertas_stock(self, nuevas):
+        # Se muestran todas las vigentes (las nuevas llegan primero por el callback), las más urgentes primero
+        vigentes = self.pronostico.alertas()
+        if not vigentes: self.alertas_stock_var.set(""); return
+        texto = "  |  ".join(str(alerta) for alerta in vigentes[:3])
+        if len(vigentes) > 3: texto += f"  |  y {len(vigentes) - 3} más"
+        self.alertas_stock_var.set(f"Stock bajo: {texto}")
+    def exportar_reposicion(self):
+        filepath = filedialog.asksaveasfilename(defaultextension=".csv", initialfile="reposicion.csv", filetypes=[("CSV files", "*.csv")])
+        if not filepath: return
+        filas = self.pronostico.exportar_reposicion(filepath)
+        messagebox.showinfo("Reposición", f"Se guardaron {filas} ingrediente(s) a pedir en '{filepath}'.\nEl archivo se puede cargar desde 'Carga Ingredientes'.")
+
+    def refrescar_ventas(self):
+        if self.analisis_ventas is None:
+            try:
+                from Ventas import AnalisisVentas
+            except ImportError:
+                self.resumen_ventas_var.set("El análisis de ventas necesita numpy (pip install numpy)."); return
+            self.analisis_ventas = AnalisisVentas(self.registro_pedidos)
+        self.analisis_ventas.actualizar()
+        rango = {'desde': self.entry_ventas_desde.get().strip() or None, 'hasta': self.entry_ventas_hasta.get().strip() or None}
+        try:
+            resumen = self.analisis_ventas.resumen(**rango)
+        except ValueError:
+            messagebox.showerror("Error", "Las fechas deben tener el formato AAAA-MM-DD (opcionalmente con THH:MM)."); return
+        self.resumen_ventas_var.set(
+            f"Pedidos: {resumen['pedidos']}   Unidades: {resumen['unidades']}   Ticket promedio: {formatear_precio(resumen['ticket_promedio'])}\n"
+            f"Subtotal: {formatear_precio(resumen['subtotal'])}   IVA (19%): {formatear_precio(resumen['iva'])}   Total: {formatear_precio(resumen['total'])}")
+        self.tree_ventas_platos.delete(*self.tree_ventas_platos.get_children())
+        for nombre, unidades, total in self.analisis_ventas.por_plato(**rango):
+            self.tree_ventas_platos.insert("", tk.END, values=(nombre, unidades, formatear_precio(total)))
+        self.tree_ventas_consumo.delete(*self.tree_ventas_consumo.get_children())
+        for nombre, unidad, cantidad in self.analisis_ventas.consumo_ingredientes(self.menu, **rango):
+            self.tree_ventas_consumo.insert("", tk.END, values=(nombre, unidad, cantidad))
+        platos, matriz = self.analisis_ventas.por_hora(**rango)
+        vendidos = [i for i in range(len(platos)) if matriz[i].any()]
+        self.tree_ventas_horas.delete(*self.tree_ventas_horas.get_children())
+        self.tree_ventas_horas.configure(columns=["hora"] + [f"p{i}" for i in vendidos])
+        self.tree_ventas_horas.heading("hora", text="Hora"); self.tree_ventas_horas.column("hora", width=60, anchor=tk.CENTER)
+        for i in vendidos:
+            self.tree_ventas_horas.heading(f"p{i}", text=platos[i]); self.tree_ventas_horas.column(f"p{i}", width=90, anchor=tk.CENTER)
+        for hora in range(matriz.shape[1]):
+            if matriz[:, hora].any():
+                self.tree_ventas_horas.insert("", tk.END, values=[f"{hora:02d}:00"] + [int(matriz[i, hora]) for i in vendidos])
 
 if __name__ == "__main__":
     app = RestauranteApp()
@@ -0,0 +1,81 @@
+# ServicioStock.py
+import threading
+
+
+def lineas_de_pedido(pedido):
+    """Convierte un Pedido en líneas (ingredientes_requeridos, cantidad) para Stock.reservar, una por plato."""
+    return pedido.lineas_por_plato()
+
+
+class ServicioStock:
+    """
+    Acceso seguro a un Stock compartido por varias cajas (hilos).
+    Cada ingrediente tiene su propio candado; una reserva toma, en orden alfabético,
+    solo los candados de los ingredientes que usa, así dos pedidos sin ingredientes
+    en común avanzan en paralelo y nunca se produce un bloqueo mutuo.
+    Los suscriptores y registradores del Stock reciben los eventos desde los hilos de trabajo,
+    pero de a uno: un solo candado de eventos los serializa, así MotorDisponibilidad,
+    PronosticoConsumo o el diario nunca se ejecutan en dos hilos a la vez.
+    """
+    def __init__(self, stock, max_hilos=8):
+        self.stock = stock
+        self.max_hilos = max_hilos
+        self._candados = {}
+        self._candado_registro = threading.Lock()
+        # RLock: un suscriptor que vuelve a tocar el stock desde su aviso no se bloquea a sí mismo
+        stock.serializar_eventos(threading.RLock())
+
+    def _candados_para(self, nombres):
+        with self._candado_registro:
+            return [self._candados.setdefault(nombre, threading.Lock()) for nombre in sorted(set(nombres))]
+
+    def _con_candados(self, nombres, funcion, *args):
+        candados = self._candados_para(nombres)
+        for candado in candados:
+            candado.acquire()
+        try:
+            return funcion(*args)
+        finally:
+            for candado in reversed(candados):
+                candado.release()
+
+    def agregar_ingrediente(self, ingrediente):
+        self._con_candados([ingrediente.nombre.lower()], self.stock.agregar_ingrediente, ingrediente)
+
+    def eliminar_ingrediente(self, nombre):
+        self._con_candados([nombre.lower()], self.stock.eliminar_ingrediente, nombre)
+
+    def reservar(self, lineas):
+        lineas = list(lineas)
+        nombres = [ing.lower() for ingredientes_requeridos, _ in lineas for ing in ingredientes_requeridos]
+        return self._con_candados(nombres, self.stock.reservar, lineas)
+
+    def liberar(self, lineas):
+        lineas = list(lineas)
+        nombres = [ing.lower() for ingredientes_requeridos, _ in lineas for ing in ingredientes_requeridos]
+        self._con_candados(nombres, self.stock.liberar, lineas)
+
+    def reservar_pedido(self, pedido):
+        return self.reservar(lineas_de_pedido(pedido))
+
+    def liberar_pedido(self, pedido):
+        self.liberar(lineas_de_pedido(pedido))
+
+    def procesar_pedidos(self, pedidos, max_hilos=None):
+        """Reserva muchos pedidos en paralelo; devuelve una lista de bool en el mismo orden."""
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max_hilos or self.max_hilos) as executor:
+            return list(executor.map(self.reservar_pedido, pedidos))
+
+    def snapshot(self, diario):
+        """Escribe el snapshot de un DiarioStock con todos los ingredientes bloqueados, para que nadie lo modifique a medias."""
+        with self._candado_registro:
+            nombres = sorted(set(self._candados) | set(self.stock.ingredientes))
+            candados = [self._candados.setdefault(nombre, threading.Lock()) for nombre in nombres]
+            for candado in candados:
+                candado.acquire()
+            try:
+                diario.snapshot()
+            finally:
+                for candado in reversed(candados):
+                    candado.release()
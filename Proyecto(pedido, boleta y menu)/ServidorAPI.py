@@ -0,0 +1,462 @@
+# ServidorAPI.py
+# API HTTP/JSON para tomar pedidos desde kioscos o integraciones de delivery, sin dependencias externas.
+# Uso: python ServidorAPI.py --csv ingredientes_menu.csv --datos datos --puerto 8080
+#
+#   GET    /menu                      platos con precio e ingredientes (unidad base)
+#   GET    /disponibilidad            porciones que permite el stock actual, por plato (2147483647 si no usa ingredientes)
+#   POST   /pedidos                   {"items": {"Completo": 2, "Pepsi": 1}} -> reserva el stock
+#                                     (si en --vida-pedido segundos no se pide la boleta ni se cancela, se libera solo)
+#   GET    /pedidos/<id>              detalle de un pedido abierto
+#   DELETE /pedidos/<id>              cancela el pedido y devuelve el stock
+#   POST   /pedidos/<id>/boleta       cierra el pedido y encola su boleta en PDF
+#   GET    /boletas/<trabajo>         estado de la boleta (pendiente, lista o error)
+#   GET    /boletas/<trabajo>.pdf     el PDF, cuando ya está lista
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+
+from Nucleo import Menu, Pedido, Stock, MotorDisponibilidad, DiarioStock, RegistroPedidos, cargar_csv_en_stock
+from Boleta import desglose_iva
+from RenderPDF import renderizar_boleta
+
+TAMANO_LOTE = 64             # pedidos que se reservan juntos en una pasada por el hilo del stock
+TRABAJADORES_BOLETA = 2
+MAX_BOLETAS_EN_COLA = 1000
+INTERVALO_CATALOGO = 1.0     # segundos entre revisiones de menu.json
+VIDA_PEDIDO = 30 * 60        # segundos que un pedido abierto retiene su stock sin boleta ni cancelación
+INTERVALO_VENCIMIENTOS = 30.0  # segundos entre revisiones de pedidos vencidos
+MAX_CUERPO = 64 * 1024
+MAX_ENCABEZADOS = 16 * 1024
+
+MOTIVOS = {200: "OK", 201: "Created", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large", 503: "Service Unavailable"}
+
+
+class ErrorHTTP(Exception):
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+        self.mensaje = mensaje
+
+
+class ServidorAPI:
+    """
+    Servidor asyncio sobre el mismo Stock, Menu y Pedido que usa la interfaz.
+    Todas las modificaciones del stock pasan por un único hilo ("hilo del stock"), así el Stock,
+    sus suscriptores (MotorDisponibilidad) y el DiarioStock nunca se usan desde dos hilos a la vez
+    y el bucle de eventos no se bloquea escribiendo el diario. Los pedidos que llegan juntos se
+    reservan en lote (un solo salto al hilo del stock) y las boletas se generan en una cola aparte.
+    """
+    def __init__(self, stock, menu, diario=None, registro=None, directorio_boletas="boletas",
+                 trabajadores_boleta=TRABAJADORES_BOLETA, usar_procesos=True, vida_pedido=VIDA_PEDIDO):
+        self.stock = stock
+        self.menu = menu
+        self.diario = diario
+        self.registro = registro
+        self.directorio_boletas = directorio_boletas
+        self.trabajadores_boleta = trabajadores_boleta
+        self.usar_procesos = usar_procesos
+        self.vida_pedido = vida_pedido
+        self.disponibilidad = MotorDisponibilidad(menu, stock)
+        self.pedidos = {}        # id -> Pedido con stock reservado y sin boleta
+        self._vencimientos = {}  # id -> instante (loop.time()) en que el pedido abierto se libera solo
+        self.trabajos = {}       # id de trabajo -> {"pedido", "estado", "archivo", "error"}
+        self._ids_pedido = itertools.count(1)
+        self._ids_trabajo = itertools.count(1)
+        self._hilo_stock = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stock")
+        self._executor_boletas = None
+        self._cola_pedidos = None
+        self._cola_boletas = None
+        self._tareas = []
+        self._conexiones = set()
+        self.lotes = 0           # estadísticas para el benchmark
+        self.pedidos_en_lotes = 0
+
+    # --- Ciclo de vida ---
+
+    async def iniciar(self, host="127.0.0.1", puerto=8080):
+        os.makedirs(self.directorio_boletas, exist_ok=True)
+        executor = ProcessPoolExecutor if self.usar_procesos else ThreadPoolExecutor
+        self._executor_boletas = executor(max_workers=self.trabajadores_boleta)
+        self._cola_pedidos = asyncio.Queue()
+        self._cola_boletas = asyncio.Queue(maxsize=MAX_BOLETAS_EN_COLA)
+        self._tareas = [asyncio.create_task(self._procesar_lotes()), asyncio.create_task(self._vigilar_catalogo()),
+                        asyncio.create_task(self._vigilar_vencimientos())]
+        self._tareas += [asyncio.create_task(self._generar_boletas()) for _ in range(self.trabajadores_boleta)]
+        self._servidor = await asyncio.start_server(self._atender_conexion, host, puerto, limit=MAX_ENCABEZADOS)
+        return self._servidor.sockets[0].getsockname()[1]
+
+    async def servir(self, host="127.0.0.1", puerto=8080):
+        puerto = await self.iniciar(host, puerto)
+        print(f"API escuchando en http://{host}:{puerto}")
+        try:
+            async with self._servidor:
+                await self._servidor.serve_forever()
+        finally:
+            await self.cerrar()
+
+    async def cerrar(self):
+        self._servidor.close()
+        for writer in list(self._conexiones):
+            writer.close()
+        for tarea in self._tareas:
+            tarea.cancel()
+        await asyncio.gather(*self._tareas, return_exceptions=True)
+        if self.diario:
+            await self._en_hilo_stock(self.diario.snapshot)
+        self._hilo_stock.shutdown(wait=True)
+        self._executor_boletas.shutdown(wait=False, cancel_futures=True)
+        if self.diario:
+            self.diario.cerrar()
+
+    def _en_hilo_stock(self, funcion, *args):
+        return asyncio.get_running_loop().run_in_executor(self._hilo_stock, funcion, *args)
+
+    async def _vigilar_catalogo(self):
+        # La recarga corre en el hilo del stock porque MotorDisponibilidad recompila leyendo el Stock
+        while True:
+            await asyncio.sleep(INTERVALO_CATALOGO)
+            try:
+                cambios = await self._en_hilo_stock(self.menu.recargar_si_cambio)
+            except (ValueError, OSError) as e:
+                print(f"No se aplicaron los cambios de la carta: {e}")
+                continue
+            if cambios:
+                agregados, actualizados, eliminados = cambios
+                print(f"Carta recargada: {len(agregados)} agregados, {len(actualizados)} modificados, {len(eliminados)} eliminados")
+
+    # --- HTTP ---
+
+    async def _atender_conexion(self, reader, writer):
+        self._conexiones.add(writer)
+        try:
+            while True:
+                try:
+                    encabezado = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self._responder(writer, 413, {"error": "encabezados demasiado grandes"}, cerrar=True)
+                    return
+                lineas = encabezado.decode("latin-1").split("\r\n")
+                try:
+                    metodo, ruta, version = lineas[0].split(" ", 2)
+                except ValueError:
+                    await self._responder(writer, 400, {"error": "línea de solicitud inválida"}, cerrar=True)
+                    return
+                encabezados = {}
+                for linea in lineas[1:]:
+                    nombre, _, valor = linea.partition(":")
+                    if nombre:
+                        encabezados[nombre.strip().lower()] = valor.strip()
+                try:
+                    largo = self._largo_cuerpo(encabezados)
+                except ErrorHTTP as e:
+                    # Sin un largo válido no se sabe dónde termina el cuerpo: se responde y se cierra
+                    await self._responder(writer, e.estado, {"error": e.mensaje}, cerrar=True)
+                    return
+                cuerpo = await reader.readexactly(largo) if largo else b""
+                conexion = encabezados.get("connection", "").lower()
+                cerrar = conexion == "close" or (version == "HTTP/1.0" and conexion != "keep-alive")
+                try:
+                    estado, respuesta = await self._despachar(metodo, ruta.split("?", 1)[0], cuerpo)
+                except ErrorHTTP as e:
+                    estado, respuesta = e.estado, {"error": e.mensaje}
+                try:
+                    await self._responder(writer, estado, respuesta, cerrar)
+                except (ConnectionError, asyncio.CancelledError):
+                    # Un pedido recién creado cuyo id no llegó al cliente no lo puede cerrar ni cancelar nadie
+                    if metodo == "POST" and estado == 201:
+                        await self._anular_pedido(respuesta["id"])
+                    raise
+                if cerrar:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._conexiones.discard(writer)
+            writer.close()
+
+    @staticmethod
+    def _largo_cuerpo(encabezados):
+        try:
+            largo = int(encabezados.get("content-length") or 0)
+        except ValueError:
+            raise ErrorHTTP(400, "Content-Length inválido")
+        if largo < 0:
+            raise ErrorHTTP(400, "Content-Length inválido")
+        if largo > MAX_CUERPO:
+            raise ErrorHTTP(413, "cuerpo demasiado grande")
+        return largo
+
+    async def _responder(self, writer, estado, respuesta, cerrar=False):
+        if isinstance(respuesta, bytes):
+            cuerpo, tipo = respuesta, "application/pdf"
+        else:
+            cuerpo, tipo = json.dumps(respuesta, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+        writer.write(f"HTTP/1.1 {estado} {MOTIVOS.get(estado, '')}\r\nContent-Type: {tipo}\r\n"
+                     f"Content-Length: {len(cuerpo)}\r\nConnection: {'close' if cerrar else 'keep-alive'}\r\n\r\n".encode("latin-1") + cuerpo)
+        await writer.drain()
+
+    async def _despachar(self, metodo, ruta, cuerpo):
+        for patron, metodos in RUTAS:
+            coincidencia = patron.fullmatch(ruta)
+            if coincidencia:
+                manejador = metodos.get(metodo)
+                if manejador is None:
+                    raise ErrorHTTP(405, f"{metodo} no está permitido en {ruta}")
+                return await manejador(self, cuerpo, *coincidencia.groups())
+        raise ErrorHTTP(404, f"no existe {ruta}")
+
+    # --- Menú y disponibilidad ---
+
+    async def get_menu(self, cuerpo):
+        return 200, {nombre: {"precio": info['precio'],
+                              "ingredientes": {ing: {"cantidad": cant, "unidad": self.menu.unidad_ingrediente(ing)}
+                                               for ing, cant in info['ingredientes'].items()}}
+                     for nombre, info in self.menu.get_items().items()}
+
+    async def get_disponibilidad(self, cuerpo):
+        return 200, self.disponibilidad.todas()
+
+    # --- Pedidos ---
+
+    def _armar_pedido(self, cuerpo):
+        try:
+            datos = json.loads(cuerpo or b"{}")
+        except ValueError:
+            raise ErrorHTTP(400, "el cuerpo no es JSON válido")
+        items = datos.get("items") if isinstance(datos, dict) else None
+        if not isinstance(items, dict) or not items:
+            raise ErrorHTTP(400, 'se espera {"items": {"Plato": cantidad, ...}}')
+        pedido = Pedido()
+        for nombre, cantidad in items.items():
+            item_info = self.menu.get_item(nombre)
+            if item_info is None:
+                raise ErrorHTTP(400, f"el plato '{nombre}' no está en el menú")
+            if not isinstance(cantidad, int) or isinstance(cantidad, bool) or not 0 < cantidad <= 1000:
+                raise ErrorHTTP(400, f"cantidad inválida para '{nombre}'")
+            for _ in range(cantidad):
+                pedido.agregar_item(item_info, nombre)
+        return pedido
+
+    @staticmethod
+    def _describir(id_pedido, pedido):
+        subtotal, iva = desglose_iva(pedido.calcular_total())
+        return {"id": id_pedido,
+                "lineas": [{"nombre": nombre, **detalles} for nombre, detalles in pedido.agrupar()],
+                "subtotal": subtotal, "iva": iva, "total": pedido.calcular_total()}
+
+    async def post_pedido(self, cuerpo):
+        pedido = self._armar_pedido(cuerpo)
+        reservado = asyncio.get_running_loop().create_future()
+        await self._cola_pedidos.put((pedido, reservado))
+        try:
+            reservo = await reservado
+        except asyncio.CancelledError:
+            # Si se cancela mientras espera, también se cancela `reservado` y _procesar_lotes devuelve
+            # lo reservado; si el lote ya lo había resuelto, lo devuelve esta tarea
+            if not reservado.cancelled() and reservado.exception() is None and reservado.result():
+                await self._en_hilo_stock(self.stock.liberar, pedido.lineas_por_plato())
+            raise
+        if not reservo:
+            raise ErrorHTTP(409, "stock insuficiente para preparar el pedido")
+        id_pedido = next(self._ids_pedido)
+        self._abrir_pedido(id_pedido, pedido)
+        return 201, self._describir(id_pedido, pedido)
+
+    def _abrir_pedido(self, id_pedido, pedido):
+        self.pedidos[id_pedido] = pedido
+        self._vencimientos[id_pedido] = asyncio.get_running_loop().time() + self.vida_pedido
+
+    def _cerrar_pedido(self, id_pedido):
+        """Saca un pedido de los abiertos (boleta o cancelación) y devuelve el Pedido, o None si no estaba."""
+        self._vencimientos.pop(id_pedido, None)
+        return self.pedidos.pop(id_pedido, None)
+
+    async def _anular_pedido(self, id_pedido):
+        """Cierra un pedido abierto y devuelve su stock."""
+        pedido = self._cerrar_pedido(id_pedido)
+        if pedido is not None:
+            await self._en_hilo_stock(self.stock.liberar, pedido.lineas_por_plato())
+
+    async def _liberar_vencidos(self):
+        """Anula los pedidos abiertos que pasaron vida_pedido segundos sin boleta ni cancelación; devuelve sus ids."""
+        ahora = asyncio.get_running_loop().time()
+        vencidos = [id_pedido for id_pedido, vence in self._vencimientos.items() if vence <= ahora]
+        for id_pedido in vencidos:
+            await self._anular_pedido(id_pedido)
+        return vencidos
+
+    async def _vigilar_vencimientos(self):
+        while True:
+            await asyncio.sleep(min(INTERVALO_VENCIMIENTOS, self.vida_pedido))
+            vencidos = await self._liberar_vencidos()
+            if vencidos:
+                print(f"{len(vencidos)} pedido(s) sin boleta vencieron y su stock volvió al inventario")
+
+    def _reservar_lote(self, pedidos):
+        """
+        Corre en el hilo del stock: reserva cada pedido (todo o nada) con Stock.reservar. Devuelve
+        un resultado por pedido (True, False o la excepción de ese pedido), así un error no deja a
+        los demás del lote sin respuesta con su stock ya descontado.
+        """
+        resultados = []
+        for pedido in pedidos:
+            try:
+                resultados.append(self.stock.reservar(pedido.lineas_por_plato()))
+            except Exception as e:
+                resultados.append(e)
+        if self.diario:
+            try:
+                self.diario.snapshot_si_corresponde()
+            except OSError as e:
+                # Las reservas ya están en el diario; el snapshot se reintenta con el próximo lote
+                print(f"No se pudo guardar el snapshot del stock: {e}")
+        return resultados
+
+    async def _procesar_lotes(self):
+        while True:
+            lote = [await self._cola_pedidos.get()]
+            # Se cede el turno una vez para que las conexiones con datos ya leídos encolen sus pedidos;
+            # mientras el hilo del stock reserva un lote, los que llegan forman el siguiente
+            await asyncio.sleep(0)
+            while len(lote) < TAMANO_LOTE and not self._cola_pedidos.empty():
+                lote.append(self._cola_pedidos.get_nowait())
+            try:
+                resultados = await self._en_hilo_stock(self._reservar_lote, [pedido for pedido, _ in lote])
+            except Exception as e:
+                for _, reservado in lote:
+                    if not reservado.done():
+                        reservado.set_exception(ErrorHTTP(503, f"no se pudo reservar el stock: {e}"))
+                continue
+            self.lotes += 1
+            self.pedidos_en_lotes += len(lote)
+            for (pedido, reservado), resultado in zip(lote, resultados):
+                if isinstance(resultado, Exception):
+                    if not reservado.done():
+                        reservado.set_exception(ErrorHTTP(503, f"no se pudo reservar el stock: {resultado}"))
+                elif not reservado.done():
+                    reservado.set_result(resultado)
+                elif resultado:
+                    # El cliente se desconectó antes de la respuesta: se devuelve lo reservado
+                    await self._en_hilo_stock(self.stock.liberar, pedido.lineas_por_plato())
+
+    def _pedido_abierto(self, id_texto):
+        pedido = self.pedidos.get(int(id_texto))
+        if pedido is None:
+            raise ErrorHTTP(404, f"no hay un pedido abierto con id {id_texto}")
+        return pedido
+
+    async def get_pedido(self, cuerpo, id_texto):
+        return 200, self._describir(int(id_texto), self._pedido_abierto(id_texto))
+
+    async def delete_pedido(self, cuerpo, id_texto):
+        self._pedido_abierto(id_texto)
+        await self._anular_pedido(int(id_texto))
+        return 200, {"id": int(id_texto), "estado": "cancelado"}
+
+    # --- Boletas ---
+
+    async def post_boleta(self, cuerpo, id_texto):
+        self._pedido_abierto(id_texto)
+        if self._cola_boletas.full():
+            raise ErrorHTTP(503, "hay demasiadas boletas en cola, intente más tarde")
+        id_pedido = int(id_texto)
+        pedido = self._cerrar_pedido(id_pedido)
+        id_trabajo = next(self._ids_trabajo)
+        self.trabajos[id_trabajo] = {"pedido": id_pedido, "estado": "pendiente", "archivo": None, "error": None}
+        self._cola_boletas.put_nowait((id_trabajo, id_pedido, pedido))
+        return 202, {"trabajo": id_trabajo, "estado": "pendiente", "url": f"/boletas/{id_trabajo}"}
+
+    async def _generar_boletas(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            id_trabajo, id_pedido, pedido = await self._cola_boletas.get()
+            trabajo = self.trabajos[id_trabajo]
+            filename = os.path.join(self.directorio_boletas, f"boleta_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{id_trabajo}.pdf")
+            try:
+                resultado = await loop.run_in_executor(self._executor_boletas, renderizar_boleta, pedido.copia(), filename)
+            except Exception as e:
+                # Igual que en la interfaz: si la boleta falla el pedido vuelve a quedar abierto
+                self._abrir_pedido(id_pedido, pedido)
+                trabajo.update(estado="error", error=str(e))
+                continue
+            if self.registro:
+                # Escribe en disco: en un hilo, para no frenar el bucle de eventos
+                await loop.run_in_executor(None, self.registro.registrar, pedido)
+            trabajo.update(estado="lista", archivo=resultado["filepath"])
+
+    async def get_boleta(self, cuerpo, id_texto, extension):
+        trabajo = self.trabajos.get(int(id_texto))
+        if trabajo is None:
+            raise ErrorHTTP(404, f"no existe el trabajo {id_texto}")
+        if not extension:
+            return 200, {"trabajo": int(id_texto), **trabajo, "url_pdf": f"/boletas/{id_texto}.pdf" if trabajo["archivo"] else None}
+        if trabajo["estado"] != "lista":
+            raise ErrorHTTP(409, f"la boleta está {trabajo['estado']}")
+        return 200, await asyncio.get_running_loop().run_in_executor(None, _leer_binario, trabajo["archivo"])
+
+
+def _leer_binario(ruta):
+    with open(ruta, "rb") as f:
+        return f.read()
+
+
+RUTAS = [
+    (re.compile(r"/menu"), {"GET": ServidorAPI.get_menu}),
+    (re.compile(r"/disponibilidad"), {"GET": ServidorAPI.get_disponibilidad}),
+    (re.compile(r"/pedidos"), {"POST": ServidorAPI.post_pedido}),
+    (re.compile(r"/pedidos/(\d+)"), {"GET": ServidorAPI.get_pedido, "DELETE": ServidorAPI.delete_pedido}),
+    (re.compile(r"/pedidos/(\d+)/boleta"), {"POST": ServidorAPI.post_boleta}),
+    (re.compile(r"/boletas/(\d+)(\.pdf)?"), {"GET": ServidorAPI.get_boleta}),
+]
+
+
+def crear_servidor(csv_stock=None, directorio_datos=None, **opciones):
+    """Arma el Stock (desde el directorio de datos y/o un CSV) y el ServidorAPI, como Consola.cargar_stock."""
+    stock, diario, registro = Stock(), None, None
+    if directorio_datos:
+        diario = DiarioStock(directorio_datos)
+        diario.adjuntar(stock)
+        registro = RegistroPedidos(directorio_datos)
+    if csv_stock:
+        resultado = cargar_csv_en_stock(stock, csv_stock)
+        for numero_fila, mensaje in resultado.errores:
+            print(f"Fila {numero_fila} omitida: {mensaje}")
+    menu = Menu()
+    faltantes, diferencias = menu.verificar_stock(stock)
+    for ing, platos in faltantes:
+        print(f"Atención: '{ing}' no está en el stock ({', '.join(platos)})")
+    for ing, receta, en_stock in diferencias:
+        print(f"Atención: la carta pide '{ing}' en {receta} y el stock lo tiene en {en_stock}")
+    return ServidorAPI(stock, menu, diario=diario, registro=registro, **opciones)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API HTTP/JSON de pedidos del restaurante.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8080)
+    parser.add_argument("--csv", help="CSV de ingredientes (nombre,unidad,cantidad) a cargar en el stock")
+    parser.add_argument("--datos", help="directorio con el stock persistido y el registro de pedidos")
+    parser.add_argument("--boletas", default="boletas", help="directorio donde se guardan los PDF")
+    parser.add_argument("--trabajadores", type=int, default=TRABAJADORES_BOLETA, help="procesos que generan boletas")
+    parser.add_argument("--vida-pedido", type=float, default=VIDA_PEDIDO,
+                        help="segundos que un pedido sin boleta retiene su stock antes de liberarse")
+    args = parser.parse_args(argv)
+    servidor = crear_servidor(args.csv, args.datos, directorio_boletas=args.boletas, trabajadores_boleta=args.trabajadores,
+                              vida_pedido=args.vida_pedido)
+    try:
+        asyncio.run(servidor.servir(args.host, args.puerto))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,22 +1,86 @@
 # Stock.py
+from contextlib import nullcontext
+
+from Perfilado import medido
+
+
 class Stock:
     def __init__(self):
         self.ingredientes = {}
+        self._suscriptores = []
+        self._registradores = []
+        self._candado_eventos = nullcontext()
 
-    def agregar_ingrediente(self, ingrediente):
+    def serializar_eventos(self, candado):
+        """Toma candado alrededor de cada aviso a registradores y suscriptores, para que se llamen de a uno aunque el stock se modifique desde varios hilos."""
+        self._candado_eventos = candado
+
+    def suscribir(self, callback):
+        """Registra callback(agregados, actualizados, eliminados), que recibe los nombres (en minúscula) que cambiaron."""
+        self._suscriptores.append(callback)
+
+    def _notificar(self, agregados=(), actualizados=(), eliminados=()):
+        with self._candado_eventos:
+            for callback in self._suscriptores:
+                callback(agregados, actualizados, eliminados)
+
+    def agregar_registrador(self, registrador):
+        """registrador.registrar(operacion, datos) recibe cada cambio ya aplicado (por ejemplo un DiarioStock)."""
+        self._registradores.append(registrador)
+
+    def _registrar(self, operacion, datos):
+        with self._candado_eventos:
+            for registrador in self._registradores:
+                registrador.registrar(operacion, datos)
+
+    def _verificar_unidad(self, ingrediente):
+        existente = self.ingredientes.get(ingrediente.nombre.lower())
+        if existente is not None and existente.unidad != ingrediente.unidad:
+            raise ValueError(f"'{ingrediente.nombre}' está en {existente.unidad} en el stock y no se puede sumar en {ingrediente.unidad}")
+
+    def _agregar_sin_notificar(self, ingrediente, agregados, actualizados):
         nombre = ingrediente.nombre.lower()
         if nombre in self.ingredientes:
             self.ingredientes[nombre].cantidad += ingrediente.cantidad
+            actualizados.append(nombre)
         else:
             self.ingredientes[nombre] = ingrediente
+            agregados.append(nombre)
+
+    def agregar_ingrediente(self, ingrediente):
+        self._verificar_unidad(ingrediente)
+        agregados, actualizados = [], []
+        self._agregar_sin_notificar(ingrediente, agregados, actualizados)
+        if self._registradores:
+            self._registrar("agregar", [[ingrediente.nombre, ingrediente.unidad, ingrediente.cantidad]])
+        self._notificar(agregados, actualizados)
+
+    def agregar_ingredientes(self, ingredientes):
+        """Agrega varios ingredientes emitiendo un solo evento de cambio; si alguno choca en unidad no agrega ninguno."""
+        agregados, actualizados = [], []
+        ingredientes = list(ingredientes)
+        # Las cantidades se copian antes de aplicar: un ingrediente nuevo queda guardado tal cual en el
+        # stock, y si el mismo nombre viene dos veces ese objeto ya tendría la suma al anotarlo
+        filas = [[ing.nombre, ing.unidad, ing.cantidad] for ing in ingredientes] if self._registradores else None
+        for ingrediente in ingredientes:
+            self._verificar_unidad(ingrediente)
+        for ingrediente in ingredientes:
+            self._agregar_sin_notificar(ingrediente, agregados, actualizados)
+        if self._registradores:
+            self._registrar("agregar", filas)
+        self._notificar(agregados, actualizados)
 
     def eliminar_ingrediente(self, nombre):
         if nombre.lower() in self.ingredientes:
             del self.ingredientes[nombre.lower()]
+            if self._registradores:
+                self._registrar("eliminar", nombre.lower())
+            self._notificar(eliminados=(nombre.lower(),))
 
     def get_ingredientes(self):
         return list(self.ingredientes.values())
 
+    @medido
     def verificar_stock_para_item(self, ingredientes_requeridos):
         for ing, cant_req in ingredientes_requeridos.items():
             ing_nombre = ing.lower()
@@ -24,10 +88,55 @@ class Stock:
                 return False
         return True
 
+    @medido
     def descontar_ingredientes(self, ingredientes_requeridos):
         for ing, cant_req in ingredientes_requeridos.items():
             self.ingredientes[ing.lower()].cantidad -= cant_req
+        if self._registradores:
+            self._registrar("descontar", {ing.lower(): cant_req for ing, cant_req in ingredientes_requeridos.items()})
+        self._notificar(actualizados=[ing.lower() for ing in ingredientes_requeridos])
 
+    @medido
     def reponer_ingredientes(self, ingredientes_devueltos):
         for ing, cant_dev in ingredientes_devueltos.items():
-            self.ingredientes[ing.lower()].cantidad += cant_dev
\ No newline at end of file
+            self.ingredientes[ing.lower()].cantidad += cant_dev
+        if self._registradores:
+            self._registrar("reponer", {ing.lower(): cant_dev for ing, cant_dev in ingredientes_devueltos.items()})
+        self._notificar(actualizados=[ing.lower() for ing in ingredientes_devueltos])
+
+    def _demanda_total(self, lineas):
+        """Suma en una pasada lo que piden las líneas (ingredientes_requeridos, cantidad) de un pedido."""
+        demanda = {}
+        for ingredientes_requeridos, cantidad in lineas:
+            for ing, cant_req in ingredientes_requeridos.items():
+                ing_nombre = ing.lower()
+                demanda[ing_nombre] = demanda.get(ing_nombre, 0) + cant_req * cantidad
+        return demanda
+
+    @medido
+    def reservar(self, lineas):
+        """
+        Descuenta de una vez todo lo que pide un pedido de varias líneas.
+        Si falta cualquier ingrediente no descuenta nada y devuelve False.
+        """
+        demanda = self._demanda_total(lineas)
+        ingredientes = self.ingredientes
+        for ing_nombre, cant_req in demanda.items():
+            if ing_nombre not in ingredientes or ingredientes[ing_nombre].cantidad < cant_req:
+                return False
+        for ing_nombre, cant_req in demanda.items():
+            ingredientes[ing_nombre].cantidad -= cant_req
+        if self._registradores:
+            self._registrar("descontar", demanda)
+        self._notificar(actualizados=list(demanda))
+        return True
+
+    @medido
+    def liberar(self, lineas):
+        """Devuelve al stock, de una vez, todo lo reservado por las líneas de un pedido."""
+        demanda = self._demanda_total(lineas)
+        for ing_nombre, cant_dev in demanda.items():
+            self.ingredientes[ing_nombre].cantidad += cant_dev
+        if self._registradores:
+            self._registrar("reponer", demanda)
+        self._notificar(actualizados=list(demanda))
@@ -0,0 +1,181 @@
+# TablaVirtual.py
+import tkinter as tk
+from tkinter import ttk
+
+FILAS_POR_RUEDA = 3
+FLECHAS = {False: " ▲", True: " ▼"}
+
+
+class TablaVirtual:
+    """
+    ttk.Treeview que solo tiene las filas que caben en pantalla. Al desplazarse se reutilizan
+    esas mismas filas con los valores de otra ventana de la fuente (ver FuentesTabla), así el
+    costo de dibujar, desplazar o borrar no depende de cuántas filas tenga la fuente.
+    La selección se guarda por clave, no por fila del widget, para que sobreviva al desplazamiento.
+    """
+    def __init__(self, parent, fuente=None, scrollbar=None, anchos=None):
+        self.fuente = None
+        self.inicio = 0           # posición de la fuente que se muestra en la primera fila
+        self.seleccionada = None  # clave de la fila seleccionada
+        self._filas = []          # ids de las filas del widget que se reutilizan
+        self._visibles = 0        # cuántas de _filas están colgadas del árbol
+        self._pendiente = False
+        self.tree = ttk.Treeview(parent, columns=(), show="headings", selectmode="browse")
+        self.scrollbar = scrollbar if scrollbar is not None else ttk.Scrollbar(parent, orient="vertical")
+        self.scrollbar.configure(command=self._al_desplazar)
+        self.anchos = anchos or {}
+        self.tree.bind("<Configure>", lambda event: self._ajustar_filas())
+        self.tree.bind("<<TreeviewSelect>>", self._al_seleccionar)
+        self.tree.bind("<MouseWheel>", self._al_girar_rueda)
+        self.tree.bind("<Button-4>", lambda event: self.desplazar(-FILAS_POR_RUEDA) or "break")
+        self.tree.bind("<Button-5>", lambda event: self.desplazar(FILAS_POR_RUEDA) or "break")
+        self.tree.bind("<Up>", lambda event: self._mover_seleccion(-1))
+        self.tree.bind("<Down>", lambda event: self._mover_seleccion(1))
+        self.tree.bind("<Prior>", lambda event: self._mover_seleccion(-max(1, len(self._filas) - 1)))
+        self.tree.bind("<Next>", lambda event: self._mover_seleccion(max(1, len(self._filas) - 1)))
+        self.cambiar_fuente(fuente)
+
+    def pack(self, **opciones):
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True, **opciones)
+
+    def cambiar_fuente(self, fuente):
+        """Muestra otra fuente (o ninguna, con None) desde la primera fila."""
+        self.fuente, self.inicio, self.seleccionada = fuente, 0, None
+        columnas = [id_columna for id_columna, _ in fuente.columnas] if fuente is not None else []
+        self.tree.delete(*self._filas)
+        self._filas, self._visibles = [], 0
+        self.tree.configure(columns=columnas)
+        for numero, (id_columna, titulo) in enumerate(fuente.columnas if fuente is not None else ()):
+            self.tree.heading(id_columna, text=titulo, command=lambda n=numero: self.ordenar(n))
+            if id_columna in self.anchos:
+                self.tree.column(id_columna, width=self.anchos[id_columna], anchor=tk.CENTER)
+        if fuente is not None:
+            fuente.suscribir(lambda: self._programar_dibujo(fuente))
+        self._ajustar_filas()
+
+    # --- Dibujo ---
+
+    def _capacidad(self):
+        alto_fila = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        # Se descuenta una fila por los encabezados
+        return max(1, self.tree.winfo_height() // alto_fila - 1)
+
+    def _ajustar_filas(self):
+        capacidad = self._capacidad()
+        while len(self._filas) < capacidad:
+            fila = self.tree.insert("", "end", values=())
+            self.tree.detach(fila)  # _dibujar la cuelga en su lugar si hay datos para mostrar
+            self._filas.append(fila)
+        if len(self._filas) > capacidad:
+            self.tree.delete(*self._filas[capacidad:])
+            self._visibles = min(self._visibles, capacidad)
+            del self._filas[capacidad:]
+        self._dibujar()
+
+    def _programar_dibujo(self, fuente):
+        # Varios eventos seguidos de la fuente se dibujan una sola vez cuando tkinter queda libre
+        if fuente is self.fuente and not self._pendiente:
+            self._pendiente = True
+            self.tree.after_idle(self._dibujar)
+
+    def _dibujar(self):
+        self._pendiente = False
+        total = len(self.fuente) if self.fuente is not None else 0
+        capacidad = len(self._filas)
+        self.inicio = max(0, min(self.inicio, total - capacidad))
+        mostradas = min(capacidad, total - self.inicio)
+        # Las filas que sobran se descuelgan del árbol (no se borran) para volver a usarlas
+        for fila in self._filas[mostradas:self._visibles]:
+            self.tree.detach(fila)
+        for posicion in range(self._visibles, mostradas):
+            self.tree.move(self._filas[posicion], "", posicion)
+        self._visibles = mostradas
+        seleccion = ()
+        for posicion in range(mostradas):
+            clave = self.fuente.clave(self.inicio + posicion)
+            self.tree.item(self._filas[posicion], values=self.fuente.valores(clave))
+            if clave == self.seleccionada:
+                seleccion = (self._filas[posicion],)
+        if tuple(self.tree.selection()) != seleccion:
+            self.tree.selection_set(seleccion)
+        self._actualizar_encabezados()
+        if total:
+            self.scrollbar.set(self.inicio / total, (self.inicio + mostradas) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _actualizar_encabezados(self):
+        if self.fuente is None:
+            return
+        columna_orden, descendente = self.fuente.orden
+        for numero, (id_columna, titulo) in enumerate(self.fuente.columnas):
+            self.tree.heading(id_columna, text=titulo + (FLECHAS[descendente] if numero == columna_orden else ""))
+
+    # --- Desplazamiento ---
+
+    def desplazar(self, filas):
+        self.inicio += filas
+        self._dibujar()
+
+    def _al_desplazar(self, accion, cantidad, unidad=None):
+        total = len(self.fuente) if self.fuente is not None else 0
+        if accion == "moveto":
+            self.inicio = int(float(cantidad) * total)
+            self._dibujar()
+        elif accion == "scroll":
+            paso = len(self._filas) if unidad == "pages" else 1
+            self.desplazar(int(cantidad) * paso)
+
+    def _al_girar_rueda(self, event):
+        self.desplazar(-FILAS_POR_RUEDA if event.delta > 0 else FILAS_POR_RUEDA)
+        return "break"
+
+    def ir_a(self, posicion):
+        """Desplaza lo justo para que la fila de esa posición quede visible."""
+        if posicion < self.inicio:
+            self.inicio = posicion
+        elif posicion >= self.inicio + len(self._filas):
+            self.inicio = posicion - len(self._filas) + 1
+        self._dibujar()
+
+    # --- Selección, orden y filtro ---
+
+    def _al_seleccionar(self, event):
+        seleccion = self.tree.selection()
+        if seleccion and seleccion[0] in self._filas[:self._visibles]:
+            self.seleccionada = self.fuente.clave(self.inicio + self._filas.index(seleccion[0]))
+
+    def _mover_seleccion(self, filas):
+        if self.fuente is None or not len(self.fuente):
+            return "break"
+        actual = self.fuente.posicion(self.seleccionada) if self.seleccionada is not None else None
+        destino = 0 if actual is None else max(0, min(len(self.fuente) - 1, actual + filas))
+        self.seleccionada = self.fuente.clave(destino)
+        self.ir_a(destino)
+        return "break"
+
+    def seleccion(self):
+        """Clave de la fila seleccionada, o None si no hay ninguna (o ya no existe)."""
+        if self.seleccionada is None or self.fuente is None or self.fuente.posicion(self.seleccionada) is None:
+            return None
+        return self.seleccionada
+
+    def ordenar(self, columna):
+        if self.fuente is not None:
+            self.fuente.ordenar(columna)
+            self._seguir_seleccion()
+
+    def filtrar(self, prefijo):
+        if self.fuente is not None:
+            self.fuente.filtrar(prefijo)
+            self.inicio = 0
+            self._seguir_seleccion()
+
+    def _seguir_seleccion(self):
+        posicion = self.fuente.posicion(self.seleccionada) if self.seleccionada is not None else None
+        if posicion is None:
+            self.inicio = 0
+            self._dibujar()
+        else:
+            self.ir_a(posicion)
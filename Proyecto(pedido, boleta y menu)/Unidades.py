@@ -0,0 +1,33 @@
+# Unidades.py
+from decimal import Decimal, InvalidOperation, ROUND_HALF_EVEN
+
+# Toda cantidad se guarda como un entero en su unidad base: gramos, centímetros cúbicos o unidades.
+# unidad (en minúscula) -> (unidad base, factor de conversión)
+CONVERSIONES = {
+    "g": ("g", 1), "gr": ("g", 1), "gramo": ("g", 1), "gramos": ("g", 1),
+    "kg": ("g", 1000), "kilo": ("g", 1000), "kilos": ("g", 1000),
+    "cc": ("cc", 1), "ml": ("cc", 1),
+    "l": ("cc", 1000), "lt": ("cc", 1000), "litro": ("cc", 1000), "litros": ("cc", 1000),
+    "unid": ("unid", 1), "unidad": ("unid", 1), "unidades": ("unid", 1), "u": ("unid", 1),
+    "porcion": ("unid", 1), "porciones": ("unid", 1),
+}
+
+
+def normalizar_unidad(unidad):
+    """Devuelve (unidad base, factor) o lanza ValueError si la unidad no está en la tabla."""
+    conversion = CONVERSIONES.get(str(unidad).strip().lower())
+    if conversion is None:
+        raise ValueError(f"unidad desconocida '{unidad}' (se aceptan: {', '.join(CONVERSIONES)})")
+    return conversion
+
+
+def a_unidad_base(cantidad, unidad):
+    """Convierte una cantidad (número o texto) a (unidad base, entero en esa unidad), redondeando a la unidad base."""
+    unidad_base, factor = normalizar_unidad(unidad)
+    try:
+        valor = Decimal(str(cantidad).strip())
+    except InvalidOperation:
+        raise ValueError(f"cantidad inválida '{cantidad}'")
+    if not valor.is_finite():
+        raise ValueError(f"cantidad inválida '{cantidad}'")
+    return unidad_base, int((valor * factor).to_integral_value(rounding=ROUND_HALF_EVEN))
@@ -0,0 +1,236 @@
+# Ventas.py
+import hashlib
+import json
+import os
+
+import numpy as np
+
+HORAS = 24
+PEDIDOS_PARA_GUARDAR = 1000  # la caché en disco se reescribe solo cuando llegan al menos estos pedidos
+BYTES_FIRMA = 4096  # bytes del comienzo y del final de lo ya leído que identifican al registro
+
+
+def _a_segundos(fecha):
+    """datetime, date o texto ISO -> segundos (int) en la misma hora local con que se registró el pedido."""
+    if fecha is None:
+        return None
+    if not isinstance(fecha, str):
+        fecha = fecha.isoformat()
+    return int(np.datetime64(fecha, "s").astype(np.int64))
+
+
+def _firma(ruta, posicion):
+    """
+    Resumen del comienzo y del final de los primeros `posicion` bytes del registro. Si el archivo se
+    rota o se reemplaza, cambia aunque el nuevo tenga el mismo tamaño; agregar pedidos no la cambia.
+    """
+    resumen = hashlib.blake2b(digest_size=16)
+    with open(ruta, "rb") as f:
+        resumen.update(f.read(min(posicion, BYTES_FIRMA)))
+        f.seek(max(0, posicion - BYTES_FIRMA))
+        resumen.update(f.read(min(posicion, BYTES_FIRMA)))
+    return resumen.hexdigest()
+
+
+def desglose_iva_columnas(totales):
+    """Igual que Boleta.desglose_iva, pero sobre un arreglo de totales: devuelve (subtotales, ivas)."""
+    # np.rint redondea al par igual que round(), así cada boleta se separa igual que al imprimirla
+    subtotales = np.rint(totales / 1.19).astype(np.int64)
+    return subtotales, totales - subtotales
+
+
+class AnalisisVentas:
+    """
+    Carga el historial de RegistroPedidos en columnas de NumPy (una fila por pedido y una por línea)
+    para agregar ventas por plato, por hora, IVA y consumo de ingredientes sin recorrer el JSON.
+    Las columnas se guardan junto al registro con la posición hasta donde se leyó y una firma de
+    esos bytes, así al actualizar solo se procesan los pedidos nuevos y un registro rotado se relee.
+    """
+    def __init__(self, registro, usar_cache=True):
+        self.registro = registro
+        self.ruta_cache = os.path.splitext(registro.ruta)[0] + "_columnas.npz" if usar_cache else None
+        self._vaciar()
+        if self.ruta_cache:
+            self._leer_cache()
+
+    def _vaciar(self):
+        self.platos = []             # indice -> nombre del plato
+        self._indice_platos = {}     # nombre -> indice
+        self._posicion = 0           # bytes del registro ya convertidos a columnas
+        self._firma = ""             # _firma() de esos bytes
+        # Columnas por pedido
+        self.fechas = np.zeros(0, dtype=np.int64)     # segundos desde 1970, hora local
+        self.totales = np.zeros(0, dtype=np.int64)
+        # Columnas por línea
+        self.linea_pedido = np.zeros(0, dtype=np.int64)
+        self.linea_plato = np.zeros(0, dtype=np.int32)
+        self.linea_cantidad = np.zeros(0, dtype=np.int64)
+        self.linea_precio = np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.totales)
+
+    def _leer_cache(self):
+        if not os.path.exists(self.ruta_cache):
+            return
+        try:
+            with np.load(self.ruta_cache) as datos:
+                posicion, firma = int(datos["posicion"]), str(datos["firma"])
+                if not self._mismo_registro(posicion, firma):
+                    return  # el registro se rotó o se reemplazó: se vuelve a leer completo
+                self.platos = [str(nombre) for nombre in datos["platos"]]
+                self.fechas, self.totales = datos["fechas"], datos["totales"]
+                self.linea_pedido, self.linea_plato = datos["linea_pedido"], datos["linea_plato"]
+                self.linea_cantidad, self.linea_precio = datos["linea_cantidad"], datos["linea_precio"]
+                self._posicion, self._firma = posicion, firma
+        except (OSError, KeyError, ValueError):
+            self._vaciar()
+            return
+        self._indice_platos = {nombre: i for i, nombre in enumerate(self.platos)}
+
+    def _guardar_cache(self):
+        temporal = self.ruta_cache + ".tmp"
+        with open(temporal, "wb") as f:
+            np.savez(f, posicion=np.int64(self._posicion), firma=np.array(self._firma),
+                     platos=np.array(self.platos, dtype=str),
+                     fechas=self.fechas, totales=self.totales,
+                     linea_pedido=self.linea_pedido, linea_plato=self.linea_plato,
+                     linea_cantidad=self.linea_cantidad, linea_precio=self.linea_precio)
+        os.replace(temporal, self.ruta_cache)
+
+    def _mismo_registro(self, posicion, firma):
+        """True si el registro actual todavía empieza con los `posicion` bytes ya leídos."""
+        ruta = self.registro.ruta
+        if not os.path.exists(ruta) or os.path.getsize(ruta) < posicion:
+            return False
+        return posicion == 0 or _firma(ruta, posicion) == firma
+
+    def _indice_plato(self, nombre):
+        indice = self._indice_platos.get(nombre)
+        if indice is None:
+            indice = self._indice_platos[nombre] = len(self.platos)
+            self.platos.append(nombre)
+        return indice
+
+    def actualizar(self):
+        """Convierte a columnas los pedidos registrados desde la última vez; devuelve cuántos se agregaron."""
+        ruta = self.registro.ruta
+        if not os.path.exists(ruta):
+            return 0
+        if not self._mismo_registro(self._posicion, self._firma):
+            self._vaciar()
+        fechas, totales = [], []
+        linea_pedido, linea_plato, linea_cantidad, linea_precio = [], [], [], []
+        pedido = len(self.totales)
+        inicio = self._posicion
+        with open(ruta, "rb") as f:
+            f.seek(inicio)
+            for linea in f:
+                if not linea.endswith(b"\n"):
+                    break  # pedido a medio escribir: se lee en la próxima actualización
+                self._posicion += len(linea)
+                try:
+                    registro = json.loads(linea)
+                except ValueError:
+                    continue
+                fechas.append(registro["fecha"])
+                totales.append(registro["total"])
+                for nombre, cantidad, precio_unit in registro["lineas"]:
+                    linea_pedido.append(pedido)
+                    linea_plato.append(self._indice_plato(nombre))
+                    linea_cantidad.append(cantidad)
+                    linea_precio.append(precio_unit)
+                pedido += 1
+        if self._posicion != inicio:
+            self._firma = _firma(ruta, self._posicion)
+        if not totales:
+            return 0
+        self.fechas = np.concatenate((self.fechas, np.array(fechas, dtype="datetime64[s]").astype(np.int64)))
+        self.totales = np.concatenate((self.totales, np.array(totales, dtype=np.int64)))
+        self.linea_pedido = np.concatenate((self.linea_pedido, np.array(linea_pedido, dtype=np.int64)))
+        self.linea_plato = np.concatenate((self.linea_plato, np.array(linea_plato, dtype=np.int32)))
+        self.linea_cantidad = np.concatenate((self.linea_cantidad, np.array(linea_cantidad, dtype=np.int64)))
+        self.linea_precio = np.concatenate((self.linea_precio, np.array(linea_precio, dtype=np.int64)))
+        if self.ruta_cache and len(totales) >= PEDIDOS_PARA_GUARDAR:
+            self._guardar_cache()
+        return len(totales)
+
+    def guardar(self):
+        """Escribe la caché de columnas aunque haya pocos pedidos nuevos (por ejemplo, al cerrar)."""
+        if self.ruta_cache and len(self.totales):
+            self._guardar_cache()
+
+    # --- Consultas (desde/hasta aceptan datetime, date o texto ISO; hasta es exclusivo) ---
+
+    def _mascara_pedidos(self, desde, hasta):
+        mascara = np.ones(len(self.totales), dtype=bool)
+        if desde is not None:
+            mascara &= self.fechas >= _a_segundos(desde)
+        if hasta is not None:
+            mascara &= self.fechas < _a_segundos(hasta)
+        return mascara
+
+    def _lineas(self, desde, hasta):
+        """(plato, cantidad, importe, pedido) de las líneas dentro del rango."""
+        plato, cantidad, precio, pedido = self.linea_plato, self.linea_cantidad, self.linea_precio, self.linea_pedido
+        if desde is not None or hasta is not None:
+            en_rango = self._mascara_pedidos(desde, hasta)[pedido]
+            plato, cantidad, precio, pedido = plato[en_rango], cantidad[en_rango], precio[en_rango], pedido[en_rango]
+        return plato, cantidad, cantidad * precio, pedido
+
+    def resumen(self, desde=None, hasta=None):
+        """Totales del rango; el IVA se separa boleta por boleta, como en BoletaPDF.generar."""
+        totales = self.totales[self._mascara_pedidos(desde, hasta)]
+        subtotales, ivas = desglose_iva_columnas(totales)
+        _, cantidad, _, _ = self._lineas(desde, hasta)
+        return {
+            'pedidos': int(len(totales)),
+            'unidades': int(cantidad.sum()),
+            'total': int(totales.sum()),
+            'subtotal': int(subtotales.sum()),
+            'iva': int(ivas.sum()),
+            'ticket_promedio': int(round(totales.mean())) if len(totales) else 0,
+        }
+
+    def por_plato(self, desde=None, hasta=None):
+        """[(nombre, unidades, total)] ordenado de más a menos vendido."""
+        plato, cantidad, importe, _ = self._lineas(desde, hasta)
+        unidades = np.bincount(plato, weights=cantidad, minlength=len(self.platos))
+        ingresos = np.bincount(plato, weights=importe, minlength=len(self.platos))
+        orden = np.lexsort((-ingresos, -unidades))
+        return [(self.platos[i], int(unidades[i]), int(ingresos[i])) for i in orden if unidades[i]]
+
+    def por_hora(self, desde=None, hasta=None):
+        """
+        Unidades vendidas de cada plato según la hora del día: devuelve (platos, matriz), donde
+        matriz[i, h] son las unidades del plato platos[i] vendidas entre las h:00 y las h:59.
+        """
+        plato, cantidad, _, pedido = self._lineas(desde, hasta)
+        hora = (self.fechas[pedido] // 3600) % HORAS
+        matriz = np.bincount(plato.astype(np.int64) * HORAS + hora, weights=cantidad,
+                             minlength=len(self.platos) * HORAS).reshape(len(self.platos), HORAS)
+        return list(self.platos), matriz.astype(np.int64)
+
+    def consumo_ingredientes(self, menu, desde=None, hasta=None):
+        """
+        Ingredientes gastados según las recetas actuales del menú: [(ingrediente, unidad, cantidad)]
+        en unidad base, de mayor a menor. Los platos que ya no están en el menú no suman consumo.
+        """
+        plato, cantidad, _, _ = self._lineas(desde, hasta)
+        unidades = np.bincount(plato, weights=cantidad, minlength=len(self.platos)).astype(np.int64)
+        indice_ing = {}
+        filas, columnas, requeridos = [], [], []
+        for i_plato, nombre in enumerate(self.platos):
+            info = menu.get_item(nombre)
+            if info is None:
+                continue
+            for ing, cant_req in info['ingredientes'].items():
+                filas.append(i_plato)
+                columnas.append(indice_ing.setdefault(ing.lower(), len(indice_ing)))
+                requeridos.append(cant_req)
+        recetas = np.zeros((len(self.platos), len(indice_ing)), dtype=np.int64)
+        np.add.at(recetas, (np.array(filas, dtype=np.int64), np.array(columnas, dtype=np.int64)), requeridos)
+        consumo = unidades @ recetas
+        nombres = list(indice_ing)
+        return [(nombres[j], menu.unidad_ingrediente(nombres[j]), int(consumo[j]))
+                for j in np.argsort(-consumo, kind="stable") if consumo[j]]
@@ -0,0 +1,55 @@
+# bench_boleta_termica.py
+# Compara la latencia por boleta de los formatos de Boleta.py: PDF A4 (FPDF) contra el ticket de 80 mm
+# en ESC/POS y en texto, a memoria (solo armar los bytes) y a archivo.
+# Uso: python bench/bench_boleta_termica.py --boletas 500
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Boleta import renderizador
+from Menu import Menu
+from datos_sinteticos import crear_pedidos
+
+
+def medir(nombre, pedidos, funcion):
+    latencias = []
+    for i, pedido in enumerate(pedidos):
+        inicio = time.perf_counter()
+        funcion(i, pedido)
+        latencias.append(time.perf_counter() - inicio)
+    latencias.sort()
+    p50 = latencias[len(latencias) // 2] * 1e6
+    p99 = latencias[min(len(latencias) - 1, len(latencias) * 99 // 100)] * 1e6
+    print(f"{nombre:<28} p50 {p50:>10.1f} us   p99 {p99:>10.1f} us   {len(latencias) / sum(latencias):>10,.0f} boletas/s")
+    return p50
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencia por boleta: PDF contra ticket térmico.")
+    parser.add_argument("--boletas", type=int, default=500)
+    args = parser.parse_args()
+
+    pedidos = crear_pedidos(Menu(), args.boletas)
+    termica, texto = renderizador("termica"), renderizador("texto")
+    resultados = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        resultados["termica"] = medir("térmica ESC/POS, memoria", pedidos, lambda i, p: termica.generar(p, io.BytesIO()))
+        medir("térmica ESC/POS, archivo", pedidos, lambda i, p: termica.generar(p, os.path.join(tmp, f"t_{i}.bin")))
+        medir("texto, archivo", pedidos, lambda i, p: texto.generar(p, os.path.join(tmp, f"t_{i}.txt")))
+        try:
+            pdf = renderizador("pdf")
+            resultados["pdf"] = medir("PDF A4, memoria", pedidos, lambda i, p: pdf.generar(p, io.BytesIO()))
+            medir("PDF A4, archivo", pedidos, lambda i, p: pdf.generar(p, os.path.join(tmp, f"b_{i}.pdf")))
+        except ImportError as e:
+            print(f"PDF omitido: falta {e.name}")
+    if "pdf" in resultados:
+        print(f"el ticket térmico es {resultados['pdf'] / resultados['termica']:,.0f} veces más rápido (p50, en memoria)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# bench_boletas.py
+# Compara boletas/s del camino actual (un BoletaPDF por pedido) contra Boleta.generar_lote.
+# Uso: python bench/bench_boletas.py --boletas 2000
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Boleta import BoletaPDF, generar_lote
+from Menu import Menu
+from datos_sinteticos import crear_pedidos
+
+
+def medir(nombre, cantidad, funcion):
+    inicio = time.perf_counter()
+    funcion()
+    duracion = time.perf_counter() - inicio
+    print(f"{nombre:<32} {duracion:>8.2f} s  {cantidad / duracion:>9,.0f} boletas/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de generación de boletas en PDF.")
+    parser.add_argument("--boletas", type=int, default=2000)
+    args = parser.parse_args()
+
+    pedidos = crear_pedidos(Menu(), args.boletas)
+    with tempfile.TemporaryDirectory() as tmp:
+        def uno_por_boleta():
+            for i, pedido in enumerate(pedidos):
+                BoletaPDF(pedido).generar(os.path.join(tmp, f"actual_{i}.pdf"))
+
+        medir("BoletaPDF por pedido", len(pedidos), uno_por_boleta)
+        medir("lote, un solo PDF", len(pedidos), lambda: generar_lote(pedidos, os.path.join(tmp, "lote.pdf")))
+        medir("lote, directorio (1 proceso)", len(pedidos), lambda: generar_lote(pedidos, os.path.join(tmp, "dir1"), un_solo_archivo=False, procesos=1))
+        medir("lote, directorio (procesos)", len(pedidos), lambda: generar_lote(pedidos, os.path.join(tmp, "dirN"), un_solo_archivo=False, procesos=os.cpu_count()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# bench_memoria.py
+# Mide con tracemalloc la memoria de 1M líneas de pedido y 100k ingredientes,
+# comparando la representación compacta actual con la anterior (un dict por línea, clase con __dict__).
+# Uso: python bench/bench_memoria.py
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Ingrediente import Ingrediente
+from Menu import Menu
+from Pedido import Pedido
+from Stock import Stock
+
+LINEAS = 1_000_000
+INGREDIENTES = 100_000
+
+
+class IngredienteAnterior:
+    def __init__(self, nombre, unidad, cantidad):
+        self.nombre = nombre
+        self.unidad = unidad
+        self.cantidad = float(cantidad)
+
+
+def lineas_anteriores(menu, platos, cantidad):
+    items = []
+    for i in range(cantidad):
+        nombre = platos[i % len(platos)]
+        info = menu.get_item(nombre)
+        items.append({'id': i + 1, 'nombre': nombre, 'precio': info['precio'], 'ingredientes': info['ingredientes']})
+    return items
+
+
+def lineas_actuales(menu, platos, cantidad):
+    pedido = Pedido()
+    for i in range(cantidad):
+        nombre = platos[i % len(platos)]
+        pedido.agregar_item(menu.get_item(nombre), nombre)
+    return pedido
+
+
+def stock_anterior(cantidad):
+    return {f"ingrediente {i}": IngredienteAnterior(f"Ingrediente {i}", "unid", i) for i in range(cantidad)}
+
+
+def stock_actual(cantidad):
+    stock = Stock()
+    stock.agregar_ingredientes(Ingrediente(f"Ingrediente {i}", "unid", i) for i in range(cantidad))
+    return stock
+
+
+def medir(funcion, *args):
+    tracemalloc.start()
+    resultado = funcion(*args)
+    actual, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resultado
+    return actual, pico
+
+
+def main():
+    menu = Menu()
+    platos = list(menu.get_items())
+    casos = [
+        (f"{LINEAS:,} líneas, dict por línea", lineas_anteriores, menu, platos, LINEAS),
+        (f"{LINEAS:,} líneas, Pedido compacto", lineas_actuales, menu, platos, LINEAS),
+        (f"{INGREDIENTES:,} ingredientes, con __dict__", stock_anterior, INGREDIENTES),
+        (f"{INGREDIENTES:,} ingredientes, Stock actual", stock_actual, INGREDIENTES),
+    ]
+    print(f"{'caso':<40} {'retenido':>12} {'pico':>12}")
+    for nombre, funcion, *args in casos:
+        actual, pico = medir(funcion, *args)
+        print(f"{nombre:<40} {actual / 2**20:>9.1f} MB {pico / 2**20:>9.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# bench_persistencia.py
+# Mide el costo de anotar cada cambio del stock en el diario y el tiempo de recuperación al iniciar.
+# Uso: python bench/bench_persistencia.py
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Ingrediente import Ingrediente
+from Persistencia import DiarioStock
+from Stock import Stock
+
+MUTACIONES = 100_000
+ENTRADAS_RECUPERACION = (1_000, 10_000, 100_000, 1_000_000)
+RECETA = {"pan de completo": 1, "vienesa": 1, "tomate": 1, "palta": 1}
+
+
+def crear_stock():
+    stock = Stock()
+    stock.agregar_ingredientes(Ingrediente(nombre, "unid", 10 ** 9) for nombre in RECETA)
+    return stock
+
+
+def medir_mutaciones(stock, cantidad):
+    inicio = time.perf_counter()
+    for i in range(cantidad):
+        if i % 2:
+            stock.reponer_ingredientes(RECETA)
+        else:
+            stock.descontar_ingredientes(RECETA)
+    return cantidad / (time.perf_counter() - inicio)
+
+
+def main():
+    print("--- Mutaciones por segundo (descontar/reponer) ---")
+    print(f"{'en memoria':<24} {medir_mutaciones(crear_stock(), MUTACIONES):>12,.0f}")
+    for sincronizar, cantidad in ((False, MUTACIONES), (True, MUTACIONES // 100)):
+        with tempfile.TemporaryDirectory() as tmp:
+            stock = crear_stock()
+            diario = DiarioStock(tmp, entradas_por_snapshot=10 ** 9, sincronizar=sincronizar)
+            diario.adjuntar(stock)
+            nombre = "diario + fsync" if sincronizar else "diario"
+            print(f"{nombre:<24} {medir_mutaciones(stock, cantidad):>12,.0f}")
+            diario.cerrar()
+
+    print("--- Recuperación al iniciar ---")
+    for entradas in ENTRADAS_RECUPERACION:
+        with tempfile.TemporaryDirectory() as tmp:
+            diario = DiarioStock(tmp, entradas_por_snapshot=10 ** 9)
+            crear = Stock()
+            diario.adjuntar(crear)
+            crear.agregar_ingredientes(Ingrediente(nombre, "unid", 10 ** 9) for nombre in RECETA)
+            for _ in range(entradas - 1):
+                crear.descontar_ingredientes(RECETA)
+            diario.cerrar()
+
+            inicio = time.perf_counter()
+            recuperado = Stock()
+            aplicadas, _ = DiarioStock(tmp).recuperar(recuperado)
+            duracion = time.perf_counter() - inicio
+            assert recuperado.ingredientes["tomate"].cantidad == crear.ingredientes["tomate"].cantidad
+            print(f"{aplicadas:>10,} entradas  {duracion * 1000:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
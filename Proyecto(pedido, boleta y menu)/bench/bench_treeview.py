@@ -0,0 +1,119 @@
+# bench_treeview.py
+# Compara un ttk.Treeview con todas las filas contra TablaVirtual, que solo dibuja las visibles,
+# y el costo de un cambio de stock redibujando todo contra la actualización incremental.
+# Uso: python bench/bench_treeview.py  (la parte del widget necesita tkinter y un display;
+#      los índices de FuentesTabla se miden siempre)
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FuentesTabla import FuenteCSV, FuenteStock
+from Ingrediente import Ingrediente
+from Stock import Stock
+
+TAMANOS = (1_000, 10_000, 100_000, 1_000_000)
+TAMANO_MAXIMO_TREEVIEW = 100_000  # más filas en un Treeview común tarda minutos
+RECETA = {"ingrediente 1": 1, "ingrediente 2": 1, "ingrediente 3": 1}  # un cambio típico: un plato vendido
+
+
+def valores_fila(ing):
+    return (ing.nombre, ing.unidad, ing.cantidad)
+
+
+def crear_stock(n):
+    stock = Stock()
+    stock.agregar_ingredientes(Ingrediente(f"Ingrediente {i}", "unid", i % 997) for i in range(n))
+    return stock
+
+
+def medir(funcion):
+    inicio = time.perf_counter()
+    funcion()
+    return (time.perf_counter() - inicio) * 1000
+
+
+def medir_fuentes(n, directorio):
+    stock = crear_stock(n)
+    resultados = {}
+    resultados["índice stock"] = medir(lambda: resultados.__setitem__("fuente", FuenteStock(stock, valores_fila)))
+    fuente = resultados.pop("fuente")
+    resultados["filtrar (prefijo)"] = medir(lambda: fuente.filtrar("ingrediente 42"))
+    fuente.filtrar("")
+    resultados["ordenar por cantidad"] = medir(lambda: fuente.ordenar(2))
+    claves = random.sample(list(stock.ingredientes), 100)
+    resultados["100 descuentos (ordenado)"] = medir(lambda: [stock.descontar_ingredientes({clave: 1}) for clave in claves])
+    # Un cambio: rehacer los índices completos contra mover solo las filas afectadas (lo que hace la suscripción)
+    resultados["1 cambio: índices completos"] = medir(lambda: (stock.descontar_ingredientes(RECETA), fuente.reconstruir()))
+    resultados["1 cambio: incremental"] = medir(lambda: stock.descontar_ingredientes(RECETA))
+    ruta = os.path.join(directorio, f"stock_{n}.csv")
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write("nombre,unidad,cantidad\n")
+        f.writelines(f"Ingrediente {i},unid,{i % 997}\n" for i in range(n))
+    resultados["abrir CSV"] = medir(lambda: resultados.__setitem__("csv", FuenteCSV(ruta)))
+    fuente_csv = resultados.pop("csv")
+    resultados["ventana de 30 filas CSV"] = medir(lambda: [fuente_csv.fila(i) for i in range(n - 30, n)])
+    fuente_csv.cerrar()
+    return stock, resultados
+
+
+def medir_widgets(root, stock):
+    from tkinter import ttk
+    from TablaVirtual import TablaVirtual
+    resultados = {}
+    n = len(stock.ingredientes)
+    if n <= TAMANO_MAXIMO_TREEVIEW:
+        tree = ttk.Treeview(root, columns=("nombre", "unidad", "cantidad"), show="headings")
+        tree.pack()
+
+        def llenar():
+            for ing in stock.ingredientes.values():
+                tree.insert("", "end", values=valores_fila(ing))
+            root.update()
+
+        resultados["Treeview: llenar"] = medir(llenar)
+
+        def redibujo_completo():
+            stock.descontar_ingredientes(RECETA)
+            tree.delete(*tree.get_children())
+            llenar()
+
+        resultados["Treeview: 1 cambio redibujando todo"] = medir(redibujo_completo)
+        resultados["Treeview: vaciar"] = medir(lambda: (tree.delete(*tree.get_children()), root.update()))
+        tree.destroy()
+    tabla = TablaVirtual(root, FuenteStock(stock, valores_fila))
+    tabla.pack()
+    resultados["TablaVirtual: crear"] = medir(root.update)
+    resultados["TablaVirtual: 1 cambio incremental"] = medir(lambda: (stock.descontar_ingredientes(RECETA), root.update()))
+    resultados["TablaVirtual: 100 desplazamientos"] = medir(lambda: [tabla._al_desplazar("moveto", random.random()) for _ in range(100)] and root.update())
+    resultados["TablaVirtual: filtrar"] = medir(lambda: (tabla.filtrar("ingrediente 42"), root.update()))
+    tabla.tree.destroy()
+    tabla.scrollbar.destroy()
+    return resultados
+
+
+def main():
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.geometry("600x600")
+    except Exception as e:  # sin tkinter o sin display
+        print(f"(sin tkinter: {e}; solo se miden los índices)")
+        root = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in TAMANOS:
+            stock, resultados = medir_fuentes(n, tmp)
+            if root is not None:
+                resultados.update(medir_widgets(root, stock))
+            print(f"--- {n:,} filas ---")
+            for nombre, ms in resultados.items():
+                print(f"{nombre:<36} {ms:>10.1f} ms")
+    if root is not None:
+        root.destroy()
+
+
+if __name__ == "__main__":
+    main()
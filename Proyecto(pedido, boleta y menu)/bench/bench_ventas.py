@@ -0,0 +1,74 @@
+# bench_ventas.py
+# Mide la carga del historial de pedidos a columnas y el tiempo de las consultas de Ventas.AnalisisVentas.
+# Uso: python bench/bench_ventas.py --pedidos 1000000
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Boleta import desglose_iva
+from Menu import Menu
+from Persistencia import RegistroPedidos
+from Ventas import AnalisisVentas
+
+
+def escribir_historial(registro, cantidad, semilla=1):
+    """Escribe pedidos sintéticos con el mismo formato que RegistroPedidos.registrar."""
+    menu = Menu()
+    rng = random.Random(semilla)
+    platos = list(menu.get_items())
+    fecha = datetime(2024, 1, 1, 12)
+    lineas = 0
+    with open(registro.ruta, "w", encoding="utf-8") as f:
+        for _ in range(cantidad):
+            fecha += timedelta(seconds=rng.randint(1, 120))
+            elegidos = rng.sample(platos, rng.randint(1, 4))
+            detalle = [[nombre, rng.randint(1, 3), menu.get_item(nombre)['precio']] for nombre in elegidos]
+            registro_json = {"fecha": fecha.isoformat(timespec="seconds"), "lineas": detalle,
+                             "total": sum(cantidad * precio for _, cantidad, precio in detalle)}
+            f.write(json.dumps(registro_json, ensure_ascii=False, separators=(",", ":")) + "\n")
+            lineas += len(detalle)
+    return lineas
+
+
+def medir(nombre, funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    print(f"{nombre:<36} {(time.perf_counter() - inicio) * 1000:>10.1f} ms")
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del análisis de ventas.")
+    parser.add_argument("--pedidos", type=int, default=1_000_000)
+    args = parser.parse_args()
+    menu = Menu()
+    with tempfile.TemporaryDirectory() as tmp:
+        registro = RegistroPedidos(tmp)
+        lineas = escribir_historial(registro, args.pedidos)
+        print(f"historial: {args.pedidos:,} pedidos, {lineas:,} líneas, {os.path.getsize(registro.ruta) / 2**20:.1f} MB")
+
+        analisis = AnalisisVentas(registro)
+        medir("primera carga (JSON -> columnas)", analisis.actualizar)
+        analisis = medir("reapertura desde la caché", lambda: AnalisisVentas(registro))
+        medir("actualizar sin pedidos nuevos", analisis.actualizar)
+        resumen = medir("resumen + IVA", analisis.resumen)
+        medir("ventas por plato", analisis.por_plato)
+        medir("ventas por plato y hora", analisis.por_hora)
+        medir("consumo de ingredientes", lambda: analisis.consumo_ingredientes(menu))
+        medir("por plato, un solo día", lambda: analisis.por_plato("2024-01-15", "2024-01-16"))
+
+        # El IVA por columnas debe cuadrar con desglose_iva aplicado boleta por boleta
+        subtotal = sum(desglose_iva(int(total))[0] for total in analisis.totales)
+        assert subtotal == resumen['subtotal'], (subtotal, resumen['subtotal'])
+        print(f"total ${resumen['total']:,}  subtotal ${resumen['subtotal']:,}  IVA ${resumen['iva']:,} (cuadra con desglose_iva)")
+
+
+if __name__ == "__main__":
+    main()
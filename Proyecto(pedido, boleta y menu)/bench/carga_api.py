@@ -0,0 +1,148 @@
+# carga_api.py
+# Prueba de carga de ServidorAPI: clientes concurrentes con conexiones keep-alive crean pedidos
+# y se mide la latencia (p50/p99) y cuántos pedidos por segundo acepta el servidor.
+# Uso: python bench/carga_api.py [--pedidos 20000] [--concurrencia 64] [--boletas 200] [--url http://host:puerto]
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Ingrediente import Ingrediente
+from Menu import Menu
+from ServidorAPI import ServidorAPI
+from Stock import Stock
+
+PEDIDOS = (
+    {"Completo": 2, "Pepsi": 1},
+    {"Hamburguesa": 1, "Papas fritas": 1},
+    {"Pollo frito": 3},
+    {"Completo": 1, "Papas fritas": 2, "Pepsi": 2},
+)
+
+
+def crear_stock(menu):
+    stock = Stock()
+    ingredientes = {}
+    for info in menu.get_items().values():
+        for nombre in info['ingredientes']:
+            ingredientes[nombre.lower()] = Ingrediente(nombre, menu.unidad_ingrediente(nombre), 10 ** 12)
+    stock.agregar_ingredientes(ingredientes.values())
+    return stock
+
+
+async def solicitud(reader, writer, metodo, ruta, datos=None):
+    cuerpo = json.dumps(datos).encode() if datos is not None else b""
+    writer.write(f"{metodo} {ruta} HTTP/1.1\r\nHost: x\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(cuerpo)}\r\n\r\n".encode() + cuerpo)
+    encabezado = await reader.readuntil(b"\r\n\r\n")
+    estado = int(encabezado.split(b" ", 2)[1])
+    largo = 0
+    for linea in encabezado.split(b"\r\n"):
+        if linea.lower().startswith(b"content-length:"):
+            largo = int(linea.split(b":", 1)[1])
+    respuesta = await reader.readexactly(largo)
+    return estado, respuesta
+
+
+async def cliente(host, puerto, cola, latencias, ids):
+    reader, writer = await asyncio.open_connection(host, puerto)
+    try:
+        while True:
+            try:
+                numero = cola.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            inicio = time.perf_counter()
+            estado, respuesta = await solicitud(reader, writer, "POST", "/pedidos", {"items": PEDIDOS[numero % len(PEDIDOS)]})
+            latencias.append(time.perf_counter() - inicio)
+            if estado != 201:
+                raise RuntimeError(f"POST /pedidos devolvió {estado}: {respuesta[:200]!r}")
+            ids.append(json.loads(respuesta)["id"])
+    finally:
+        writer.close()
+
+
+def percentil(valores, p):
+    return valores[min(len(valores) - 1, int(len(valores) * p / 100))]
+
+
+async def medir(host, puerto, pedidos, concurrencia):
+    cola = asyncio.Queue()
+    for numero in range(pedidos):
+        cola.put_nowait(numero)
+    latencias, ids = [], []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(host, puerto, cola, latencias, ids) for _ in range(concurrencia)))
+    duracion = time.perf_counter() - inicio
+    latencias.sort()
+    print(f"{pedidos} pedidos, {concurrencia} clientes: {pedidos / duracion:,.0f} pedidos/s, "
+          f"p50 {percentil(latencias, 50) * 1000:.2f} ms, p99 {percentil(latencias, 99) * 1000:.2f} ms")
+    return ids
+
+
+async def medir_boletas(host, puerto, ids):
+    """Cierra pedidos con boleta y espera a que la cola de PDF los termine todos."""
+    reader, writer = await asyncio.open_connection(host, puerto)
+    inicio = time.perf_counter()
+    trabajos = []
+    for id_pedido in ids:
+        estado, respuesta = await solicitud(reader, writer, "POST", f"/pedidos/{id_pedido}/boleta")
+        if estado != 202:
+            raise RuntimeError(f"POST boleta devolvió {estado}: {respuesta[:200]!r}")
+        trabajos.append(json.loads(respuesta)["trabajo"])
+    encolado = time.perf_counter() - inicio
+    for trabajo in trabajos:
+        while True:
+            _, respuesta = await solicitud(reader, writer, "GET", f"/boletas/{trabajo}")
+            estado = json.loads(respuesta)["estado"]
+            if estado != "pendiente":
+                break
+            await asyncio.sleep(0.01)
+        if estado != "lista":
+            raise RuntimeError(f"la boleta {trabajo} terminó con estado {estado}")
+    duracion = time.perf_counter() - inicio
+    writer.close()
+    print(f"{len(ids)} boletas: encoladas en {encolado * 1000:.0f} ms, generadas en {duracion:.2f} s "
+          f"({len(ids) / duracion:,.0f} boletas/s)")
+
+
+async def principal(args):
+    servidor = None
+    if args.url:
+        partes = urlsplit(args.url)
+        host, puerto = partes.hostname, partes.port or 80
+    else:
+        menu = Menu()
+        directorio = tempfile.mkdtemp(prefix="carga_api_")
+        servidor = ServidorAPI(crear_stock(menu), menu, directorio_boletas=directorio)
+        host, puerto = "127.0.0.1", await servidor.iniciar("127.0.0.1", 0)
+    try:
+        await medir(host, puerto, min(args.pedidos, 2000), args.concurrencia)  # calentamiento
+        ids = await medir(host, puerto, args.pedidos, args.concurrencia)
+        await medir(host, puerto, args.pedidos, 1)
+        if servidor is not None:
+            print(f"lotes de reserva: {servidor.lotes}, {servidor.pedidos_en_lotes / max(servidor.lotes, 1):.1f} pedidos por lote")
+        if args.boletas:
+            await medir_boletas(host, puerto, ids[:args.boletas])
+    finally:
+        if servidor is not None:
+            await servidor.cerrar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API de pedidos.")
+    parser.add_argument("--pedidos", type=int, default=20_000)
+    parser.add_argument("--concurrencia", type=int, default=64)
+    parser.add_argument("--boletas", type=int, default=200, help="cuántos pedidos cerrar con boleta (0 para omitir)")
+    parser.add_argument("--url", help="servidor ya levantado; si se omite se levanta uno local con stock de sobra")
+    asyncio.run(principal(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
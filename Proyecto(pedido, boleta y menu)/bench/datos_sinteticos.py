@@ -0,0 +1,71 @@
+# datos_sinteticos.py
+# Generadores de datos de prueba reproducibles (misma semilla, mismos datos) para los benchmarks.
+import csv
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Ingrediente import Ingrediente
+from Pedido import Pedido
+from Stock import Stock
+
+UNIDADES_CSV = ("kg", "g", "l", "cc", "unid")
+
+
+def nombres_ingredientes(cantidad):
+    return [f"Ingrediente {i:06d}" for i in range(cantidad)]
+
+
+def escribir_csv_ingredientes(ruta, cantidad, semilla=1, repetidos=0.05):
+    """
+    CSV nombre,unidad,cantidad como el que carga la aplicación. Cada ingrediente usa siempre la misma unidad
+    y una fracción 'repetidos' de las filas repite un nombre anterior (la carga debe sumarlas).
+    """
+    rng = random.Random(semilla)
+    nombres = nombres_ingredientes(cantidad)
+    unidades = [UNIDADES_CSV[i % len(UNIDADES_CSV)] for i in range(cantidad)]
+    with open(ruta, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["nombre", "unidad", "cantidad"])
+        for i in range(cantidad):
+            j = rng.randrange(i) if i and rng.random() < repetidos else i
+            unidad = unidades[j]
+            # Las unidades grandes se escriben con decimales, como en un CSV real
+            valor = f"{rng.uniform(0.5, 50):.3f}" if unidad in ("kg", "l") else rng.randint(1, 10_000)
+            writer.writerow([nombres[j], unidad, valor])
+    return ruta
+
+
+def crear_stock(menu=None, ingredientes=0, cantidad=10 ** 9):
+    """Stock con los ingredientes del menú (en la unidad de sus recetas) y otros 'ingredientes' sintéticos."""
+    stock = Stock()
+    nuevos = {}
+    if menu is not None:
+        for info in menu.get_items().values():
+            for nombre in info['ingredientes']:
+                nuevos[nombre.lower()] = Ingrediente(nombre, menu.unidad_ingrediente(nombre), cantidad)
+    for nombre in nombres_ingredientes(ingredientes):
+        nuevos[nombre.lower()] = Ingrediente(nombre, "unid", cantidad)
+    stock.agregar_ingredientes(nuevos.values())
+    return stock
+
+
+def crear_pedidos(menu, cantidad, semilla=1, max_items=12):
+    """Pedidos de 1 a max_items platos elegidos al azar de la carta."""
+    rng = random.Random(semilla)
+    platos = list(menu.get_items())
+    pedidos = []
+    for _ in range(cantidad):
+        pedido = Pedido()
+        for nombre in rng.choices(platos, k=rng.randint(1, max_items)):
+            pedido.agregar_item(menu.get_item(nombre), nombre)
+        pedidos.append(pedido)
+    return pedidos
+
+
+def items_carta(cantidad, semilla=1):
+    """Platos para MenuPDF ({"nombre", "precio"} con el precio ya formateado), como los arma la interfaz."""
+    rng = random.Random(semilla)
+    return [{"nombre": f"Plato {i:04d}", "precio": f"${rng.randrange(500, 15_000, 100)}"} for i in range(cantidad)]
@@ -0,0 +1,77 @@
+# stress_concurrencia.py
+# Simula muchas cajas vendiendo del mismo stock y verifica que nunca quede negativo.
+# Uso: python bench/stress_concurrencia.py --pedidos 5000 --hilos 8 [--sin-candados]
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Ingrediente import Ingrediente
+from Menu import Menu
+from ServicioStock import ServicioStock, lineas_de_pedido
+from Stock import Stock
+from datos_sinteticos import crear_pedidos
+
+
+def crear_stock(menu, cantidad_inicial):
+    stock = Stock()
+    nombres = {ing.lower() for info in menu.get_items().values() for ing in info['ingredientes']}
+    # Cada ingrediente en la unidad base en que lo piden las recetas (g para papas, tomate y palta)
+    stock.agregar_ingredientes(Ingrediente(nombre, menu.unidad_ingrediente(nombre), cantidad_inicial) for nombre in sorted(nombres))
+    return stock
+
+
+def reservar_sin_candados(stock, pedido):
+    # El camino antiguo: verificar y luego descontar, ítem por ítem, sin sincronización.
+    for item in pedido.get_items():
+        if not stock.verificar_stock_para_item(item['ingredientes']):
+            return False
+        time.sleep(0)  # cede el GIL entre verificar y descontar, como haría una caja real
+        stock.descontar_ingredientes(item['ingredientes'])
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de estrés de ventas concurrentes sobre un Stock compartido.")
+    parser.add_argument("--pedidos", type=int, default=5000)
+    parser.add_argument("--hilos", type=int, default=8)
+    parser.add_argument("--stock", type=float, default=2000, help="cantidad inicial de cada ingrediente, en su unidad base")
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--sin-candados", action="store_true", help="usa verificar+descontar sin ServicioStock")
+    args = parser.parse_args()
+
+    menu = Menu()
+    stock = crear_stock(menu, args.stock)
+    inicial = {nombre: ing.cantidad for nombre, ing in stock.ingredientes.items()}
+    pedidos = crear_pedidos(menu, args.pedidos, args.semilla)
+
+    inicio = time.perf_counter()
+    if args.sin_candados:
+        with ThreadPoolExecutor(max_workers=args.hilos) as executor:
+            resultados = list(executor.map(lambda p: reservar_sin_candados(stock, p), pedidos))
+    else:
+        resultados = ServicioStock(stock).procesar_pedidos(pedidos, max_hilos=args.hilos)
+    duracion = time.perf_counter() - inicio
+
+    aceptados = [pedido for pedido, ok in zip(pedidos, resultados) if ok]
+    negativos = {nombre: ing.cantidad for nombre, ing in stock.ingredientes.items() if ing.cantidad < 0}
+    esperado = dict(inicial)
+    for pedido in aceptados:
+        for ingredientes_requeridos, cantidad in lineas_de_pedido(pedido):
+            for ing, cant_req in ingredientes_requeridos.items():
+                esperado[ing.lower()] -= cant_req * cantidad
+    descuadres = {nombre: (esperado[nombre], ing.cantidad) for nombre, ing in stock.ingredientes.items() if esperado[nombre] != ing.cantidad}
+
+    print(f"pedidos: {len(pedidos)}  aceptados: {len(aceptados)}  rechazados: {len(pedidos) - len(aceptados)}")
+    print(f"hilos: {args.hilos}  tiempo: {duracion:.3f} s  pedidos/s: {len(pedidos) / duracion:,.0f}")
+    print(f"ingredientes negativos: {negativos or 'ninguno'}")
+    if not args.sin_candados:
+        print(f"descuadres contra lo aceptado: {descuadres or 'ninguno'}")
+    return 1 if negativos or (descuadres and not args.sin_candados) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+# suite.py
+# Mide el camino pedido -> boleta sin interfaz (no importa tkinter) con datos de datos_sinteticos.py:
+# carga del CSV al Stock, verificar/descontar, Pedido a escala, boleta (PDF y ticket) y MenuPDF por documento
+# y rasterización con fitz. Sirve para comparar antes y después de un cambio.
+# Uso: python bench/suite.py [--rapido] [--solo pedido,boleta] [--json resultados.json] [--perfil]
+#      --perfil activa Perfilado (RESTAURANTE_PERFIL) y agrega sus contadores al resultado.
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TAMANOS = {
+    "normal": {"filas_csv": 200_000, "operaciones": 500_000, "items": 1_000_000, "documentos": 200, "platos_carta": 40},
+    "rapido": {"filas_csv": 20_000, "operaciones": 50_000, "items": 100_000, "documentos": 20, "platos_carta": 40},
+}
+
+
+def medir(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return time.perf_counter() - inicio, resultado
+
+
+def bench_carga_csv(t, directorio):
+    from CargaCSV import cargar_csv_en_stock
+    from Stock import Stock
+    ruta = escribir_csv_ingredientes(os.path.join(directorio, "ingredientes.csv"), t["filas_csv"])
+    duracion, resultado = medir(lambda: cargar_csv_en_stock(Stock(), ruta))
+    if resultado.total_errores:
+        raise RuntimeError(f"la carga sintética tuvo {resultado.total_errores} errores")
+    yield "CSV -> Stock (por fila)", t["filas_csv"], duracion
+
+
+def bench_stock(t, directorio):
+    menu = Menu()
+    stock = crear_stock(menu, ingredientes=1000)
+    rng = random.Random(1)
+    recetas = [info['ingredientes'] for info in menu.get_items().values()]
+    elegidas = [rng.choice(recetas) for _ in range(t["operaciones"])]
+
+    def verificar():
+        for receta in elegidas:
+            stock.verificar_stock_para_item(receta)
+
+    def verificar_y_descontar():
+        for receta in elegidas:
+            if stock.verificar_stock_para_item(receta):
+                stock.descontar_ingredientes(receta)
+
+    yield "verificar_stock_para_item", len(elegidas), medir(verificar)[0]
+    yield "verificar + descontar", len(elegidas), medir(verificar_y_descontar)[0]
+    pedidos = crear_pedidos(menu, t["operaciones"] // 10)
+    lineas = [pedido.lineas_por_plato() for pedido in pedidos]
+
+    def reservar_y_liberar():
+        for lineas_pedido in lineas:
+            if stock.reservar(lineas_pedido):
+                stock.liberar(lineas_pedido)
+
+    yield "reservar + liberar (por pedido)", len(lineas), medir(reservar_y_liberar)[0]
+
+
+def bench_pedido(t, directorio):
+    from Pedido import Pedido
+    menu = Menu()
+    platos = [(nombre, menu.get_item(nombre)) for nombre in menu.get_items()]
+    n = t["items"]
+    pedido = Pedido()
+
+    def agregar():
+        for i in range(n):
+            nombre, info = platos[i % len(platos)]
+            pedido.agregar_item(info, nombre)
+
+    def total():
+        for _ in range(n):
+            pedido.calcular_total()
+
+    ids = pedido.ids
+    yield "Pedido.agregar_item", n, medir(agregar)[0]
+    yield "Pedido.calcular_total", n, medir(total)[0]
+    a_eliminar = random.Random(1).sample(list(ids()), n // 2)
+    yield "Pedido.eliminar_item (azar)", len(a_eliminar), medir(lambda: [pedido.eliminar_item(i) for i in a_eliminar])[0]
+    yield "Pedido.agrupar", 1, medir(pedido.agrupar)[0]
+
+
+def bench_boleta(t, directorio):
+    from Boleta import RenderizadorTermico
+    pedidos = crear_pedidos(Menu(), t["documentos"])
+    termica = RenderizadorTermico()
+
+    def ticket():
+        for i, pedido in enumerate(pedidos):
+            termica.generar(pedido, os.path.join(directorio, f"ticket_{i}.bin"))
+
+    yield "ticket térmico (por boleta)", len(pedidos), medir(ticket)[0]
+    from Boleta import BoletaPDF
+
+    def generar():
+        for i, pedido in enumerate(pedidos):
+            BoletaPDF(pedido).generar(os.path.join(directorio, f"boleta_{i}.pdf"))
+
+    yield "BoletaPDF.generar (por boleta)", len(pedidos), medir(generar)[0]
+
+
+def bench_carta(t, directorio):
+    from Menupdf import MenuPDF
+    from RenderPDF import rasterizar_pagina
+    items = items_carta(t["platos_carta"])
+    rutas = [os.path.join(directorio, f"carta_{i}.pdf") for i in range(t["documentos"])]
+
+    def generar():
+        for ruta in rutas:
+            if MenuPDF(items).generar(ruta) is None:
+                raise RuntimeError("MenuPDF no generó la carta")
+
+    yield f"MenuPDF.generar ({len(items)} platos)", len(rutas), medir(generar)[0]
+    with open(rutas[0], "rb") as f:
+        pdf = f.read()
+    for dpi in (72, 150):
+        yield f"fitz rasterizar página ({dpi} dpi)", len(rutas), medir(lambda: [rasterizar_pagina(pdf, 0, dpi) for _ in rutas])[0]
+
+
+BENCHES = {"csv": bench_carga_csv, "stock": bench_stock, "pedido": bench_pedido, "boleta": bench_boleta, "carta": bench_carta}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del camino pedido -> boleta (sin interfaz).")
+    parser.add_argument("--rapido", action="store_true", help="tamaños chicos, para revisar que todo corre")
+    parser.add_argument("--solo", help=f"grupos separados por coma: {','.join(BENCHES)}")
+    parser.add_argument("--json", help="guarda los resultados (y el perfil, si está activo) en este archivo")
+    parser.add_argument("--perfil", action="store_true", help="activa los contadores de Perfilado.py")
+    args = parser.parse_args()
+    if args.perfil:
+        # Perfilado decide al importarse si envuelve las funciones, por eso se activa antes de importar el proyecto
+        os.environ.setdefault("RESTAURANTE_PERFIL", "1")
+
+    global Menu, crear_pedidos, crear_stock, escribir_csv_ingredientes, items_carta
+    from Menu import Menu
+    from datos_sinteticos import crear_pedidos, crear_stock, escribir_csv_ingredientes, items_carta
+    import Perfilado
+
+    tamanos = TAMANOS["rapido" if args.rapido else "normal"]
+    grupos = args.solo.split(",") if args.solo else list(BENCHES)
+    resultados = []
+    print(f"{'caso':<38} {'n':>10} {'total':>9} {'por op':>11} {'ops/s':>12}")
+    with tempfile.TemporaryDirectory() as directorio:
+        for grupo in grupos:
+            try:
+                for nombre, n, duracion in BENCHES[grupo](tamanos, directorio):
+                    resultados.append({"grupo": grupo, "caso": nombre, "n": n, "segundos": round(duracion, 6),
+                                       "us_por_op": round(duracion / n * 1e6, 3)})
+                    print(f"{nombre:<38} {n:>10,} {duracion:>8.3f}s {duracion / n * 1e6:>9.2f}us {n / duracion:>12,.0f}")
+            except ImportError as e:
+                print(f"{grupo}: omitido, falta {e.name} (ver requerimientos.txt)")
+    if Perfilado.ACTIVO:
+        print()
+        print(f"{'función (Perfilado)':<52} {'llamadas':>10} {'total':>9} {'promedio':>11}")
+        for nombre, datos in Perfilado.contadores().items():
+            print(f"{nombre:<52} {datos['llamadas']:>10,} {datos['total_s']:>8.3f}s {datos['promedio_us']:>9.2f}us")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "tamanos": tamanos, "resultados": resultados,
+                       "perfil": Perfilado.contadores() if Perfilado.ACTIVO else None}, f, ensure_ascii=False, indent=2)
+        print(f"Resultados guardados en '{args.json}'.")
+
+
+if __name__ == "__main__":
+    main()
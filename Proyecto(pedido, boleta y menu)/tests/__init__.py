@@ -0,0 +1,15 @@
+# tests/__init__.py
+# Uso: python -m unittest discover -s tests   (desde la carpeta del proyecto)
+#      python -m pytest tests
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def carpeta_temporal(caso):
+    """Crea una carpeta temporal que se borra al terminar el test de `caso` y devuelve su ruta."""
+    tmp = tempfile.TemporaryDirectory()
+    caso.addCleanup(tmp.cleanup)
+    return tmp.name
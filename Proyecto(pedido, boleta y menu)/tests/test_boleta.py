@@ -0,0 +1,69 @@
+# test_boleta.py
+import io
+import os
+import unittest
+from datetime import datetime
+
+from tests import carpeta_temporal
+from Boleta import (ANCHO_TERMICA, ESC_CORTAR, ESC_INICIAR, ESC_TABLA_PC858, RenderizadorBoleta,
+                    RenderizadorTermico, desglose_iva, formatear_precio, renderizador)
+
+AGRUPADOS = [("Completo", {'cantidad': 2, 'precio_unit': 3500, 'total': 7000}),
+             ("Churrasco italiano con palta extra y mayonesa casera", {'cantidad': 1, 'precio_unit': 6900, 'total': 6900}),
+             ("Pepsi", {'cantidad': 3, 'precio_unit': 1100, 'total': 3300})]
+TOTAL = 17200
+AHORA = datetime(2024, 5, 17, 13, 45, 10)
+
+
+class TestRenderizadorBoleta(unittest.TestCase):
+    def test_es_abstracto(self):
+        with self.assertRaises(TypeError):
+            RenderizadorBoleta()
+
+        class SinEscribir(RenderizadorBoleta):
+            pass
+
+        with self.assertRaises(TypeError):
+            SinEscribir()
+
+    def test_formato_desconocido(self):
+        with self.assertRaises(ValueError):
+            renderizador("html")
+
+
+class TestRenderizadorTermico(unittest.TestCase):
+    def test_escpos_inicia_con_tabla_de_codigos_y_termina_cortando(self):
+        datos = RenderizadorTermico().renderizar(AGRUPADOS, TOTAL, AHORA)
+        self.assertTrue(datos.startswith(ESC_INICIAR + ESC_TABLA_PC858))
+        self.assertTrue(datos.endswith(b"\n" + ESC_CORTAR))
+        self.assertEqual(datos.count(ESC_CORTAR), 1)
+        # Los textos van en la página de códigos 858, no en UTF-8
+        self.assertIn("Señor".encode("cp858"), RenderizadorTermico().renderizar([("Señor", AGRUPADOS[0][1])], 7000, AHORA))
+
+    def test_texto_no_pasa_de_48_columnas(self):
+        texto = RenderizadorTermico(escpos=False).renderizar(AGRUPADOS, TOTAL, AHORA).decode("utf-8")
+        lineas = texto.splitlines()
+        self.assertEqual(ANCHO_TERMICA, 48)
+        self.assertEqual(max(len(linea) for linea in lineas), ANCHO_TERMICA)
+        self.assertNotIn("\x1b", texto)
+        # El nombre largo sigue en la línea siguiente, bajo la columna Detalle
+        self.assertTrue(any(linea.startswith(" " * 5) and "casera" in linea for linea in lineas))
+        subtotal, iva = desglose_iva(TOTAL)
+        self.assertTrue(lineas[-5].endswith(formatear_precio(subtotal)))
+        self.assertTrue(lineas[-4].endswith(formatear_precio(iva)))
+        self.assertTrue(lineas[-3].endswith(formatear_precio(TOTAL)))
+        self.assertIn("Fecha: 17-05-2024", texto)
+
+    def test_escribir_en_archivo_abierto_o_ruta(self):
+        termico = RenderizadorTermico()
+        destino = io.BytesIO()
+        self.assertIsNone(termico.escribir(AGRUPADOS, TOTAL, destino, AHORA))
+        self.assertEqual(destino.getvalue(), termico.renderizar(AGRUPADOS, TOTAL, AHORA))
+        ruta = os.path.join(carpeta_temporal(self), "ticket" + termico.extension)
+        self.assertEqual(termico.escribir(AGRUPADOS, TOTAL, ruta, AHORA), os.path.abspath(ruta))
+        with open(ruta, "rb") as f:
+            self.assertEqual(f.read(), destino.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
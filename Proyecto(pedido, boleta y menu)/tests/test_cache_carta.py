@@ -0,0 +1,50 @@
+# test_cache_carta.py
+import os
+import unittest
+
+from tests import carpeta_temporal
+from CacheCarta import CacheCarta
+
+PAGINA = (2, 1, b"\x00" * 6)
+
+
+class TestCacheCarta(unittest.TestCase):
+    def setUp(self):
+        self.directorio = carpeta_temporal(self)
+
+    def claves_en_disco(self):
+        return sorted({nombre.split(".")[0].split("_")[0] for nombre in os.listdir(self.directorio)})
+
+    def guardar(self, cache, clave):
+        entrada = cache.guardar(clave, b"%PDF", 1)
+        cache.guardar_pagina(entrada, 0, PAGINA)
+        return entrada
+
+    def test_descartar_de_memoria_borra_del_disco(self):
+        cache = CacheCarta(capacidad=2, directorio=self.directorio)
+        viejo = self.guardar(cache, "a")
+        self.guardar(cache, "b")
+        cache.obtener("a")
+        self.guardar(cache, "c")
+        self.assertEqual(self.claves_en_disco(), ["a", "c"])
+        self.assertIsNone(cache.obtener("b"))
+        # Una página que llega tarde para una carta descartada no deja archivos
+        cache.guardar_pagina(cache.guardar("d", b"%PDF", 1), 0, PAGINA)
+        cache.guardar_pagina(viejo, 1, PAGINA)
+        self.assertEqual(self.claves_en_disco(), ["c", "d"])
+
+    def test_al_reiniciar_respeta_la_capacidad(self):
+        cache = CacheCarta(capacidad=3, directorio=self.directorio)
+        for i, clave in enumerate("abc"):
+            self.guardar(cache, clave)
+            os.utime(os.path.join(self.directorio, f"{clave}.pdf"), (i, i))
+        cache = CacheCarta(capacidad=2, directorio=self.directorio)
+        self.assertEqual(self.claves_en_disco(), ["b", "c"])
+        entrada = cache.obtener("b")
+        self.assertEqual(cache.pagina(entrada, 0), PAGINA)
+        self.guardar(cache, "d")
+        self.assertEqual(self.claves_en_disco(), ["b", "d"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+# test_consola.py
+import contextlib
+import io
+import os
+import unittest
+
+from tests import carpeta_temporal
+import Consola
+from Ingrediente import Ingrediente
+from Persistencia import DiarioStock
+from Stock import Stock
+
+
+def cantidades(stock):
+    return {clave: ing.cantidad for clave, ing in stock.ingredientes.items()}
+
+
+class TestBoleta(unittest.TestCase):
+    def setUp(self):
+        self.datos = carpeta_temporal(self)
+        stock, diario = Stock(), DiarioStock(self.datos)
+        diario.adjuntar(stock)
+        stock.agregar_ingredientes([Ingrediente("Papas", "g", 1000), Ingrediente("Pepsi", "unid", 5)])
+        diario.cerrar()
+
+    def stock_guardado(self):
+        stock = Stock()
+        DiarioStock(self.datos).recuperar(stock)
+        return cantidades(stock)
+
+    def boleta(self, salida):
+        errores = io.StringIO()
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(errores):
+            codigo = Consola.main(["boleta", "--datos", self.datos, "--formato", "texto", "--salida", salida,
+                                   "Papas fritas=2", "Pepsi"])
+        return codigo, errores.getvalue()
+
+    def test_boleta_descuenta_el_stock(self):
+        codigo, _ = self.boleta(os.path.join(self.datos, "boleta.txt"))
+        self.assertEqual(codigo, 0)
+        self.assertEqual(self.stock_guardado(), {"papas": 500, "pepsi": 4})
+
+    def test_boleta_que_no_se_escribe_devuelve_el_stock(self):
+        antes = self.stock_guardado()
+        codigo, errores = self.boleta(os.path.join(self.datos, "no_existe", "boleta.txt"))
+        self.assertEqual(codigo, 1)
+        self.assertIn("No se pudo generar la boleta", errores)
+        self.assertEqual(self.stock_guardado(), antes)
+
+
+if __name__ == "__main__":
+    unittest.main()
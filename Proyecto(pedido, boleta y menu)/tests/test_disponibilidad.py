@@ -0,0 +1,34 @@
+# test_disponibilidad.py
+import json
+import os
+import unittest
+
+from tests import carpeta_temporal
+from Disponibilidad import MotorDisponibilidad, SIN_LIMITE
+from Ingrediente import Ingrediente
+from Menu import Menu
+from Stock import Stock
+
+
+class TestMotorDisponibilidad(unittest.TestCase):
+    def setUp(self):
+        ruta = os.path.join(carpeta_temporal(self), "menu.json")
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump({"Papas fritas": {"precio": 500, "ingredientes": {"papas": [250, "g"]}},
+                       "Agua de la llave": {"precio": 0, "ingredientes": {}}}, f)
+        self.stock = Stock()
+        self.motor = MotorDisponibilidad(Menu(ruta), self.stock)
+
+    def test_porciones_segun_stock(self):
+        self.assertEqual(self.motor.porciones("Papas fritas"), 0)
+        self.stock.agregar_ingrediente(Ingrediente("Papas", "kg", 1))
+        self.assertEqual(self.motor.porciones("Papas fritas"), 4)
+
+    def test_receta_vacia_siempre_disponible(self):
+        self.assertEqual(self.motor.porciones("Agua de la llave"), SIN_LIMITE)
+        self.stock.agregar_ingrediente(Ingrediente("Papas", "kg", 1))
+        self.assertEqual(self.motor.todas()["Agua de la llave"], SIN_LIMITE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+# test_fuentes_tabla.py
+import os
+import unittest
+
+from tests import carpeta_temporal
+from FuentesTabla import FuenteCSV, FuenteStock, FuenteTabla
+from Ingrediente import Ingrediente
+from Stock import Stock
+
+
+def visibles(fuente):
+    return [fuente.clave(i) for i in range(len(fuente))]
+
+
+class TestFuenteTabla(unittest.TestCase):
+    def test_una_fuente_incompleta_no_se_puede_crear(self):
+        class SinValores(FuenteTabla):
+            def _claves(self):
+                return []
+
+            def nombre(self, clave):
+                return clave
+
+        with self.assertRaises(TypeError) as error:
+            SinValores()
+        self.assertIn("valor_orden", str(error.exception))
+        self.assertIn("valores", str(error.exception))
+
+
+class TestFuenteStock(unittest.TestCase):
+    def test_filtro_que_abarca_todo_no_muestra_lo_agregado_despues(self):
+        stock = Stock()
+        stock.agregar_ingredientes([Ingrediente("Papas", "g", 100), Ingrediente("Palta", "g", 50)])
+        fuente = FuenteStock(stock, lambda ing: (ing.nombre, ing.unidad, ing.cantidad))
+        fuente.filtrar("pa")
+        self.assertEqual(visibles(fuente), ["palta", "papas"])
+        stock.agregar_ingrediente(Ingrediente("Tomate", "g", 10))
+        stock.agregar_ingrediente(Ingrediente("Pan", "unid", 3))
+        self.assertEqual(visibles(fuente), ["palta", "pan", "papas"])
+        fuente.filtrar("")
+        self.assertEqual(visibles(fuente), ["palta", "pan", "papas", "tomate"])
+
+
+class TestFuenteCSV(unittest.TestCase):
+    def abrir(self, contenido):
+        ruta = os.path.join(carpeta_temporal(self), "stock.csv")
+        with open(ruta, "wb") as f:
+            f.write(contenido)
+        fuente = FuenteCSV(ruta)
+        self.addCleanup(fuente.cerrar)
+        return fuente
+
+    def test_filas_vacias_entre_comillas_no_desplazan_el_indice(self):
+        fuente = self.abrir(b'\xef\xbb\xbfnombre,unidad,cantidad\r\n'
+                            b'Papas,kg,2\r\n""\r\n" "\r\n , \r\n\xc2\xa0,\r\n\r\nTomate,g,300\r\nPalta,unid,4\r\n')
+        self.assertEqual([fuente.fila(i) for i in range(len(fuente))],
+                         [("Papas", "kg", "2"), ("Tomate", "g", "300"), ("Palta", "unid", "4")])
+        fuente.ordenar(0)
+        self.assertEqual([fuente.fila(i)[0] for i in range(len(fuente))], ["Palta", "Papas", "Tomate"])
+        fuente.ordenar(2)
+        self.assertEqual([fuente.fila(i)[2] for i in range(len(fuente))], ["2", "4", "300"])
+
+    def test_campos_entre_comillas_con_saltos_de_linea(self):
+        fuente = self.abrir('nombre,unidad,cantidad\n"Papas\nfritas",g,100\n"Salsa ""de la\r\ncasa""",cc,20\n'
+                            '"Ñoquis",g,"300"\nTomate,g,50\n'.encode("utf-8"))
+        filas = [("Papas\nfritas", "g", "100"), ('Salsa "de la\r\ncasa"', "cc", "20"), ("Ñoquis", "g", "300"),
+                 ("Tomate", "g", "50")]
+        self.assertEqual([fuente.fila(i) for i in range(len(fuente))], filas)
+        # Los índices se arman con otra lectura del archivo: deben numerar las filas igual
+        fuente.ordenar(2)
+        self.assertEqual([fuente.fila(i) for i in range(len(fuente))], [filas[i] for i in (1, 3, 0, 2)])
+        fuente.filtrar("s")
+        self.assertEqual([fuente.fila(i)[0] for i in range(len(fuente))], ['Salsa "de la\r\ncasa"'])
+
+    def test_sin_encabezado(self):
+        fuente = self.abrir(b"Papas,kg,2\nTomate,g,300")
+        self.assertEqual([fuente.fila(i) for i in range(len(fuente))], [("Papas", "kg", "2"), ("Tomate", "g", "300")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+# test_menu.py
+import json
+import os
+import unittest
+
+from tests import carpeta_temporal
+from Ingrediente import Ingrediente
+from Menu import Menu
+from Stock import Stock
+
+CATALOGO = {"Papas fritas": {"precio": 500, "ingredientes": {"papas": [250, "g"]}},
+            "Pepsi": {"precio": 1100, "ingredientes": {"pepsi": 1}}}
+
+
+class TestMenu(unittest.TestCase):
+    def setUp(self):
+        self.ruta = os.path.join(carpeta_temporal(self), "menu.json")
+        self.escribir(CATALOGO)
+        self.menu = Menu(self.ruta)
+
+    def escribir(self, catalogo):
+        with open(self.ruta, "w", encoding="utf-8") as f:
+            json.dump(catalogo, f)
+        # Cambia la fecha para que recargar_si_cambio lo note aunque el tamaño sea igual
+        estado = os.stat(self.ruta)
+        os.utime(self.ruta, ns=(estado.st_atime_ns, estado.st_mtime_ns + 10 ** 9))
+
+    def test_recetas_en_unidad_base(self):
+        self.assertEqual(self.menu.get_item("Papas fritas")["ingredientes"], {"papas": 250})
+        self.assertEqual(self.menu.unidad_ingrediente("Pepsi"), "unid")
+
+    def test_receta_invalida_no_reemplaza_la_carta(self):
+        invalidas = {"cantidad cero": [0, "g"], "cantidad negativa": [-1, "kg"], "unidad desconocida": [1, "taza"],
+                     "sin unidad": [250], "de más": [1, "g", "extra"], "texto": "mucho", "cantidad en texto": ["1", "g"]}
+        for caso, requerido in invalidas.items():
+            with self.subTest(caso):
+                self.escribir({**CATALOGO, "Completo": {"precio": 1500, "ingredientes": {"pan": 1, "palta": requerido}}})
+                with self.assertRaises(ValueError) as error:
+                    self.menu.recargar_si_cambio()
+                self.assertIn("'Completo'", str(error.exception))
+                self.assertIn("'palta'", str(error.exception))
+                self.assertEqual(list(self.menu.get_items()), list(CATALOGO))
+                self.assertIsNone(self.menu.recargar_si_cambio())
+
+    def test_verificar_stock_avisa_unidades_distintas(self):
+        stock = Stock()
+        # Papas en kg queda en gramos, igual que la receta; la Pepsi se cargó en cc y la receta la pide en unidades
+        stock.agregar_ingredientes([Ingrediente("Papas", "kg", 2), Ingrediente("Pepsi", "cc", 500)])
+        self.assertEqual(self.menu.verificar_stock(stock), ([], [("pepsi", "unid", "cc")]))
+        stock.eliminar_ingrediente("Papas")
+        self.assertEqual(self.menu.verificar_stock(stock), ([("papas", ["Papas fritas"])], [("pepsi", "unid", "cc")]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+# test_pedido.py
+import unittest
+
+import tests  # noqa: F401  (deja el proyecto en sys.path)
+from Pedido import Pedido, MINIMO_PARA_COMPACTAR
+
+PAPAS = {'precio': 500, 'ingredientes': {'papas': 250}}
+PEPSI = {'precio': 1100, 'ingredientes': {'pepsi': 1}}
+
+
+def pedido_con(*platos):
+    pedido = Pedido()
+    for nombre, info in platos:
+        pedido.agregar_item(info, nombre)
+    return pedido
+
+
+class TestPedido(unittest.TestCase):
+    def test_columnas_y_plato_guardado_una_vez(self):
+        pedido = pedido_con(("Papas fritas", PAPAS), ("Pepsi", PEPSI), ("Papas fritas", PAPAS))
+        self.assertEqual(list(pedido._ids), [1, 2, 3])
+        self.assertEqual(list(pedido._precios), [500, 1100, 500])
+        self.assertEqual(len(pedido._platos), 2)
+        self.assertEqual(pedido.get_item(3), {'id': 3, 'nombre': "Papas fritas", 'precio': 500, 'ingredientes': {'papas': 250}})
+        self.assertIs(pedido.get_item(1)['ingredientes'], PAPAS['ingredientes'])
+
+    def test_eliminar_deja_una_marca_y_actualiza_total_y_cantidades(self):
+        pedido = pedido_con(("Papas fritas", PAPAS), ("Pepsi", PEPSI), ("Papas fritas", PAPAS))
+        self.assertEqual(pedido.calcular_total(), 2100)
+        self.assertEqual(pedido.eliminar_item(1)['nombre'], "Papas fritas")
+        self.assertIsNone(pedido.eliminar_item(1))
+        self.assertEqual(list(pedido._ids), [0, 2, 3])
+        self.assertEqual(len(pedido), 2)
+        self.assertEqual(pedido.ids(), [2, 3])
+        self.assertEqual(pedido.calcular_total(), 1600)
+        self.assertEqual(pedido.lineas_por_plato(), [({'papas': 250}, 1), ({'pepsi': 1}, 1)])
+        pedido.eliminar_item(3)
+        self.assertEqual(pedido.lineas_por_plato(), [({'pepsi': 1}, 1)])
+        self.assertEqual(pedido.agrupar(), [("Pepsi", {'cantidad': 1, 'precio_unit': 1100, 'total': 1100})])
+
+    def test_eliminar_y_volver_a_agregar(self):
+        pedido = pedido_con(("Papas fritas", PAPAS), ("Pepsi", PEPSI))
+        pedido.eliminar_item(1)
+        nuevo = pedido.agregar_item(PAPAS, "Papas fritas")
+        self.assertEqual(nuevo['id'], 3)
+        self.assertEqual(pedido.calcular_total(), 1600)
+        self.assertEqual([item['id'] for item in pedido.get_items()], [2, 3])
+        # El plato reaparece después de Pepsi, en el orden en que se volvió a agregar
+        self.assertEqual(pedido.agrupar(), [("Pepsi", {'cantidad': 1, 'precio_unit': 1100, 'total': 1100}),
+                                            ("Papas fritas", {'cantidad': 1, 'precio_unit': 500, 'total': 500})])
+
+    def test_agrupar_por_nombre(self):
+        pedido = pedido_con(("Pepsi", PEPSI), ("Papas fritas", PAPAS), ("Pepsi", PEPSI), ("Pepsi", PEPSI))
+        self.assertEqual(pedido.agrupar(), [("Pepsi", {'cantidad': 3, 'precio_unit': 1100, 'total': 3300}),
+                                            ("Papas fritas", {'cantidad': 1, 'precio_unit': 500, 'total': 500})])
+
+    def test_compacta_cuando_mas_de_la_mitad_esta_eliminada(self):
+        pedido = pedido_con(*[("Pepsi", PEPSI)] * (2 * MINIMO_PARA_COMPACTAR + 4))
+        for item_id in range(1, MINIMO_PARA_COMPACTAR + 4):
+            pedido.eliminar_item(item_id)
+        self.assertEqual(pedido._eliminadas, 0)
+        self.assertNotIn(0, pedido._ids)
+        self.assertEqual(len(pedido), MINIMO_PARA_COMPACTAR + 1)
+        self.assertEqual(pedido.calcular_total(), 1100 * len(pedido))
+        self.assertIsNotNone(pedido.eliminar_item(2 * MINIMO_PARA_COMPACTAR + 4))
+
+    def test_copia_no_modifica_el_original(self):
+        pedido = pedido_con(("Papas fritas", PAPAS), ("Pepsi", PEPSI), ("Papas fritas", PAPAS))
+        eventos = []
+        pedido.suscribir(lambda agregados, actualizados, eliminados: eventos.append(eliminados))
+        pedido.eliminar_item(2)
+        columnas = (list(pedido._ids), list(pedido._precios), dict(pedido._posiciones), pedido._eliminadas)
+        copia = pedido.copia()
+        self.assertEqual((list(pedido._ids), list(pedido._precios), dict(pedido._posiciones), pedido._eliminadas),
+                         columnas)
+        self.assertEqual(list(copia._ids), [1, 3])
+        self.assertEqual(copia.get_items(), pedido.get_items())
+        self.assertEqual(copia.calcular_total(), pedido.calcular_total())
+        self.assertEqual(copia.agrupar(), pedido.agrupar())
+        # La copia sigue sola: ni comparte columnas ni avisa a los suscriptores del original
+        copia.eliminar_item(1)
+        copia.agregar_item(PEPSI, "Pepsi")
+        self.assertEqual(pedido.ids(), [1, 3])
+        self.assertEqual(eventos, [(2,)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+# test_persistencia.py
+import os
+import unittest
+
+from tests import carpeta_temporal
+from Ingrediente import Ingrediente
+from Persistencia import DiarioStock
+from Stock import Stock
+
+
+def cantidades(stock):
+    return {clave: ing.cantidad for clave, ing in stock.ingredientes.items()}
+
+
+class TestDiarioStock(unittest.TestCase):
+    def setUp(self):
+        self.directorio = carpeta_temporal(self)
+
+    def abrir(self):
+        stock = Stock()
+        diario = DiarioStock(self.directorio)
+        diario.adjuntar(stock)
+        return stock, diario
+
+    def test_recupera_lo_anotado(self):
+        stock, diario = self.abrir()
+        stock.agregar_ingrediente(Ingrediente("Tomate", "kg", 2))
+        stock.descontar_ingredientes({"tomate": 300})
+        stock.reponer_ingredientes({"tomate": 100})
+        stock.eliminar_ingrediente("Tomate")
+        stock.agregar_ingrediente(Ingrediente("Palta", "unid", 4))
+        diario.cerrar()
+        recuperado, diario = self.abrir()
+        diario.cerrar()
+        self.assertEqual(cantidades(recuperado), cantidades(stock))
+
+    def test_snapshot_mas_diario(self):
+        stock, diario = self.abrir()
+        stock.agregar_ingrediente(Ingrediente("Pan", "unid", 10))
+        diario.snapshot()
+        stock.descontar_ingredientes({"pan": 3})
+        diario.cerrar()
+        recuperado, diario = self.abrir()
+        diario.cerrar()
+        self.assertEqual(cantidades(recuperado), {"pan": 7})
+
+    def test_nombre_repetido_en_un_mismo_agregado(self):
+        stock, diario = self.abrir()
+        stock.agregar_ingredientes([Ingrediente("Sal", "g", 3), Ingrediente("sal", "g", 5)])
+        diario.cerrar()
+        self.assertEqual(cantidades(stock), {"sal": 8})
+        recuperado, diario = self.abrir()
+        diario.cerrar()
+        self.assertEqual(cantidades(recuperado), {"sal": 8})
+
+    def test_linea_cortada_no_esconde_lo_que_se_anota_despues(self):
+        stock, diario = self.abrir()
+        stock.agregar_ingrediente(Ingrediente("Pan", "unid", 10))
+        stock.descontar_ingredientes({"pan": 2})
+        diario.cerrar()
+        # Simula una caída a mitad de una escritura
+        with open(diario.ruta_diario, "a", encoding="utf-8") as f:
+            f.write('["descontar",{"pa')
+        stock, diario = self.abrir()
+        self.assertEqual(cantidades(stock), {"pan": 8})
+        stock.descontar_ingredientes({"pan": 3})
+        diario.cerrar()
+        recuperado, diario = self.abrir()
+        diario.cerrar()
+        self.assertEqual(cantidades(recuperado), {"pan": 5})
+
+    def test_recuperar_informa_donde_termina_lo_valido(self):
+        stock, diario = self.abrir()
+        stock.agregar_ingrediente(Ingrediente("Pan", "unid", 10))
+        diario.cerrar()
+        tamano = os.path.getsize(diario.ruta_diario)
+        with open(diario.ruta_diario, "a", encoding="utf-8") as f:
+            f.write('["agregar"')
+        aplicadas, posicion = DiarioStock(self.directorio).recuperar(Stock())
+        self.assertEqual((aplicadas, posicion), (1, tamano))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+# test_pronostico.py
+import math
+import os
+import unittest
+
+from tests import carpeta_temporal
+from Ingrediente import Ingrediente
+from Pronostico import PronosticoConsumo, VIDA_MEDIA
+from Stock import Stock
+
+
+class Reloj:
+    def __init__(self):
+        self.ahora = 1_700_000_000.0
+
+    def __call__(self):
+        return self.ahora
+
+
+class TestPronosticoConsumo(unittest.TestCase):
+    def setUp(self):
+        self.reloj = Reloj()
+        self.stock = Stock()
+        self.stock.agregar_ingredientes([Ingrediente("Papas", "g", 1000), Ingrediente("Pepsi", "unid", 24)])
+        # horas_alerta=0: solo alertan el mínimo configurado y el stock agotado
+        self.pronostico = PronosticoConsumo(self.stock, horas_alerta=0, reloj=self.reloj)
+        self.alertas = []
+        self.pronostico.suscribir(self.alertas.append)
+
+    def test_el_consumo_decae_con_la_vida_media(self):
+        self.stock.descontar_ingredientes({"papas": 100})
+        tau = self.pronostico.tau
+        # Tras una vida media queda la mitad del acumulado y se ha observado la mitad del peso
+        self.reloj.ahora += VIDA_MEDIA
+        self.assertAlmostEqual(self.pronostico.tasa_por_hora("Papas"), 50 / (tau * 0.5) * 3600)
+        self.reloj.ahora += VIDA_MEDIA
+        self.assertAlmostEqual(self.pronostico.tasa_por_hora("Papas"), 25 / (tau * 0.75) * 3600)
+        self.assertAlmostEqual(self.pronostico.horas_restantes("Papas"), 900 / (25 / (tau * 0.75) * 3600))
+        self.assertEqual(self.pronostico.tasa_por_hora("Pepsi"), 0.0)
+        self.assertEqual(self.pronostico.horas_restantes("Pepsi"), math.inf)
+
+    def test_reponer_resta_lo_descontado(self):
+        self.stock.descontar_ingredientes({"papas": 100})
+        self.stock.reponer_ingredientes({"papas": 100})
+        self.assertEqual(self.pronostico.tasa_por_hora("Papas"), 0.0)
+
+    def test_la_alerta_se_avisa_una_vez(self):
+        self.pronostico.configurar_alerta("Papas", minimo=500)
+        self.stock.descontar_ingredientes({"papas": 300})
+        self.assertEqual(self.alertas, [])
+        self.stock.descontar_ingredientes({"papas": 300})
+        self.stock.descontar_ingredientes({"papas": 100})
+        self.stock.descontar_ingredientes({"papas": 300})
+        # Mientras siga en alerta no se vuelve a avisar, aunque empeore; alertas() muestra el estado actual
+        self.assertEqual([[(a.nombre, a.cantidad, a.motivo) for a in nuevas] for nuevas in self.alertas],
+                         [[("Papas", 400, "bajo el mínimo")]])
+        self.assertEqual([(a.nombre, a.motivo) for a in self.pronostico.alertas()], [("Papas", "agotado")])
+        # Al reponer sobre el mínimo la alerta se apaga y puede volver a avisar
+        self.stock.agregar_ingrediente(Ingrediente("Papas", "g", 1000))
+        self.assertEqual(self.pronostico.alertas(), [])
+        self.stock.descontar_ingredientes({"papas": 600})
+        self.assertEqual(len(self.alertas), 2)
+
+    def test_guardar_y_cargar(self):
+        self.pronostico.configurar_alerta("Pepsi", minimo=6, horas=3)
+        self.stock.descontar_ingredientes({"papas": 200, "pepsi": 4})
+        self.reloj.ahora += 600
+        self.stock.descontar_ingredientes({"papas": 50})
+        ruta = os.path.join(carpeta_temporal(self), "pronostico.json")
+        self.pronostico.guardar(ruta)
+        recuperado = PronosticoConsumo(self.stock, horas_alerta=0, reloj=self.reloj)
+        recuperado.cargar(ruta)
+        self.reloj.ahora += 3600
+        for nombre in ("Papas", "Pepsi"):
+            self.assertAlmostEqual(recuperado.tasa_por_hora(nombre), self.pronostico.tasa_por_hora(nombre))
+        self.assertEqual(recuperado.lista_reposicion(), self.pronostico.lista_reposicion())
+        self.assertEqual((recuperado._minimos, recuperado._horas_alerta), ({"pepsi": 6}, {"pepsi": 3}))
+        # Un archivo dañado no borra lo que ya se sabe
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write("{")
+        recuperado.cargar(ruta)
+        self.assertAlmostEqual(recuperado.tasa_por_hora("Papas"), self.pronostico.tasa_por_hora("Papas"))
+
+
+if __name__ == "__main__":
+    unittest.main()
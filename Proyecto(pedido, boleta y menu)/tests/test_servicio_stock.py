@@ -0,0 +1,88 @@
+# test_servicio_stock.py
+import json
+import os
+import threading
+import time
+import unittest
+
+from tests import carpeta_temporal
+from Disponibilidad import MotorDisponibilidad
+from Ingrediente import Ingrediente
+from Menu import Menu
+from Persistencia import DiarioStock
+from ServicioStock import ServicioStock
+from Stock import Stock
+
+# Dos grupos de platos sin ingredientes en común, y un plato que usa uno de cada grupo
+CATALOGO = {"Papas fritas": {"precio": 500, "ingredientes": {"papas": [250, "g"]}},
+            "Pepsi": {"precio": 1100, "ingredientes": {"pepsi": 1}},
+            "Papas con bebida": {"precio": 1500, "ingredientes": {"papas": [250, "g"], "pepsi": 1}}}
+PEDIDOS_POR_GRUPO = 200
+
+
+def cantidades(stock):
+    return {clave: ing.cantidad for clave, ing in stock.ingredientes.items()}
+
+
+class TestServicioStock(unittest.TestCase):
+    def setUp(self):
+        directorio = carpeta_temporal(self)
+        ruta_menu = os.path.join(directorio, "menu.json")
+        with open(ruta_menu, "w", encoding="utf-8") as f:
+            json.dump(CATALOGO, f)
+        self.menu = Menu(ruta_menu)
+        self.directorio = os.path.join(directorio, "datos")
+        self.stock = Stock()
+        self.diario = DiarioStock(self.directorio)
+        self.diario.adjuntar(self.stock)
+        self.addCleanup(self.diario.cerrar)
+        self.stock.agregar_ingredientes([Ingrediente("Papas", "g", 250 * (PEDIDOS_POR_GRUPO + 7)),
+                                         Ingrediente("Pepsi", "unid", PEDIDOS_POR_GRUPO + 3)])
+        self.servicio = ServicioStock(self.stock)
+        self.motor = MotorDisponibilidad(self.menu, self.stock)
+
+    def test_pedidos_disjuntos_en_paralelo(self):
+        # Un suscriptor lento que anota si alguna vez lo llamaron desde dos hilos a la vez
+        dentro, solapados = [0], []
+        candado = threading.Lock()
+
+        def suscriptor_lento(agregados, actualizados, eliminados):
+            with candado:
+                dentro[0] += 1
+                solapados.append(dentro[0] > 1)
+            time.sleep(0.0005)
+            with candado:
+                dentro[0] -= 1
+
+        self.stock.suscribir(suscriptor_lento)
+        papas, pepsi = self.menu.get_item("Papas fritas")["ingredientes"], self.menu.get_item("Pepsi")["ingredientes"]
+        pedidos = [[(papas, 1)] if i % 2 else [(pepsi, 1)] for i in range(2 * PEDIDOS_POR_GRUPO)]
+
+        resultados = []
+
+        def caja(parte):
+            # Un assert fallido en otro hilo no haría fallar el test: se anota y se revisa al final
+            resultados.extend(self.servicio.reservar(lineas) for lineas in parte)
+
+        hilos = [threading.Thread(target=caja, args=(pedidos[i::4],)) for i in range(4)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(resultados, [True] * len(pedidos))
+        self.assertEqual(cantidades(self.stock), {"papas": 250 * 7, "pepsi": 3})
+        self.assertEqual(len(solapados), 2 * PEDIDOS_POR_GRUPO)
+        self.assertFalse(any(solapados))
+        # La disponibilidad incremental coincide con recalcular desde cero
+        self.assertEqual(self.motor.todas(), {"Papas fritas": 7, "Pepsi": 3, "Papas con bebida": 3})
+        self.assertEqual(self.motor.todas(), MotorDisponibilidad(self.menu, self.stock).todas())
+        # El diario tiene una línea completa por operación y reconstruye el mismo stock
+        recuperado = Stock()
+        aplicadas, _ = DiarioStock(self.directorio).recuperar(recuperado)
+        self.assertEqual(aplicadas, 1 + 2 * PEDIDOS_POR_GRUPO)
+        self.assertEqual(cantidades(recuperado), cantidades(self.stock))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+# test_servidor_api.py
+import asyncio
+import json
+import threading
+import unittest
+
+from tests import carpeta_temporal
+from Ingrediente import Ingrediente
+from Menu import Menu
+from ServidorAPI import ServidorAPI
+from Stock import Stock
+
+CANTIDAD_INICIAL = 10 ** 6
+
+
+class TestServidorAPI(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.menu = Menu()
+        self.stock = Stock()
+        nombres = {ing.lower() for info in self.menu.get_items().values() for ing in info["ingredientes"]}
+        self.stock.agregar_ingredientes([Ingrediente(nombre, self.menu.unidad_ingrediente(nombre), CANTIDAD_INICIAL)
+                                         for nombre in nombres])
+        self.servidor = ServidorAPI(self.stock, self.menu, directorio_boletas=carpeta_temporal(self), usar_procesos=False)
+        self.puerto = await self.servidor.iniciar(puerto=0)
+
+    async def asyncTearDown(self):
+        await self.servidor.cerrar()
+
+    async def enviar(self, crudo):
+        """Envía una solicitud HTTP tal cual y devuelve (estado, cuerpo JSON) de la respuesta."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.puerto)
+        try:
+            writer.write(crudo)
+            await writer.drain()
+            encabezado = await reader.readuntil(b"\r\n\r\n")
+            lineas = encabezado.decode("latin-1").split("\r\n")
+            largo = next(int(l.split(":", 1)[1]) for l in lineas if l.lower().startswith("content-length:"))
+            return int(lineas[0].split(" ")[1]), json.loads(await reader.readexactly(largo))
+        finally:
+            writer.close()
+
+    async def pedir(self, items):
+        cuerpo = json.dumps({"items": items}).encode("utf-8")
+        return await self.enviar(b"POST /pedidos HTTP/1.1\r\nContent-Length: %d\r\nConnection: close\r\n\r\n%s"
+                                 % (len(cuerpo), cuerpo))
+
+    def cantidad(self, ingrediente):
+        return self.stock.ingredientes[ingrediente].cantidad
+
+    async def esperar_cantidad(self, ingrediente, esperada):
+        """Espera (hasta 2 s) a que el hilo de stock deje al ingrediente en `esperada`."""
+        for _ in range(200):
+            if self.cantidad(ingrediente) == esperada:
+                return
+            await asyncio.sleep(0.01)
+        self.assertEqual(self.cantidad(ingrediente), esperada)
+
+    async def test_content_length_no_numerico(self):
+        estado, respuesta = await self.enviar(b"POST /pedidos HTTP/1.1\r\nContent-Length: diez\r\n\r\n{}")
+        self.assertEqual(estado, 400)
+        self.assertIn("Content-Length", respuesta["error"])
+
+    async def test_content_length_negativo(self):
+        estado, respuesta = await self.enviar(b"POST /pedidos HTTP/1.1\r\nContent-Length: -5\r\n\r\n{}")
+        self.assertEqual(estado, 400)
+        self.assertIn("Content-Length", respuesta["error"])
+
+    async def test_pedido_reserva_stock(self):
+        estado, respuesta = await self.pedir({"Papas fritas": 2})
+        self.assertEqual(estado, 201)
+        self.assertEqual(respuesta["total"], 2 * self.menu.get_item("Papas fritas")["precio"])
+        self.assertEqual(self.cantidad("papas"), CANTIDAD_INICIAL - 2 * self.menu.get_item("Papas fritas")["ingredientes"]["papas"])
+
+    async def test_error_en_un_pedido_no_afecta_al_resto_del_lote(self):
+        reservar = self.stock.reservar
+
+        def reservar_fallando(lineas):
+            if any("pepsi" in ingredientes for ingredientes, _ in lineas):
+                raise RuntimeError("falla simulada")
+            return reservar(lineas)
+
+        self.stock.reservar = reservar_fallando
+        respuestas = await asyncio.gather(self.pedir({"Papas fritas": 1}), self.pedir({"Pepsi": 1}),
+                                          self.pedir({"Papas fritas": 1}))
+        self.assertEqual([estado for estado, _ in respuestas], [201, 503, 201])
+        self.assertEqual(len(self.servidor.pedidos), 2)
+        papas = self.menu.get_item("Papas fritas")["ingredientes"]["papas"]
+        self.assertEqual(self.cantidad("papas"), CANTIDAD_INICIAL - 2 * papas)
+
+    async def test_pedido_cancelado_antes_de_responder_devuelve_el_stock(self):
+        # Como cuando el cliente se desconecta: la tarea se cancela mientras el hilo del stock reserva
+        reservar, en_curso, seguir = self.stock.reservar, threading.Event(), threading.Event()
+
+        def reservar_lento(lineas):
+            en_curso.set()
+            seguir.wait(2)
+            return reservar(lineas)
+
+        self.stock.reservar = reservar_lento
+        tarea = asyncio.create_task(self.servidor.post_pedido(json.dumps({"items": {"Papas fritas": 3}}).encode()))
+        while not en_curso.is_set():
+            await asyncio.sleep(0.001)
+        tarea.cancel()
+        seguir.set()
+        with self.assertRaises(asyncio.CancelledError):
+            await tarea
+        await self.esperar_cantidad("papas", CANTIDAD_INICIAL)
+        self.assertEqual(self.servidor.pedidos, {})
+
+    async def test_pedido_sin_boleta_vence_y_devuelve_el_stock(self):
+        _, papas = await self.pedir({"Papas fritas": 1})
+        _, pepsis = await self.pedir({"Pepsi": 2})
+        self.assertEqual(await self.servidor._liberar_vencidos(), [])
+        self.servidor.vida_pedido = 0
+        estado, ultimo = await self.pedir({"Pepsi": 1})
+        self.assertEqual(estado, 201)
+        self.assertEqual(await self.servidor._liberar_vencidos(), [ultimo["id"]])
+        self.assertEqual(self.cantidad("pepsi"), CANTIDAD_INICIAL - 2)
+        self.assertEqual(sorted(self.servidor.pedidos), [papas["id"], pepsis["id"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
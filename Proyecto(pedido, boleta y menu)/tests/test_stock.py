@@ -0,0 +1,50 @@
+# test_stock.py
+import unittest
+
+import tests  # noqa: F401  (deja el proyecto en sys.path)
+from Ingrediente import Ingrediente
+from Stock import Stock
+
+COMPLETO = {"pan": 1, "palta": 60, "tomate": 40}
+PAPAS_FRITAS = {"papas": 250}
+
+
+def cantidades(stock):
+    return {clave: ing.cantidad for clave, ing in stock.ingredientes.items()}
+
+
+class TestReservarLiberar(unittest.TestCase):
+    def setUp(self):
+        self.stock = Stock()
+        self.stock.agregar_ingredientes([Ingrediente("Pan", "unid", 10), Ingrediente("Palta", "g", 500),
+                                         Ingrediente("Tomate", "g", 1000), Ingrediente("Papas", "g", 1000)])
+        self.eventos = []
+        self.stock.suscribir(lambda agregados, actualizados, eliminados: self.eventos.append(sorted(actualizados)))
+
+    def test_falta_el_segundo_ingrediente_no_descuenta_nada(self):
+        antes = cantidades(self.stock)
+        # El pan alcanza y se revisa primero; la palta no alcanza para 9 completos
+        self.assertFalse(self.stock.reservar([(COMPLETO, 9)]))
+        self.assertEqual(cantidades(self.stock), antes)
+        self.assertEqual(self.eventos, [])
+
+    def test_platos_repetidos_suman_su_demanda(self):
+        # Cada línea sola alcanzaría, pero juntas piden 600 g de palta y hay 500
+        self.assertFalse(self.stock.reservar([(COMPLETO, 5), (COMPLETO, 5)]))
+        self.assertEqual(self.stock.ingredientes["palta"].cantidad, 500)
+        self.assertTrue(self.stock.reservar([(COMPLETO, 4), (PAPAS_FRITAS, 1), (COMPLETO, 4)]))
+        self.assertEqual(cantidades(self.stock), {"pan": 2, "palta": 20, "tomate": 680, "papas": 750})
+        # Un solo evento con cada ingrediente una vez
+        self.assertEqual(self.eventos, [["palta", "pan", "papas", "tomate"]])
+
+    def test_liberar_devuelve_exactamente_lo_reservado(self):
+        antes = cantidades(self.stock)
+        lineas = [(COMPLETO, 3), (PAPAS_FRITAS, 2), (COMPLETO, 1)]
+        self.assertTrue(self.stock.reservar(lineas))
+        self.assertEqual(cantidades(self.stock), {"pan": 6, "palta": 260, "tomate": 840, "papas": 500})
+        self.stock.liberar(lineas)
+        self.assertEqual(cantidades(self.stock), antes)
+
+
+if __name__ == "__main__":
+    unittest.main()
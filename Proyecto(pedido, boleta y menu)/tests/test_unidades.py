@@ -0,0 +1,65 @@
+# test_unidades.py
+import os
+import unittest
+from decimal import Decimal
+
+from tests import carpeta_temporal
+from CargaCSV import cargar_csv_en_stock
+from Ingrediente import Ingrediente
+from Stock import Stock
+from Unidades import a_unidad_base, normalizar_unidad
+
+
+class TestUnidades(unittest.TestCase):
+    def test_conversion_a_unidad_base(self):
+        self.assertEqual(a_unidad_base("0.1", "kg"), ("g", 100))
+        self.assertEqual(a_unidad_base(Decimal("0.1"), "KG"), ("g", 100))
+        self.assertEqual(a_unidad_base("0.1", "l"), ("cc", 100))
+        self.assertEqual(a_unidad_base(" 1.25 ", "Litros"), ("cc", 1250))
+        self.assertEqual(a_unidad_base(3, "porciones"), ("unid", 3))
+
+    def test_decimales_sin_error_de_coma_flotante(self):
+        # Con float, 0.1 * 3 * 1000 daría 300.00000000000006; con Decimal el total es exacto
+        self.assertEqual(sum(a_unidad_base("0.1", "kg")[1] for _ in range(3)), 300)
+        self.assertEqual(a_unidad_base("0.0005", "kg"), ("g", 0))
+        self.assertEqual(a_unidad_base("0.0015", "kg"), ("g", 2))
+
+    def test_unidad_desconocida(self):
+        with self.assertRaises(ValueError) as error:
+            normalizar_unidad("taza")
+        self.assertIn("'taza'", str(error.exception))
+        self.assertRaises(ValueError, Ingrediente, "Harina", "taza", 2)
+
+    def test_cantidad_invalida(self):
+        for cantidad in ("mucho", "", "nan", "inf"):
+            with self.subTest(cantidad=cantidad):
+                self.assertRaises(ValueError, a_unidad_base, cantidad, "g")
+
+
+class TestCargaCSVUnidades(unittest.TestCase):
+    def cargar(self, stock, contenido):
+        ruta = os.path.join(carpeta_temporal(self), "stock.csv")
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(contenido)
+        return cargar_csv_en_stock(stock, ruta)
+
+    def test_unidades_de_la_misma_base_se_suman(self):
+        stock = Stock()
+        resultado = self.cargar(stock, "nombre,unidad,cantidad\nPapas,kg,0.1\npapas,g,50\nAceite,l,0.1\nAceite,cc,5\n")
+        self.assertEqual(resultado.errores, [])
+        self.assertEqual({(ing.nombre.lower(), ing.unidad, ing.cantidad) for ing in stock.get_ingredientes()},
+                         {("papas", "g", 150), ("aceite", "cc", 105)})
+
+    def test_unidades_mezcladas_se_rechazan(self):
+        stock = Stock()
+        stock.agregar_ingrediente(Ingrediente("Pepsi", "unid", 2))
+        resultado = self.cargar(stock, "Papas,kg,1\nPapas,l,1\nPepsi,cc,500\nTomate,taza,1\nPapas,g,10\n")
+        self.assertEqual([numero for numero, _ in resultado.errores], [2, 3, 4])
+        self.assertIn("taza", resultado.errores[2][1])
+        self.assertEqual(resultado.agregados, 2)
+        self.assertEqual({clave: (ing.unidad, ing.cantidad) for clave, ing in stock.ingredientes.items()},
+                         {"pepsi": ("unid", 2), "papas": ("g", 1010)})
+
+
+if __name__ == "__main__":
+    unittest.main()
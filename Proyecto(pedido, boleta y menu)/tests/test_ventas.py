@@ -0,0 +1,92 @@
+# test_ventas.py
+import os
+import unittest
+from datetime import datetime
+
+from tests import carpeta_temporal
+from Pedido import Pedido
+from Persistencia import RegistroPedidos
+
+try:
+    from Ventas import AnalisisVentas
+except ImportError:  # numpy es opcional: sin él la aplicación funciona, pero no hay análisis de ventas
+    AnalisisVentas = None
+
+PAPAS = {'precio': 500, 'ingredientes': {'papas': 250}}
+PEPSI = {'precio': 1100, 'ingredientes': {'pepsi': 1}}
+COMPLETO = {'precio': 1800, 'ingredientes': {'pan de completo': 1}}
+
+
+def pedido_con(**cantidades):
+    pedido = Pedido()
+    for nombre, cantidad in cantidades.items():
+        for _ in range(cantidad):
+            pedido.agregar_item({"Papas": PAPAS, "Pepsi": PEPSI, "Completo": COMPLETO}[nombre], nombre)
+    return pedido
+
+
+@unittest.skipIf(AnalisisVentas is None, "el análisis de ventas necesita numpy")
+class TestAnalisisVentas(unittest.TestCase):
+    def setUp(self):
+        self.registro = RegistroPedidos(carpeta_temporal(self))
+        self.registro.registrar(pedido_con(Papas=2, Pepsi=1), datetime(2024, 1, 31, 12, 5))
+        self.registro.registrar(pedido_con(Completo=1, Pepsi=2), datetime(2024, 1, 31, 12, 50))
+        self.registro.registrar(pedido_con(Pepsi=1), datetime(2024, 1, 31, 20, 0))
+        self.registro.registrar(pedido_con(Papas=1), datetime(2024, 2, 1, 9, 30))
+
+    def analisis(self):
+        analisis = AnalisisVentas(self.registro)
+        analisis.actualizar()
+        return analisis
+
+    def test_por_plato_ordenado_de_mas_a_menos_vendido(self):
+        self.assertEqual(self.analisis().por_plato(), [("Pepsi", 4, 4400), ("Papas", 3, 1500), ("Completo", 1, 1800)])
+        self.assertEqual(self.analisis().por_plato(desde="2024-01-31T12:30", hasta="2024-02-01"),
+                         [("Pepsi", 3, 3300), ("Completo", 1, 1800)])
+
+    def test_por_hora(self):
+        platos, matriz = self.analisis().por_hora()
+        self.assertEqual(matriz.shape, (len(platos), 24))
+        pepsi, papas = platos.index("Pepsi"), platos.index("Papas")
+        self.assertEqual(matriz[pepsi].tolist(), [0] * 12 + [3] + [0] * 7 + [1] + [0] * 3)
+        self.assertEqual({h: int(n) for h, n in enumerate(matriz[papas]) if n}, {9: 1, 12: 2})
+        _, matriz = self.analisis().por_hora(hasta="2024-02-01")
+        self.assertEqual(int(matriz[papas, 9]), 0)
+
+    def test_resumen_separa_el_iva_por_boleta(self):
+        resumen = self.analisis().resumen()
+        self.assertEqual((resumen['pedidos'], resumen['unidades'], resumen['total']), (4, 8, 7700))
+        self.assertEqual(resumen['subtotal'] + resumen['iva'], resumen['total'])
+
+    def test_cache_solo_lee_lo_nuevo(self):
+        analisis = self.analisis()
+        analisis.guardar()
+        self.registro.registrar(pedido_con(Completo=2), datetime(2024, 2, 1, 13, 0))
+        desde_cache = AnalisisVentas(self.registro)
+        self.assertEqual(len(desde_cache), 4)
+        self.assertEqual(desde_cache.actualizar(), 1)
+        self.assertEqual(desde_cache.por_plato()[1], ("Completo", 3, 5400))
+
+    def test_cache_se_descarta_si_el_registro_se_rota(self):
+        self.analisis().guardar()
+        # Otro registro del mismo tamaño: mismos platos y largo de línea, pero otras fechas y cantidades
+        os.replace(self.registro.ruta, self.registro.ruta + ".1")
+        self.registro.registrar(pedido_con(Papas=2, Pepsi=1), datetime(2025, 6, 1, 12, 5))
+        self.registro.registrar(pedido_con(Completo=1, Pepsi=2), datetime(2025, 6, 1, 12, 50))
+        self.registro.registrar(pedido_con(Pepsi=1), datetime(2025, 6, 1, 20, 0))
+        self.registro.registrar(pedido_con(Papas=1), datetime(2025, 6, 2, 9, 30))
+        self.assertEqual(os.path.getsize(self.registro.ruta), os.path.getsize(self.registro.ruta + ".1"))
+        analisis = self.analisis()
+        self.assertEqual(len(analisis), 4)
+        self.assertEqual(analisis.resumen(desde="2025-01-01")['pedidos'], 4)
+        # Lo mismo con el análisis ya abierto: el siguiente actualizar relee el archivo nuevo
+        abierto = self.analisis()
+        os.replace(self.registro.ruta, self.registro.ruta + ".2")
+        os.replace(self.registro.ruta + ".1", self.registro.ruta)
+        abierto.actualizar()
+        self.assertEqual(abierto.resumen(desde="2025-01-01")['pedidos'], 0)
+        self.assertEqual(len(abierto), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()